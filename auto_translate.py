@@ -4,37 +4,40 @@
 使用方法: python auto_translate.py --source en.json --target ar.json --lang ar
 """
 
-import json
 import argparse
 import sys
 import time
-from pathlib import Path
 
-# 导入翻译函数（需要先安装依赖）
-try:
-    from googletrans import Translator
-    GOOGLETRANS_AVAILABLE = True
-except ImportError:
-    GOOGLETRANS_AVAILABLE = False
-
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+# 导入翻译引擎（需要先安装依赖）
+from translation_clients import add_client_arguments, configure_clients
+from translation_engines import add_engine_arguments, configure_engines_from_args, get_engine
 
 # 导入检查函数
-from check_translations import check_missing_translations, get_nested_value
+from check_translations import check_missing_translations, find_missing_translations, get_nested_value
+from locale_cache import add_locale_cache_arguments, configure_locale_cache_from_args, load_locale
+from locale_index import delete_value, set_value
+from translation_memory import add_memory_arguments, open_memory
+from translation_journal import (
+    DEFAULT_CHECKPOINT_INTERVAL, Checkpointer, TranslationJournal, add_journal_arguments, atomic_write_json,
+    journal_path_for
+)
+from translation_concurrency import DEFAULT_CONCURRENCY, add_concurrency_arguments, create_limiter, iter_concurrently
+from translation_allowlist import add_allowlist_arguments, is_verified, open_allowlist
+from translation_fuzzy import add_fuzzy_arguments, open_fuzzy
+from translation_metrics import METRICS, add_metrics_arguments, instrumented, stage
+from translation_retry import AdaptiveController, add_retry_arguments, configure_retry_from_args, format_controller_summary
+
+# 批量翻译默认配置
+DEFAULT_BATCH_SIZE = 50      # 每批最多条数（DeepL 单次请求最多 50 个 text）
+DEFAULT_BATCH_CHARS = 5000   # 每批最多字符数（Google 单次请求过长容易失败）
 
 def set_nested_value(data, path, value):
-    """设置嵌套值"""
-    keys = path.split('.')
-    current = data
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        current = current[key]
-    current[keys[-1]] = value
+    """设置嵌套值（支持列表路径和转义的键）"""
+    set_value(data, path, value)
+
+def delete_nested_value(data, path):
+    """删除嵌套值，并清理因此变空的父节点"""
+    delete_value(data, path)
 
 def should_skip_translation(value):
     """判断是否应该跳过翻译"""
@@ -63,139 +66,337 @@ def should_skip_translation(value):
     
     return False
 
-def translate_with_google(text, target_lang, source_lang='en'):
-    """使用 Google Translate 翻译"""
-    if not GOOGLETRANS_AVAILABLE:
-        raise ImportError("googletrans 未安装，使用: pip install googletrans==4.0.0rc1")
+def translate_batch(texts, target_lang, source_lang='en', api_type='google', api_key=None):
+    """
+    使用注册的翻译引擎批量翻译，返回与 texts 顺序一致的结果列表
+    失败时抛出异常（不再返回原文），由调用方重试或保留为待翻译
+    """
+    engine = get_engine(api_type, api_key)
+    texts = list(texts)
+    with METRICS.request(api_type, texts):
+        return engine.translate_batch(texts, target_lang, source_lang)
+
+def make_batches(items, max_items=DEFAULT_BATCH_SIZE, max_chars=DEFAULT_BATCH_CHARS):
+    """
+    将 (键, 文本) 列表按条数和总字符数分批
+    单条超过 max_chars 的文本单独成批
+    """
+    batches = []
+    current = []
+    current_chars = 0
     
-    translator = Translator()
-    try:
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        return result.text
-    except Exception as e:
-        print(f"翻译失败: {e}")
-        return text
-
-def translate_with_deepl(text, target_lang, api_key, source_lang='EN'):
-    """使用 DeepL API 翻译"""
-    if not REQUESTS_AVAILABLE:
-        raise ImportError("requests 未安装，使用: pip install requests")
-    
-    # DeepL 语言代码映射
-    deepl_lang_map = {
-        'ar': 'AR',
-        'vi': 'VI',
-        'th': 'TH',
-        'en': 'EN',
-        'zh': 'ZH',
-        'ja': 'JA',
-        'ko': 'KO'
-    }
+    for item in items:
+        text_len = len(item[1])
+        if current and (len(current) >= max_items or current_chars + text_len > max_chars):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(item)
+        current_chars += text_len
     
-    target_lang_code = deepl_lang_map.get(target_lang, target_lang.upper())
-    source_lang_code = deepl_lang_map.get(source_lang, source_lang.upper())
+    if current:
+        batches.append(current)
     
-    url = "https://api-free.deepl.com/v2/translate"
+    return batches
+
+def translate_text(text, target_lang, source_lang='en', api_type='google', api_key=None):
+    """使用注册的翻译引擎翻译单条文本，失败时抛出异常"""
+    engine = get_engine(api_type, api_key)
+    with METRICS.request(api_type, [text]):
+        return engine.translate(text, target_lang, source_lang)
+
+def plan_translation_units(pending):
+    """
+    规划翻译工作：把 (路径, 文本) 列表合并为唯一文本
+    返回 {文本: [路径, ...]}（按文本首次出现的顺序），同一文本只翻译一次再分发到所有路径
+    """
+    plan = {}
+    for key_path, text in pending:
+        plan.setdefault(text, []).append(key_path)
+    return plan
+
+def format_dedup_stats(stats):
+    """格式化去重统计"""
+    return (f"去重: {stats['keys']} 个键 → {stats['unique']} 个唯一文本"
+            f"（去重率 {stats['dedup_ratio']:.1%}），{stats['requests']} 次请求")
+
+def translate_pending(pending, target_lang, source_lang='en', api_type='google', api_key=None,
+                      batch=False, batch_size=DEFAULT_BATCH_SIZE, batch_chars=DEFAULT_BATCH_CHARS,
+                      memory=None, concurrency=DEFAULT_CONCURRENCY, limiter=None, on_translated=None,
+                      controller=None, fuzzy=None):
+    """
+    翻译 (路径, 文本) 列表，返回 ({路径: 译文}, [失败的路径], 去重统计)
+    - 相同文本只翻译一次（见 plan_translation_units）
+    - 先查询翻译记忆库，命中的不再请求
+    - fuzzy（LocaleFuzzyMatcher，见 translation_fuzzy）在请求前查找相似的已有翻译，开启复用时匹配到的不再请求
+    - batch=True 时按批请求，否则每条一个请求
+    - concurrency > 1 时并发请求，由 limiter 限速；顺序执行时每次请求间隔 0.1 秒
+    - 限流、5xx、超时按 controller（AdaptiveController，未传入时按 concurrency/limiter 新建）重试并自适应降速，
+      重试用尽的路径记入失败列表
+    - on_translated([(路径, 原文, 译文)]) 在每个请求单元完成后调用（用于写日志和断点）
+    结果与执行顺序无关，调用方按 pending 的顺序回填
+    """
+    results = {}
+    failed = []
+    plan = plan_translation_units(pending)
+    texts = list(plan)
     
-    params = {
-        'auth_key': api_key,
-        'text': text,
-        'source_lang': source_lang_code,
-        'target_lang': target_lang_code,
-        'preserve_formatting': '1'
-    }
+    # 翻译记忆库命中的文本不再发送请求
+    if memory and texts:
+        cached = memory.get_many(texts, source_lang, target_lang, api_type)
+        METRICS.incr('cache_hits', len(cached))
+        METRICS.incr('cache_misses', len(texts) - len(cached))
+        for text, translated in cached.items():
+            for key_path in plan[text]:
+                results[key_path] = translated
+        texts = [text for text in texts if text not in cached]
+        if on_translated and cached:
+            on_translated([(key_path, text, translated) for text, translated in cached.items()
+                           for key_path in plan[text]])
     
-    try:
-        response = requests.post(url, data=params, timeout=10)
-        if response.status_code == 200:
-            return response.json()['translations'][0]['text']
+    # 模糊匹配：相似度达到阈值的已有翻译写入报告，开启复用时不再发送请求
+    if fuzzy and texts:
+        with stage('fuzzy'):
+            reused = fuzzy.suggest(texts)
+        METRICS.incr('fuzzy_reused', len(reused))
+        for text, translated in reused.items():
+            for key_path in plan[text]:
+                results[key_path] = translated
+        texts = [text for text in texts if text not in reused]
+        if on_translated and reused:
+            on_translated([(key_path, text, translated) for text, translated in reused.items()
+                           for key_path in plan[text]])
+    
+    # 请求单元：批量模式下一批为一个请求，否则一条为一个请求
+    items = [(plan[text], text) for text in texts]
+    if batch:
+        units = make_batches(items, batch_size, batch_chars)
+        print(f"批量模式: {len(items)} 个文本分为 {len(units)} 批（每批最多 {batch_size} 条 / {batch_chars} 字符）")
+    else:
+        units = [[item] for item in items]
+    if concurrency > 1:
+        print(f"并发模式: {concurrency} 个并发请求")
+    owns_controller = controller is None
+    if owns_controller:
+        controller = AdaptiveController(concurrency, limiter)
+    
+    def translate_unit(unit):
+        unit_texts = [text for _, text in unit]
+        if batch:
+            translations = translate_batch(unit_texts, target_lang, source_lang, api_type, api_key)
         else:
-            raise Exception(f"DeepL API 错误: {response.status_code} - {response.text}")
-    except Exception as e:
-        print(f"DeepL 翻译失败: {e}")
-        return text
+            translations = [translate_text(unit_texts[0], target_lang, source_lang, api_type, api_key)]
+        if controller.limiter is None:
+            # 避免 API 限制
+            with stage('throttle_sleep'):
+                time.sleep(0.1)
+        return translations
+    
+    def unit_chars(unit):
+        return sum(len(text) for _, text in unit)
+    
+    for i, (unit, translations, error) in enumerate(
+            iter_concurrently(translate_unit, units, concurrency, weight=unit_chars, controller=controller), 1):
+        label = f"[批次 {i}/{len(units)}] {len(unit)} 个文本" if batch else f"[{i}/{len(units)}] {unit[0][0][0][:60]}"
+        if error is not None:
+            print(f"{label} ✗ 翻译失败: {error}")
+            for key_paths, _ in unit:
+                failed.extend(key_paths)
+            continue
+        if memory:
+            memory.put_many({text: translated for (_, text), translated in zip(unit, translations)},
+                            source_lang, target_lang, api_type)
+        for (key_paths, _), translated in zip(unit, translations):
+            for key_path in key_paths:
+                results[key_path] = translated
+        if on_translated:
+            on_translated([(key_path, text, translated) for (key_paths, text), translated in zip(unit, translations)
+                           for key_path in key_paths])
+        print(f"{label} ✓ {translations[0][:50]}...")
+    
+    controller_summary = format_controller_summary(controller.summary()) if owns_controller else None
+    if controller_summary:
+        print(controller_summary)
+    METRICS.incr('keys_translated', len(results))
+    METRICS.incr('keys_failed', len(failed))
+    stats = {
+        'keys': len(pending),
+        'unique': len(plan),
+        'requests': len(units),
+        'dedup_ratio': 1 - len(plan) / len(pending) if pending else 0.0
+    }
+    
+    return results, failed, stats
 
-def auto_translate_missing(source_file, target_file, target_lang, source_lang='en', api_type='google', api_key=None):
-    """自动翻译缺失的内容"""
-    # 检查缺失的翻译
-    print("检查缺失的翻译...")
-    missing, untranslated = check_missing_translations(source_file, target_file)
+def auto_translate_missing(source_file, target_file, target_lang, source_lang='en', api_type='google', api_key=None,
+                           batch=False, batch_size=DEFAULT_BATCH_SIZE, batch_chars=DEFAULT_BATCH_CHARS, memory=None,
+                           concurrency=DEFAULT_CONCURRENCY, limiter=None, source_data=None, changes=None,
+                           journal=False, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, controller=None,
+                           fuzzy=None, source_flat=None, allowlist=None):
+    """
+    自动翻译缺失的内容
+    memory: TranslationMemory 实例，请求 API 前先查询翻译记忆库（可能由多个语言共用，命中统计由调用方打印）
+    concurrency/limiter: 并发请求数与限速器（见 translation_concurrency）
+    source_data: 已加载的源数据（多语言同步时只解析一次 en.json）；source_flat 为它的扁平索引（可选）
+    changes: 增量模式，自上次同步以来的变化 {'added', 'changed', 'deleted'}（见 translation_manifest），
+             只处理这些键，不再全量检查
+    journal: 断点续传模式，已完成的翻译追加写入日志（目标文件.journal），每隔 checkpoint_interval 秒
+             原子写入一次目标文件；中断后再次运行时先从日志恢复（见 translation_journal）
+    controller: 多个语言共用的 AdaptiveController（见 translation_retry）
+    fuzzy: FuzzyReuse 实例，用源文件与目标文件中已有的翻译建立模糊匹配索引（见 translation_fuzzy）
+    allowlist: IdenticalAllowlist 实例，其中的键与原文相同也不再翻译；引擎返回原文的键记录到白名单
+               （按规则跳过的键不记录，规则可能误判，见 translation_allowlist，由调用方保存）
+    翻译失败的键不写入原文，保持缺失或原有的值，下次运行仍会处理
+    返回结果统计 {'missing', 'untranslated', 'deleted', 'translated', 'skipped', 'failed', 'failed_paths',
+                 'unique_texts', 'requests', 'dedup_ratio'}
+    """
+    with stage('load'):
+        if source_data is None:
+            source_data, source_flat = load_locale(source_file, with_flat=True)
+        
+        # 读取目标文件（通过 locale_cache，同时得到扁平索引）
+        target_data, target_flat = load_locale(target_file, {}, with_flat=True)
+    verified = allowlist.for_locale(target_lang) if allowlist else None
+    
+    deleted = []
+    if changes is None:
+        # 检查缺失的翻译
+        print("检查缺失的翻译...")
+        # find_missing_translations 自己计入 diff 阶段
+        missing, untranslated = find_missing_translations(source_data, target_data, source_flat, target_flat, verified)
+    else:
+        # 增量模式：新增的键只在目标缺失或未翻译时处理，修改的键旧译文已过期，必须重新翻译
+        missing = []
+        for key_path in changes['added']:
+            source_value = get_nested_value(source_data, key_path)
+            target_value = get_nested_value(target_data, key_path)
+            if target_value is None or (target_value == source_value
+                                        and not is_verified(verified, key_path, source_value)):
+                missing.append({'path': key_path, 'source': source_value})
+        untranslated = [
+            {'path': key_path, 'source': get_nested_value(source_data, key_path)}
+            for key_path in changes['changed']
+        ]
+        deleted = changes['deleted']
+        for key_path in deleted:
+            delete_nested_value(target_data, key_path)
+    
+    summary = {
+        'missing': len(missing),
+        'untranslated': len(untranslated),
+        'deleted': len(deleted),
+        'translated': 0,
+        'skipped': 0,
+        'failed': 0,
+        'failed_paths': [],
+        'unique_texts': 0,
+        'requests': 0,
+        'dedup_ratio': 0.0
+    }
     
     total_missing = len(missing) + len(untranslated)
-    if total_missing == 0:
+    if total_missing == 0 and not deleted:
         print("✓ 没有缺失的翻译！")
-        return True
+        return summary
     
-    print(f"发现 {total_missing} 个缺失或未翻译的键")
-    print(f"  - 缺失的键: {len(missing)}")
-    print(f"  - 未翻译的键: {len(untranslated)}")
+    if changes is None:
+        print(f"发现 {total_missing} 个缺失或未翻译的键")
+        print(f"  - 缺失的键: {len(missing)}")
+        print(f"  - 未翻译的键: {len(untranslated)}")
+    else:
+        print(f"增量同步: {total_missing} 个键需要翻译")
+        print(f"  - 新增的键: {len(missing)}")
+        print(f"  - 修改的键: {len(untranslated)}")
+        print(f"  - 删除的键: {len(deleted)}")
     print()
     
-    # 读取目标文件
-    target_data = {}
-    if Path(target_file).exists():
-        with open(target_file, 'r', encoding='utf-8') as f:
-            target_data = json.load(f)
-    
-    # 读取源文件
-    with open(source_file, 'r', encoding='utf-8') as f:
-        source_data = json.load(f)
-    
     # 翻译缺失的键
-    translated_count = 0
     skipped_count = 0
+    identical = []   # 引擎返回原文的 (路径, 原文)，记录到白名单
+    pending = []
     
-    all_missing = missing + untranslated
-    
-    for i, item in enumerate(all_missing, 1):
+    for item in missing + untranslated:
         key_path = item['path']
         source_value = item['source']
         
-        print(f"[{i}/{total_missing}] 翻译: {key_path[:60]}...")
-        
         # 检查是否应该跳过
         if should_skip_translation(source_value):
-            print(f"  跳过（特殊格式）: {source_value[:50]}...")
+            print(f"  跳过（特殊格式）: {key_path[:60]}")
             skipped_count += 1
             # 即使跳过，也要设置值（保持一致性）
             set_nested_value(target_data, key_path, source_value)
-            continue
+        else:
+            pending.append((key_path, source_value))
+    
+    # 断点续传：先恢复上次中断前已完成的翻译
+    recovered = {}
+    on_translated = None
+    if journal:
+        run_journal = TranslationJournal(journal_path_for(target_file), target_lang)
+        recovered, pending_remaining = run_journal.replay(pending)
+        METRICS.incr('journal_recovered', len(recovered))
+        if recovered:
+            print(f"从翻译日志恢复 {len(recovered)} 个键，剩余 {len(pending_remaining)} 个")
+            for key_path, translated in recovered.items():
+                set_nested_value(target_data, key_path, translated)
+        checkpointer = Checkpointer(target_file, target_data, checkpoint_interval)
         
-        # 执行翻译
-        try:
-            if api_type == 'deepl' and api_key:
-                translated = translate_with_deepl(source_value, target_lang, api_key, source_lang)
-            else:
-                translated = translate_with_google(source_value, target_lang, source_lang)
-            
-            set_nested_value(target_data, key_path, translated)
-            translated_count += 1
-            print(f"  ✓ {translated[:50]}...")
-            
-            # 避免 API 限制
-            time.sleep(0.1)
-        except Exception as e:
-            print(f"  ✗ 翻译失败: {e}")
-            # 失败时使用源值（避免丢失数据）
-            set_nested_value(target_data, key_path, source_value)
+        def on_translated(entries):
+            run_journal.append(entries)
+            for key_path, _, translated in entries:
+                set_nested_value(target_data, key_path, translated)
+            checkpointer.maybe_write()
+    else:
+        pending_remaining = pending
+    
+    matcher = None
+    if fuzzy and pending_remaining:
+        # 待翻译的键（包括原文已修改的键）不参与索引
+        matcher = fuzzy.for_locale(source_data, target_data, target_lang, [key_path for key_path, _ in pending])
+    try:
+        with stage('translate'):
+            translations, failed, dedup = translate_pending(
+                pending_remaining, target_lang, source_lang, api_type, api_key,
+                batch, batch_size, batch_chars, memory, concurrency, limiter, on_translated, controller, matcher
+            )
+    finally:
+        if journal:
+            run_journal.close()
+    translations.update(recovered)
+    
+    # 按检查顺序回填，保证键的位置确定；失败的键保留为待翻译，不用原文填充
+    for key_path, source_value in pending:
+        if key_path in translations:
+            set_nested_value(target_data, key_path, translations[key_path])
+            if translations[key_path] == source_value:
+                identical.append((key_path, source_value))
+    
+    # 引擎返回原文的键确认为可以与原文相同，下次检查不再视为未翻译
+    verified_count = allowlist.record(target_lang, identical) if allowlist and identical else 0
     
     # 保存更新后的文件
     print()
     print(f"翻译完成！")
-    print(f"  - 已翻译: {translated_count}")
+    print(f"  - 已翻译: {len(translations)}")
     print(f"  - 已跳过: {skipped_count}")
+    print(f"  - 失败: {len(failed)}" + ("（保留为待翻译，下次运行重试）" if failed else ""))
+    if recovered:
+        print(f"  - 从日志恢复: {len(recovered)}")
+    if verified_count:
+        print(f"  - 确认与原文相同（记入白名单）: {verified_count}")
     print(f"  - 总计: {total_missing}")
+    print(f"  - {format_dedup_stats(dedup)}")
     
-    # 确保目录存在
-    target_path = Path(target_file)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # 保存文件
-    with open(target_file, 'w', encoding='utf-8') as f:
-        json.dump(target_data, f, ensure_ascii=False, indent=2)
+    # 保存文件（原子替换，写入中途崩溃不会损坏原文件）
+    with stage('write'):
+        atomic_write_json(target_file, target_data)
+    if journal:
+        run_journal.discard()
     
     print(f"✓ 已保存到: {target_file}")
-    return True
+    summary.update(translated=len(translations), skipped=skipped_count, failed=len(failed), failed_paths=failed,
+                   unique_texts=dedup['unique'], requests=dedup['requests'], dedup_ratio=dedup['dedup_ratio'])
+    return summary
 
 def main():
     parser = argparse.ArgumentParser(description='自动翻译缺失的内容')
@@ -203,43 +404,79 @@ def main():
     parser.add_argument('--target', required=True, help='目标文件路径')
     parser.add_argument('--lang', required=True, help='目标语言代码')
     parser.add_argument('--source-lang', default='en', help='源语言代码')
-    parser.add_argument('--api', choices=['google', 'deepl'], default='google', help='使用的翻译 API')
-    parser.add_argument('--api-key', help='API 密钥（DeepL 需要）')
+    add_engine_arguments(parser)
     parser.add_argument('--dry-run', action='store_true', help='仅检查，不翻译')
+    parser.add_argument('--batch', action='store_true', help='批量模式：多条文本合并为一次请求')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help=f'每批最多条数 (默认: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--batch-chars', type=int, default=DEFAULT_BATCH_CHARS, help=f'每批最多字符数 (默认: {DEFAULT_BATCH_CHARS})')
+    add_memory_arguments(parser)
+    add_concurrency_arguments(parser)
+    add_client_arguments(parser)
+    add_journal_arguments(parser)
+    add_retry_arguments(parser)
+    add_fuzzy_arguments(parser)
+    add_allowlist_arguments(parser)
+    add_locale_cache_arguments(parser)
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
+    configure_locale_cache_from_args(args)
+    with instrumented(args, 'auto_translate'):
+        return run(args)
+
+def run(args):
+    """执行 main 解析出的命令"""
+    allowlist = open_allowlist(args)
     if args.dry_run:
         # 仅检查
-        missing, untranslated = check_missing_translations(args.source, args.target)
+        verified = allowlist.for_locale(args.lang) if allowlist else None
+        missing, untranslated = check_missing_translations(args.source, args.target, verified)
         total = len(missing) + len(untranslated)
         print(f"发现 {total} 个缺失或未翻译的键")
         return 0 if total == 0 else 1
     
     # 验证 API 可用性
-    if args.api == 'deepl':
-        if not args.api_key:
-            print("错误: DeepL API 需要 --api-key 参数")
-            return 1
-        if not REQUESTS_AVAILABLE:
-            print("错误: 需要安装 requests: pip install requests")
-            return 1
-    else:
-        if not GOOGLETRANS_AVAILABLE:
-            print("错误: 需要安装 googletrans: pip install googletrans==4.0.0rc1")
-            return 1
+    error = configure_engines_from_args(args)
+    if error:
+        print(f"错误: {error}")
+        return 1
     
     # 执行自动翻译
-    success = auto_translate_missing(
-        args.source,
-        args.target,
-        args.lang,
-        args.source_lang,
-        args.api,
-        args.api_key
-    )
-    
-    return 0 if success else 1
+    configure_clients(args.pool_size, args.timeout)
+    configure_retry_from_args(args)
+    memory = open_memory(args)
+    fuzzy = open_fuzzy(args)
+    try:
+        summary = auto_translate_missing(
+            args.source,
+            args.target,
+            args.lang,
+            args.source_lang,
+            args.api,
+            args.api_key,
+            args.batch,
+            args.batch_size,
+            args.batch_chars,
+            memory,
+            args.concurrency,
+            create_limiter(args.api, args.concurrency, args.rps, args.cps),
+            journal=not args.no_journal,
+            checkpoint_interval=args.checkpoint_interval,
+            fuzzy=fuzzy,
+            allowlist=allowlist
+        )
+    finally:
+        if memory:
+            memory.print_stats()
+            memory.close()
+        if fuzzy:
+            fuzzy.save_report()
+        if allowlist and allowlist.save():
+            print(f"✓ 白名单已更新: {allowlist.path}")
+    
+    # 有翻译失败的键时返回非零退出码（失败的键保留为待翻译，CI 需要能区分）
+    return 1 if summary['failed'] else 0
 
 if __name__ == "__main__":
     sys.exit(main())
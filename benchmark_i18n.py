@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+i18n 工具链性能基准
+生成与 en.json 结构相似的合成语言文件（travel、travelStandard、expense、invoice 等命名空间），
+在 2k / 20k / 200k 个叶子节点、7 种语言的规模下分别计时：加载、比较、翻译（离线伪翻译引擎，模拟延迟）、写入，
+并以子进程完整运行命令行入口（包括解释器启动和导入）:
+    check_translations  check_translations.py --all（所有语言的覆盖率矩阵）
+    translate_files     translate_files.py --batch（一个语言，伪翻译引擎）
+结果输出为 JSON，可与保存的基线比较，发现性能回退。基线 benchmarks/i18n_baseline.json 随代码提交，
+运行环境不同时耗时差异较大，更换机器后应重新保存基线。
+
+使用方法:
+    python benchmark_i18n.py                                   # 默认 2k,20k,200k
+    python benchmark_i18n.py --sizes 2k,20k --output bench.json
+    python benchmark_i18n.py --save-baseline benchmarks/i18n_baseline.json
+    python benchmark_i18n.py --baseline benchmarks/i18n_baseline.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from auto_translate import DEFAULT_BATCH_CHARS, DEFAULT_BATCH_SIZE, translate_pending
+from check_translations import find_missing_translations, load_json
+from locale_index import set_value
+from translation_concurrency import create_limiter
+from translation_engines import configure_engine, pseudo_translate
+
+BENCHMARK_VERSION = 2
+DEFAULT_SIZES = '2k,20k,200k'
+DEFAULT_BASELINE = "benchmarks/i18n_baseline.json"
+TARGET_LANGUAGES = ['ar', 'vi', 'th', 'zh', 'ja', 'ko']   # 加上 en 共 7 种语言
+STAGES = ['load', 'diff', 'translate', 'write']
+ENTRYPOINTS = ['check_translations', 'translate_files']   # 单独计时，不计入 total
+ENTRYPOINT_LANG = 'ja'
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# 与 en.json 一致的命名空间
+NAMESPACES = [
+    'common', 'navigation', 'auth', 'user', 'role', 'travel', 'travelStandard', 'expense', 'approval',
+    'dashboard', 'reports', 'messages', 'location', 'expenseItem', 'settings', 'invoice', 'currency', 'flight', 'hotel'
+]
+GROUPS = ['form', 'list', 'detail', 'filters', 'status', 'actions', 'messages', 'fields', 'dialogs', 'columns']
+WORDS = [
+    'Travel', 'Request', 'Expense', 'Invoice', 'Approval', 'Status', 'Date', 'Amount', 'Currency', 'Destination',
+    'Hotel', 'Flight', 'Standard', 'Policy', 'Employee', 'Department', 'Report', 'Total', 'Budget', 'Pending',
+    'Approved', 'Rejected', 'Submit', 'Save', 'Cancel', 'Delete', 'Edit', 'View', 'Search', 'Filter',
+    'Number', 'Type', 'Name', 'Description', 'Details', 'Create', 'Update', 'Select', 'Required', 'Invalid'
+]
+# 真实文件中有大量重复文本（Save、Status 等），合成数据保持类似的重复率
+COMMON_TEXTS = ['Save', 'Cancel', 'Delete', 'Edit', 'Status', 'Actions', 'Search', 'Total', 'Date', 'Amount']
+
+
+def parse_size(value):
+    """'2k' -> 2000，'200000' -> 200000"""
+    value = value.strip().lower()
+    if value.endswith('k'):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def size_label(size):
+    """2000 -> '2k'"""
+    return f"{size // 1000}k" if size % 1000 == 0 else str(size)
+
+
+def generate_text(rng):
+    """生成一条类似界面文案的英文文本"""
+    roll = rng.random()
+    if roll < 0.25:
+        return rng.choice(COMMON_TEXTS)
+    words = [rng.choice(WORDS) for _ in range(rng.randint(1, 6))]
+    text = ' '.join(words)
+    if roll > 0.9:
+        text += ' ({{count}})'
+    elif roll > 0.85:
+        text = f"{text} for {{{{name}}}}"
+    return text
+
+
+def generate_source_tree(leaves, seed=0):
+    """生成约 leaves 个叶子节点的源语言树：命名空间 -> 分组 -> （子分组 ->）叶子"""
+    rng = random.Random(seed)
+    tree = {}
+    count = 0
+    index = 0
+    while count < leaves:
+        namespace = NAMESPACES[index % len(NAMESPACES)]
+        block = tree.setdefault(namespace if index < len(NAMESPACES) else f"{namespace}{index // len(NAMESPACES)}", {})
+        index += 1
+        for group in GROUPS:
+            if count >= leaves:
+                break
+            node = block.setdefault(group, {})
+            if rng.random() < 0.3:
+                node = node.setdefault(rng.choice(GROUPS), {})
+            for i in range(min(rng.randint(5, 30), leaves - count)):
+                node[f"{rng.choice(WORDS).lower()}{i}"] = generate_text(rng)
+                count += 1
+    return tree
+
+
+def generate_target_tree(source, lang, seed=0, missing_rate=0.05, identical_rate=0.05):
+    """按源树生成目标语言树：大部分已翻译，missing_rate 的键缺失，identical_rate 的键与源相同（未翻译）"""
+    rng = random.Random(f"{seed}-{lang}")
+    
+    def build(node):
+        result = {}
+        for key, value in node.items():
+            if isinstance(value, dict):
+                result[key] = build(value)
+                continue
+            roll = rng.random()
+            if roll < missing_rate:
+                continue
+            result[key] = value if roll < missing_rate + identical_rate else pseudo_translate(value, lang)
+        return result
+    
+    return build(source)
+
+
+def write_json(path, data):
+    """与翻译脚本相同的写入格式"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def prepare_locales(directory, leaves, seed=0):
+    """在 directory 中生成 en.json 和各目标语言文件"""
+    source = generate_source_tree(leaves, seed)
+    write_json(Path(directory) / 'en.json', source)
+    for lang in TARGET_LANGUAGES:
+        write_json(Path(directory) / f'{lang}.json', generate_target_tree(source, lang, seed))
+
+
+def run_once(directory, options):
+    """完整执行一次 加载 -> 比较 -> 翻译 -> 写入，返回各阶段耗时和计数"""
+    directory = Path(directory)
+    timings = {}
+    counts = {'pending': 0, 'requests': 0, 'failed': 0}
+    
+    start = time.perf_counter()
+    source = load_json(directory / 'en.json')
+    targets = {lang: load_json(directory / f'{lang}.json') for lang in TARGET_LANGUAGES}
+    timings['load'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    pending = {}
+    for lang, target in targets.items():
+        missing, untranslated = find_missing_translations(source, target)
+        pending[lang] = [(item['path'], item['source']) for item in missing + untranslated]
+    timings['diff'] = time.perf_counter() - start
+    
+    limiter = create_limiter('pseudo', options['concurrency'])
+    start = time.perf_counter()
+    for lang, items in pending.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, failed, stats = translate_pending(
+                items, lang, 'en', 'pseudo', None, True, options['batch_size'], options['batch_chars'],
+                None, options['concurrency'], limiter
+            )
+        for key_path, translated in results.items():
+            set_value(targets[lang], key_path, translated)
+        counts['pending'] += len(items)
+        counts['requests'] += stats['requests']
+        counts['failed'] += len(failed)
+    timings['translate'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for lang, target in targets.items():
+        write_json(directory / f'{lang}.json', target)
+    timings['write'] = time.perf_counter() - start
+    
+    return timings, counts
+
+
+def _run_script(name, arguments, ok_codes=(0,)):
+    """以子进程运行仓库中的脚本，返回耗时；退出码不在 ok_codes 中时抛出 RuntimeError"""
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, str(SCRIPT_DIR / f'{name}.py'), *arguments], cwd=SCRIPT_DIR,
+                             stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    seconds = time.perf_counter() - start
+    if process.returncode not in ok_codes:
+        raise RuntimeError(f"{name}.py 退出码 {process.returncode}:\n{process.stdout[-2000:]}")
+    return seconds
+
+
+def run_entrypoints(directory, options):
+    """完整运行命令行入口，返回 {入口: 耗时}（目录中需要是未翻译过的合成文件）"""
+    directory = Path(directory)
+    source = str(directory / 'en.json')
+    timings = {}
+    # 有未翻译的键时退出码为 1
+    timings['check_translations'] = _run_script('check_translations', [
+        '--source', source, '--all', '--output', str(directory / 'coverage.json'),
+        '--no-allowlist', '--no-locale-cache'
+    ], ok_codes=(0, 1))
+    timings['translate_files'] = _run_script('translate_files', [
+        '--source', source, '--target', str(directory / f'{ENTRYPOINT_LANG}.json'), '--lang', ENTRYPOINT_LANG,
+        '--api', 'pseudo', '--pseudo-latency', str(options['latency']), '--batch',
+        '--batch-size', str(options['batch_size']), '--batch-chars', str(options['batch_chars']),
+        '--concurrency', str(options['concurrency']), '--no-memory'
+    ])
+    return timings
+
+
+def run_benchmark(sizes, options, repeat=1, seed=0):
+    """对每个规模运行 repeat 次，每个阶段取最小耗时"""
+    results = {}
+    for size in sizes:
+        label = size_label(size)
+        best = {}
+        counts = {}
+        for _ in range(repeat):
+            # 翻译阶段会修改目标文件，每次都重新生成
+            with tempfile.TemporaryDirectory(prefix='i18n-bench-') as directory:
+                prepare_locales(directory, size, seed)
+                timings, counts = run_once(directory, options)
+            with tempfile.TemporaryDirectory(prefix='i18n-bench-') as directory:
+                prepare_locales(directory, size, seed)
+                timings.update(run_entrypoints(directory, options))
+            for stage, seconds in timings.items():
+                best[stage] = min(seconds, best.get(stage, seconds))
+        best['total'] = sum(best[stage] for stage in STAGES)
+        results[label] = {
+            'leaves': size,
+            'languages': len(TARGET_LANGUAGES) + 1,
+            'stages': {stage: round(seconds, 4) for stage, seconds in best.items()},
+            **counts
+        }
+        print(f"{label:>6}: " + '  '.join(f"{stage} {best[stage]:.3f}s" for stage in STAGES + ['total'])
+              + f"  ({counts['pending']} 个待翻译键, {counts['requests']} 次请求)")
+        print(f"{'':>6}  " + '  '.join(f"{name}.py {best[name]:.3f}s" for name in ENTRYPOINTS))
+    return results
+
+
+def compare_with_baseline(report, baseline, threshold=0.2, min_seconds=0.05):
+    """
+    与基线比较，返回回退列表 [(规模, 阶段, 基线耗时, 当前耗时)]
+    耗时增加超过 threshold（比例）且超过 min_seconds（过滤噪声）才算回退
+    """
+    regressions = []
+    print()
+    print(f"{'规模':>6} {'阶段':<18} {'基线':>10} {'当前':>10} {'变化':>8}")
+    for label, result in report['results'].items():
+        base = baseline.get('results', {}).get(label)
+        if not base:
+            continue
+        for stage in STAGES + ['total'] + ENTRYPOINTS:
+            old = base['stages'].get(stage)
+            new = result['stages'].get(stage)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            regressed = change > threshold and new - old > min_seconds
+            marker = ' ✗' if regressed else ''
+            print(f"{label:>6} {stage:<18} {old:>9.3f}s {new:>9.3f}s {change:>+7.1%}{marker}")
+            if regressed:
+                regressions.append((label, stage, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='i18n 工具链性能基准',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  python benchmark_i18n.py --sizes 2k,20k
+  python benchmark_i18n.py --save-baseline benchmarks/i18n_baseline.json
+  python benchmark_i18n.py --baseline benchmarks/i18n_baseline.json --threshold 0.2
+        """
+    )
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'叶子节点数，逗号分隔 (默认: {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=1, help='每个规模运行次数，取最小耗时 (默认: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='合成数据的随机种子 (默认: 0)')
+    parser.add_argument('--latency', type=float, default=0.05, help='伪翻译引擎每次请求的模拟延迟秒数 (默认: 0.05)')
+    parser.add_argument('--concurrency', type=int, default=8, help='翻译阶段的并发请求数 (默认: 8)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'每批最多条数 (默认: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--batch-chars', type=int, default=DEFAULT_BATCH_CHARS,
+                        help=f'每批最多字符数 (默认: {DEFAULT_BATCH_CHARS})')
+    parser.add_argument('--output', help='结果 JSON 输出路径')
+    parser.add_argument('--baseline', help='与该基线文件比较，发现回退时返回非零')
+    parser.add_argument('--threshold', type=float, default=0.2, help='判定回退的耗时增长比例 (默认: 0.2)')
+    parser.add_argument('--save-baseline', help='把本次结果保存为基线')
+    
+    args = parser.parse_args()
+    
+    sizes = [parse_size(value) for value in args.sizes.split(',') if value.strip()]
+    options = {
+        'concurrency': args.concurrency,
+        'batch_size': args.batch_size,
+        'batch_chars': args.batch_chars,
+        'latency': args.latency
+    }
+    configure_engine('pseudo', latency=args.latency, error_rate=0.0)
+    
+    print(f"i18n 基准测试: 规模 {', '.join(size_label(size) for size in sizes)}，"
+          f"{len(TARGET_LANGUAGES) + 1} 种语言，模拟延迟 {args.latency}s，并发 {args.concurrency}")
+    report = {
+        'version': BENCHMARK_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {**options, 'repeat': args.repeat, 'seed': args.seed},
+        'results': run_benchmark(sizes, options, args.repeat, args.seed)
+    }
+    
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"✓ 结果已保存到: {path}")
+    
+    if args.baseline:
+        baseline = load_json(args.baseline)
+        if baseline.get('config') != report['config']:
+            print("⚠ 基线的测试配置与本次不同，比较结果仅供参考")
+        regressions = compare_with_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ 发现 {len(regressions)} 项性能回退（阈值 {args.threshold:.0%}）")
+            return 1
+        print("\n✓ 没有性能回退")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+按命名空间拆分语言包（前端按需加载）
+把每个语言文件按顶层命名空间（common、travel、travelStandard、expense、invoice、flight 等）拆成独立的 JSON，
+文件名带内容哈希（如 ar/travel.3f2a9c1e.json），并生成 manifest.json 供前端查找。
+
+每个拆分文件保留顶层命名空间这一层（{"travel": {...}}），前端可以直接
+i18n.addResourceBundle(lng, 'translation', chunk, true, true) 合并进现有的 translation 命名空间，
+t('travel.title') 等调用无需修改。首屏只需加载当前语言以及当前页面用到的命名空间。
+目前 frontend/src/i18n/index.js 仍打包完整语言文件，这些拆分文件还没有前端使用方；
+index.js 改为按需加载（按清单 fetch 后 addResourceBundle）之后才会减少首屏下载量。
+
+使用方法:
+    python build_locale_bundles.py
+    python build_locale_bundles.py --output frontend/public/locales --languages en,zh
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from check_translations import load_json
+from export_locales import minify_json, remove_stale, write_hashed
+from translation_journal import atomic_write_json
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+DEFAULT_OUTPUT_DIR = "frontend/public/locales"
+MANIFEST_NAME = "manifest.json"
+BUNDLE_MANIFEST_VERSION = 1
+ROOT_NAMESPACE = '_root'   # 顶层的非对象值（如果有）放在这个命名空间
+
+# 与 frontend/src/i18n/index.js 中的资源映射一致
+LANGUAGE_ALIASES = {
+    'zh-Hans': 'zh',
+    'zh-Hans-CN': 'zh'
+}
+
+
+def split_namespaces(data):
+    """按顶层键拆分 {命名空间: 拆分内容}，每个拆分内容保留顶层键"""
+    chunks = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            chunks[key] = {key: value}
+        else:
+            chunks.setdefault(ROOT_NAMESPACE, {})[key] = value
+    return chunks
+
+
+def count_leaves(value):
+    """统计叶子节点数"""
+    if isinstance(value, dict):
+        return sum(count_leaves(child) for child in value.values())
+    if isinstance(value, list):
+        return sum(count_leaves(child) for child in value)
+    return 1
+
+
+def build_bundles(locales_dir=LOCALES_DIR, output_dir=DEFAULT_OUTPUT_DIR, languages=None, compress=False):
+    """
+    拆分所有语言文件，写入带哈希的文件（压缩空白，compress=True 时另生成 .gz/.br）和清单，
+    删除上次构建遗留的旧文件
+    返回 (清单, 统计)
+    清单: {'version', 'aliases', 'languages': {语言: {命名空间: {'file', 'hash', 'bytes', 'gzip', 'brotli', 'keys'}}}}
+    统计: {'written': 新写入的文件数, 'removed': 删除的旧文件数}
+    """
+    locales_dir = Path(locales_dir)
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = load_json(manifest_path, {})
+    
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob('*.json'))
+    
+    manifest = {
+        'version': BUNDLE_MANIFEST_VERSION,
+        'aliases': {alias: lang for alias, lang in LANGUAGE_ALIASES.items() if lang in languages},
+        'languages': {}
+    }
+    written = 0
+    for lang in languages:
+        data = load_json(locales_dir / f'{lang}.json')
+        # 文件名包含内容哈希，已存在即内容相同，不需要重写
+        existed = {entry['file'] for entry in previous.get('languages', {}).get(lang, {}).values()}
+        entries = {}
+        for namespace, chunk in split_namespaces(data).items():
+            stem = f"{lang}/{namespace}"
+            entry = write_hashed(output_dir, stem, minify_json(chunk), compress)
+            entry['keys'] = count_leaves(chunk)
+            written += entry['file'] not in existed
+            entries[namespace] = entry
+        manifest['languages'][lang] = entries
+    
+    # 删除上次构建中已不再引用的文件
+    removed = remove_stale(
+        output_dir,
+        [entry for entries in previous.get('languages', {}).values() for entry in entries.values()],
+        [entry for entries in manifest['languages'].values() for entry in entries.values()]
+    )
+    
+    atomic_write_json(manifest_path, manifest)
+    return manifest, {'written': written, 'removed': removed}
+
+
+def print_report(manifest, full_sizes=None):
+    """打印每个语言的命名空间数和大小"""
+    print(f"{'语言':<6} {'命名空间':>8} {'总大小':>10} {'最大命名空间':<28}")
+    for lang, entries in manifest['languages'].items():
+        total = sum(entry['bytes'] for entry in entries.values())
+        largest = max(entries.items(), key=lambda item: item[1]['bytes'], default=(None, None))
+        largest_label = f"{largest[0]} ({largest[1]['bytes'] / 1024:.1f} KB)" if largest[0] else '-'
+        print(f"{lang:<6} {len(entries):>8} {total / 1024:>8.1f} KB {largest_label:<28}")
+    if full_sizes:
+        print(f"\n拆分前所有语言共 {sum(full_sizes.values()) / 1024:.1f} KB；"
+              f"拆分后首屏只需加载一个语言中用到的命名空间")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按命名空间拆分语言包，生成带内容哈希的文件和清单')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_DIR, help=f'输出目录 (默认: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--languages', help='只处理这些语言，逗号分隔 (默认: 目录中的全部语言)')
+    parser.add_argument('--compress', action='store_true', help='同时生成预压缩的 .gz/.br 文件（见 export_locales）')
+    
+    args = parser.parse_args()
+    
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+    manifest, stats = build_bundles(args.locales, args.output, languages, args.compress)
+    full_sizes = {
+        lang: (Path(args.locales) / f'{lang}.json').stat().st_size for lang in manifest['languages']
+    }
+    print_report(manifest, full_sizes)
+    print(f"\n✓ 已写入 {stats['written']} 个文件，删除 {stats['removed']} 个旧文件")
+    print(f"✓ 清单: {Path(args.output) / MANIFEST_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,92 +2,312 @@
 """
 检测未翻译的内容
 使用方法: python check_translations.py --source en.json --target ar.json
+
+扫描前端源码，报告未使用和未定义的键:
+    python check_translations.py --source en.json --usage [--prune]
+
+一次检查目录中的所有语言，输出 命名空间 × 语言 的矩阵:
+    python check_translations.py --source en.json --all [--format json|csv] [--output matrix.csv]
+    退出码: 0 全部完整，1 有缺失或未翻译的键，2 有语言文件无法读取
+
+在白名单（translation_allowlist，确认可以与原文相同的键）中的值不视为未翻译，--no-allowlist 时不排除。
+
+语言文件通过 locale_cache 加载（解析结果和扁平索引的二进制快照），--no-locale-cache 时每次重新解析。
 """
 
+import csv
 import json
 import argparse
+import sys
 from pathlib import Path
 
+from locale_cache import add_locale_cache_arguments, configure_locale_cache_from_args, load_locale
+from locale_index import diff_flat, flatten, get_value, join_path, path_to_str
+from translation_allowlist import add_allowlist_arguments, is_verified, open_allowlist
+from translation_metrics import add_metrics_arguments, instrumented, stage
+from translation_usage import (
+    DEFAULT_SRC_DIR, DEFAULT_USAGE_CACHE, analyze_usage, prune_unused_keys, scan_sources, unused_paths
+)
+
 def get_all_keys(data, prefix=""):
-    """递归获取所有键的路径"""
+    """获取所有叶子节点的路径（列表元素为 a[0] 形式）"""
     keys = []
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            if isinstance(value, (dict, list)):
-                keys.extend(get_all_keys(value, current_path))
-            else:
-                keys.append(current_path)
-    elif isinstance(data, list):
-        for i, item in enumerate(data):
-            current_path = f"{prefix}[{i}]"
-            if isinstance(item, (dict, list)):
-                keys.extend(get_all_keys(item, current_path))
-            else:
-                keys.append(current_path)
+    for path, value in flatten(data).items():
+        if isinstance(value, (dict, list)):
+            continue
+        key_path = path_to_str(path)
+        keys.append(join_path(prefix, key_path) if prefix else key_path)
     return keys
 
 def get_nested_value(data, path):
-    """获取嵌套值"""
-    keys = path.split('.')
-    value = data
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
-            return None
-    return value
-
-def check_missing_translations(source_file, target_file):
-    """检查缺失的翻译"""
-    # 读取源文件
-    with open(source_file, 'r', encoding='utf-8') as f:
-        source_data = json.load(f)
-    
-    # 读取目标文件
-    target_data = {}
-    if Path(target_file).exists():
-        with open(target_file, 'r', encoding='utf-8') as f:
-            target_data = json.load(f)
-    
-    # 获取所有键
-    source_keys = get_all_keys(source_data)
-    
-    missing_keys = []
-    untranslated_keys = []
-    
-    for key_path in source_keys:
-        source_value = get_nested_value(source_data, key_path)
-        target_value = get_nested_value(target_data, key_path)
-        
-        if source_value is None:
-            continue
+    """获取嵌套值（支持 get_all_keys 返回的列表路径）"""
+    return get_value(data, path)
+
+def load_json(path, default=None):
+    """读取 JSON 文件；文件不存在且提供了 default 时返回 default"""
+    if default is not None and not Path(path).exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def find_missing_translations(source_data, target_data, source_flat=None, target_flat=None, verified=None):
+    """
+    比较已加载的源数据和目标数据，返回 (缺失的键, 可能未翻译的键)
+    source_flat/target_flat: 已有的扁平索引（如 load_locale(..., with_flat=True) 的结果），不再重新展开
+    verified: 确认可以与原文相同的键（IdenticalAllowlist.for_locale 的结果），不计入未翻译
+    """
+    with stage('diff'):
+        # 各遍历一次，建立扁平索引
+        if source_flat is None:
+            source_flat = flatten(source_data)
+        if target_flat is None:
+            target_flat = flatten(target_data)
         
-        if target_value is None:
-            missing_keys.append({
-                'path': key_path,
-                'source': source_value
-            })
-        elif isinstance(source_value, str) and isinstance(target_value, str):
-            # 如果目标值与源值相同，可能是未翻译
-            if target_value == source_value and source_value.strip():
-                untranslated_keys.append({
-                    'path': key_path,
-                    'source': source_value,
-                    'target': target_value
-                })
+        missing_paths, identical_paths = diff_flat(source_flat, target_flat)
+    
+    missing_keys = [
+        {'path': path_to_str(path), 'source': source_flat[path]}
+        for path in missing_paths
+    ]
+    # 如果目标值与源值相同，可能是未翻译（白名单中的除外）
+    untranslated_keys = [
+        {'path': key, 'source': source_flat[path], 'target': target_flat[path]}
+        for path, key in ((path, path_to_str(path)) for path in identical_paths)
+        if not is_verified(verified, key, source_flat[path])
+    ]
     
     return missing_keys, untranslated_keys
 
+def check_missing_translations(source_file, target_file, verified=None):
+    """检查缺失的翻译（verified 见 find_missing_translations）"""
+    with stage('load'):
+        # 读取源文件
+        source_data, source_flat = load_locale(source_file, with_flat=True)
+        
+        # 读取目标文件
+        target_data, target_flat = load_locale(target_file, {}, with_flat=True)
+    
+    return find_missing_translations(source_data, target_data, source_flat, target_flat, verified)
+
+# --all 模式的退出码
+EXIT_COMPLETE = 0
+EXIT_INCOMPLETE = 1
+EXIT_ERROR = 2
+
+def build_coverage_matrix(source_data, targets, source_flat=None, target_flats=None, verified=None):
+    """
+    源数据只展开一次，与每个目标语言比较，按顶层命名空间汇总
+    targets: {语言: 已加载的数据}
+    source_flat/target_flats: 已有的扁平索引（target_flats 为 {语言: 索引}），没有的语言现场展开
+    verified: {语言: 确认可以与原文相同的键}，这些键不计入未翻译
+    返回 {'languages': [...], 'namespaces': {命名空间: {'total', 'languages': {语言: {'missing', 'untranslated'}}}},
+          'summary': {语言: {'total', 'missing', 'untranslated', 'coverage'}}}
+    """
+    if source_flat is None:
+        source_flat = flatten(source_data)
+    target_flats = target_flats or {}
+    namespaces = {}
+    for path, value in source_flat.items():
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        namespaces.setdefault(path[0], {'total': 0, 'languages': {}})['total'] += 1
+    total = sum(entry['total'] for entry in namespaces.values())
+    
+    summary = {}
+    for lang, target_data in targets.items():
+        for entry in namespaces.values():
+            entry['languages'][lang] = {'missing': 0, 'untranslated': 0}
+        target_flat = target_flats.get(lang)
+        if target_flat is None:
+            target_flat = flatten(target_data)
+        missing_paths, identical_paths = diff_flat(source_flat, target_flat)
+        if verified and verified.get(lang):
+            identical_paths = [path for path in identical_paths
+                               if not is_verified(verified[lang], path_to_str(path), source_flat[path])]
+        for path in missing_paths:
+            namespaces[path[0]]['languages'][lang]['missing'] += 1
+        for path in identical_paths:
+            namespaces[path[0]]['languages'][lang]['untranslated'] += 1
+        summary[lang] = {
+            'total': total,
+            'missing': len(missing_paths),
+            'untranslated': len(identical_paths),
+            'coverage': round((total - len(missing_paths) - len(identical_paths)) / total, 4) if total else 1.0
+        }
+    
+    return {'languages': list(targets), 'namespaces': namespaces, 'summary': summary}
+
+def check_all_locales(source_file, locales_dir=None, languages=None, allowlist=None):
+    """
+    加载一次源文件，检查目录中所有语言（不包括源文件本身）
+    allowlist: IdenticalAllowlist，其中确认可以与原文相同的键不计入未翻译
+    返回覆盖率矩阵，无法读取的语言记录在 'errors' {语言: 错误信息}
+    """
+    source_path = Path(source_file)
+    locales_dir = Path(locales_dir or source_path.parent)
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob('*.json') if path.resolve() != source_path.resolve())
+    
+    targets = {}
+    target_flats = {}
+    errors = {}
+    with stage('load'):
+        source_data, source_flat = load_locale(source_path, with_flat=True)
+        for lang in languages:
+            try:
+                targets[lang], target_flats[lang] = load_locale(locales_dir / f'{lang}.json', {}, with_flat=True)
+            except (OSError, json.JSONDecodeError) as e:
+                errors[lang] = str(e)
+    
+    with stage('diff'):
+        verified = {lang: allowlist.for_locale(lang) for lang in targets} if allowlist else None
+        matrix = build_coverage_matrix(source_data, targets, source_flat, target_flats, verified)
+    matrix['source_file'] = str(source_file)
+    matrix['errors'] = errors
+    return matrix
+
+def coverage_exit_code(matrix):
+    """根据矩阵计算退出码"""
+    if matrix.get('errors'):
+        return EXIT_ERROR
+    if any(entry['missing'] or entry['untranslated'] for entry in matrix['summary'].values()):
+        return EXIT_INCOMPLETE
+    return EXIT_COMPLETE
+
+def write_matrix_csv(matrix, f):
+    """CSV: 每行一个命名空间，每个语言两列（缺失、未翻译），最后一行为总计"""
+    writer = csv.writer(f)
+    languages = matrix['languages']
+    writer.writerow(['namespace', 'total'] + [f"{lang}_{kind}" for lang in languages
+                                              for kind in ('missing', 'untranslated')])
+    for namespace, entry in matrix['namespaces'].items():
+        writer.writerow([namespace, entry['total']] + [entry['languages'][lang][kind] for lang in languages
+                                                       for kind in ('missing', 'untranslated')])
+    total = sum(entry['total'] for entry in matrix['namespaces'].values())
+    writer.writerow(['TOTAL', total] + [matrix['summary'][lang][kind] for lang in languages
+                                        for kind in ('missing', 'untranslated')])
+
+def print_coverage_matrix(matrix):
+    """打印每个语言的覆盖率，以及缺失最多的命名空间"""
+    print(f"检查结果: {matrix['source_file']} × {len(matrix['languages'])} 个语言")
+    print(f"{'语言':<6} {'覆盖率':>8} {'缺失':>6} {'未翻译':>6}  缺失最多的命名空间")
+    for lang, entry in matrix['summary'].items():
+        worst = sorted(
+            ((name, ns['languages'][lang]['missing'] + ns['languages'][lang]['untranslated'])
+             for name, ns in matrix['namespaces'].items()),
+            key=lambda item: -item[1]
+        )
+        worst_label = ', '.join(f"{name}({count})" for name, count in worst[:3] if count)
+        print(f"{lang:<6} {entry['coverage']:>8.1%} {entry['missing']:>6} {entry['untranslated']:>6}  {worst_label}")
+    for lang, error in matrix['errors'].items():
+        print(f"{lang:<6} ✗ 无法读取: {error}")
+
+def check_all(args):
+    """--all 模式：一次检查所有语言，输出结构化矩阵，退出码表示结果"""
+    matrix = check_all_locales(args.source, args.locales_dir, allowlist=open_allowlist(args))
+    output_format = args.format or (Path(args.output).suffix.lstrip('.') if args.output else None)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            if output_format == 'csv':
+                write_matrix_csv(matrix, f)
+            else:
+                json.dump(matrix, f, ensure_ascii=False, indent=2)
+        print_coverage_matrix(matrix)
+        print(f"\n报告已保存到: {args.output}")
+    elif output_format == 'csv':
+        write_matrix_csv(matrix, sys.stdout)
+    elif output_format == 'json':
+        json.dump(matrix, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_coverage_matrix(matrix)
+    
+    return coverage_exit_code(matrix)
+
+def check_key_usage(args):
+    """--usage 模式：扫描源码，按命名空间报告未使用和未定义的键，可选删除未使用的键"""
+    with stage('load'):
+        source_data = load_locale(args.source)
+    with stage('scan'):
+        scan_results, scan_stats = scan_sources(args.src_dir, None if args.no_cache else args.usage_cache, args.workers)
+    with stage('diff'):
+        report = analyze_usage(source_data, scan_results)
+    
+    print(f"扫描 {args.src_dir}: {scan_stats['files']} 个文件"
+          f"（重新扫描 {scan_stats['scanned']}，使用缓存 {scan_stats['cached']}）")
+    print()
+    print(f"{'命名空间':<20} {'定义':>6} {'使用':>6} {'未使用':>6} {'未定义':>6}")
+    for namespace, entry in sorted(report.items()):
+        print(f"{namespace:<20} {entry['defined']:>6} {entry['used']:>6} "
+              f"{len(entry['unused']):>6} {len(entry['undefined']):>6}")
+    total_unused = sum(len(entry['unused']) for entry in report.values())
+    total_undefined = sum(len(entry['undefined']) for entry in report.values())
+    print(f"{'总计':<20} {sum(e['defined'] for e in report.values()):>6} {sum(e['used'] for e in report.values()):>6} "
+          f"{total_unused:>6} {total_undefined:>6}")
+    print()
+    
+    if total_undefined:
+        print("未定义的键（运行时会回退）:")
+        undefined = [item for entry in report.values() for item in entry['undefined']]
+        for item in undefined[:20]:
+            print(f"  - {item['key']}  ({item['locations'][0]})")
+        if len(undefined) > 20:
+            print(f"  ... 还有 {len(undefined) - 20} 个")
+        print()
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'source_file': args.source, 'src_dir': args.src_dir, 'namespaces': report,
+                       'summary': {'unused_count': total_unused, 'undefined_count': total_undefined}},
+                      f, ensure_ascii=False, indent=2)
+        print(f"报告已保存到: {args.output}")
+    
+    if args.prune and total_unused:
+        locales_dir = Path(args.locales_dir or Path(args.source).parent)
+        removed = prune_unused_keys(sorted(locales_dir.glob('*.json')), unused_paths(source_data, report))
+        print("已删除未使用的键:")
+        for locale_file, count in removed.items():
+            print(f"  - {locale_file}: {count}")
+    
+    return total_undefined
+
 def main():
     parser = argparse.ArgumentParser(description='检测未翻译的内容')
     parser.add_argument('--source', required=True, help='源文件路径')
-    parser.add_argument('--target', required=True, help='目标文件路径')
+    parser.add_argument('--target', help='目标文件路径（--usage 模式不需要）')
     parser.add_argument('--output', help='输出报告文件（JSON格式）')
+    parser.add_argument('--usage', action='store_true', help='扫描前端源码，报告未使用和未定义的键')
+    parser.add_argument('--src-dir', default=DEFAULT_SRC_DIR, help=f'源码目录 (默认: {DEFAULT_SRC_DIR})')
+    parser.add_argument('--usage-cache', default=DEFAULT_USAGE_CACHE, help=f'扫描缓存路径 (默认: {DEFAULT_USAGE_CACHE})')
+    parser.add_argument('--no-cache', action='store_true', help='不使用扫描缓存')
+    parser.add_argument('--workers', type=int, help='并行扫描的进程数 (默认: CPU 核数)')
+    parser.add_argument('--prune', action='store_true', help='从所有语言文件中删除未使用的键')
+    parser.add_argument('--locales-dir', help='--all/--prune 处理的语言文件目录 (默认: 源文件所在目录)')
+    parser.add_argument('--all', action='store_true', help='一次检查目录中的所有语言，输出 命名空间 × 语言 矩阵')
+    parser.add_argument('--format', choices=['json', 'csv'], help='--all 模式的输出格式（不指定 --output 时输出到标准输出）')
+    add_allowlist_arguments(parser)
+    add_locale_cache_arguments(parser)
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
-    missing, untranslated = check_missing_translations(args.source, args.target)
+    if not (args.usage or args.all or args.target):
+        parser.error('需要 --target 参数（或使用 --usage / --all 模式）')
+    
+    configure_locale_cache_from_args(args)
+    with instrumented(args, 'check_translations'):
+        if args.usage:
+            return check_key_usage(args)
+        if args.all:
+            return check_all(args)
+        return check_single(args)
+
+def check_single(args):
+    """检查单个目标语言（原有模式）"""
+    allowlist = open_allowlist(args)
+    verified = allowlist.for_locale(Path(args.target).stem) if allowlist else None
+    missing, untranslated = check_missing_translations(args.source, args.target, verified)
     
     print(f"检查结果: {args.target}")
     print(f"缺失的键: {len(missing)}")
@@ -130,7 +350,6 @@ def main():
     return len(missing) + len(untranslated)
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
 
 
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+预编译插值消息
+i18next 配置为单花括号插值（prefix '{'、suffix '}'、formatSeparator ','），每次 t() 调用都要在浏览器中
+用正则重新解析占位符。本脚本一次解析所有语言中带占位符的消息：
+- 检查每个语言的占位符与 en.json 一致（缺少或多出的占位符在运行时才会暴露）
+- 输出 token 形式的编译结果 frontend/src/i18n/compiled_messages.json，
+  前端通过 frontend/src/i18n/compiledMessages.js 的 tc() 直接拼接，不再在运行时解析
+
+编译结果只包含带占位符的消息（普通字符串无需解析），每条消息为 token 列表:
+    "Page {current} of {total}" -> ["Page ", {"v": "current"}, " of ", {"v": "total"}]
+    "{amount, currency}"        -> [{"v": "amount", "f": "currency"}]
+含 $t( 嵌套引用的消息不编译，仍由 i18next 处理。
+双花括号 {{count}} 在这个配置下不是占位符（i18next 匹配到 "{{count}"，变量名为 "{count"，
+运行时原样显示），按语法错误报告，不编译。
+复数键（_one、_other 等后缀）的各个形式可以省略占位符（如 "One route"），只检查多出的占位符。
+
+使用方法:
+    python compile_messages.py
+    python compile_messages.py --check            # 只检查占位符，不写入编译结果
+    python compile_messages.py --format json      # 以 JSON 输出检查结果
+    python compile_messages.py --verify           # 编译结果与语言文件不一致时失败（CI 使用）
+    退出码: 0 占位符全部一致，1 有不一致或双花括号（--verify: 或编译结果已过期），2 有语言文件无法读取
+
+compiled_messages.json 随代码提交（前端构建环境没有 Python），修改语言文件后需要重新运行本脚本；
+CI 用 --verify 检查提交的编译结果是否过期。
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from build_locale_bundles import LANGUAGE_ALIASES
+from check_translations import EXIT_COMPLETE, EXIT_ERROR, EXIT_INCOMPLETE, load_json
+from locale_index import flatten
+from locale_placeholders import FORMAT_SEPARATOR, parse_message, placeholder_names
+from translation_journal import atomic_write_json
+from translation_usage import PLURAL_SUFFIXES, key_of
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+DEFAULT_OUTPUT = "frontend/src/i18n/compiled_messages.json"
+COMPILED_VERSION = 1
+NESTING_PREFIX = '$t('
+
+# 其他 i18next 配置的双花括号写法，在单花括号配置下无法插值
+_DOUBLE_BRACE_PATTERN = re.compile(r'\{\{[^{}]+\}\}')
+
+
+def plural_base(key):
+    """复数键的基础键（如 routes_other -> routes），不是复数键时返回 None"""
+    for suffix in PLURAL_SUFFIXES:
+        if key.endswith(suffix):
+            return key[:-len(suffix)]
+    return None
+
+
+def compile_locale(data):
+    """
+    编译一个语言中所有带占位符的消息
+    返回 ({键: token 列表}, {键: {变量名: 格式}}, [使用双花括号的键])，
+    第二项包含所有字符串（无占位符时为空）供检查使用
+    """
+    compiled = {}
+    placeholders = {}
+    double_braces = []
+    for path, value in flatten(data).items():
+        if not isinstance(value, str):
+            continue
+        key = key_of(path)
+        tokens = parse_message(value)
+        placeholders[key] = placeholder_names(tokens)
+        if _DOUBLE_BRACE_PATTERN.search(value):
+            double_braces.append(key)
+        elif tokens is not None and NESTING_PREFIX not in value:
+            compiled[key] = tokens
+    return compiled, placeholders, double_braces
+
+
+def _family_placeholders(placeholders):
+    """复数键族 {基础键: 所有形式的占位符并集}"""
+    families = {}
+    for key, names in placeholders.items():
+        base = plural_base(key)
+        if base is not None:
+            families.setdefault(base, set()).update(names)
+    return families
+
+
+def validate_placeholders(source, target):
+    """
+    比较源语言与目标语言的占位符，返回问题列表
+    [{'key', 'missing': [变量名], 'extra': [变量名], 'format': [变量名]}]
+    只比较两边都有的键；目标中是复数形式的键与源的整个复数键族比较
+    """
+    families = _family_placeholders(source)
+    issues = []
+    for key, target_names in target.items():
+        base = plural_base(key)
+        if key in source and base is None:
+            expected = source[key]
+            missing = sorted(set(expected) - set(target_names))
+        elif base is not None and (base in families or key in source):
+            expected = dict.fromkeys(families.get(base, ()), None)
+            expected.update(source.get(key, {}))
+            missing = []
+        else:
+            continue
+        extra = sorted(set(target_names) - set(expected))
+        formats = sorted(name for name, fmt in target_names.items()
+                         if name in expected and expected[name] is not None and fmt != expected[name])
+        if missing or extra or formats:
+            issues.append({'key': key, 'missing': missing, 'extra': extra, 'format': formats})
+    return issues
+
+
+def compile_messages(locales_dir=LOCALES_DIR, source_lang='en', languages=None):
+    """
+    编译并检查所有语言
+    返回 {'version', 'format_separator', 'messages': {语言: {键: token 列表}},
+          'issues': {语言: [问题]}, 'double_braces': {语言: [键]}, 'errors': {语言: 错误信息},
+          'stats': {语言: {'strings', 'compiled'}}}
+    """
+    locales_dir = Path(locales_dir)
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob('*.json'))
+    languages = [source_lang] + [lang for lang in languages if lang != source_lang]
+    
+    result = {'version': COMPILED_VERSION, 'format_separator': FORMAT_SEPARATOR,
+              'messages': {}, 'issues': {}, 'double_braces': {}, 'errors': {}, 'stats': {}}
+    source_placeholders = None
+    for lang in languages:
+        try:
+            data = load_json(locales_dir / f'{lang}.json')
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            result['errors'][lang] = str(e)
+            continue
+        compiled, placeholders, double_braces = compile_locale(data)
+        result['messages'][lang] = compiled
+        if double_braces:
+            result['double_braces'][lang] = double_braces
+        result['stats'][lang] = {'strings': len(placeholders), 'compiled': len(compiled)}
+        if lang == source_lang:
+            source_placeholders = placeholders
+        elif source_placeholders is not None:
+            issues = validate_placeholders(source_placeholders, placeholders)
+            if issues:
+                result['issues'][lang] = issues
+    return result
+
+
+def compiled_payload(result):
+    """写入前端的部分（不含检查结果）"""
+    return {
+        'version': result['version'],
+        'format_separator': result['format_separator'],
+        'aliases': {alias: lang for alias, lang in LANGUAGE_ALIASES.items() if lang in result['messages']},
+        'messages': result['messages']
+    }
+
+
+def compile_exit_code(result):
+    """退出码：有语言文件无法读取为 2，有占位符不一致或双花括号为 1，否则为 0"""
+    if result['errors']:
+        return EXIT_ERROR
+    return EXIT_INCOMPLETE if result['issues'] or result['double_braces'] else EXIT_COMPLETE
+
+
+def is_stale(output_path, result):
+    """提交的编译结果是否与语言文件不一致（文件不存在或无法读取也算过期）"""
+    try:
+        existing = load_json(output_path)
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return True
+    return existing != compiled_payload(result)
+
+
+def print_compile_report(result):
+    """打印每个语言的编译数量和占位符问题"""
+    print(f"{'语言':<6} {'字符串':>8} {'带占位符':>8} {'问题':>6}")
+    for lang, stats in result['stats'].items():
+        print(f"{lang:<6} {stats['strings']:>8} {stats['compiled']:>8} {len(result['issues'].get(lang, [])):>6}")
+    for lang, error in result['errors'].items():
+        print(f"✗ {lang}.json 无法读取: {error}")
+    for lang, keys in result['double_braces'].items():
+        print(f"✗ {lang}: {len(keys)} 个键使用双花括号（应为单花括号 {{name}}）: {', '.join(keys[:5])}"
+              + (" ..." if len(keys) > 5 else ""))
+    
+    for lang, issues in result['issues'].items():
+        print(f"\n{lang}: {len(issues)} 个占位符不一致")
+        for issue in issues[:20]:
+            details = []
+            if issue['missing']:
+                details.append(f"缺少 {', '.join('{' + name + '}' for name in issue['missing'])}")
+            if issue['extra']:
+                details.append(f"多出 {', '.join('{' + name + '}' for name in issue['extra'])}")
+            if issue['format']:
+                details.append(f"格式不同 {', '.join(issue['format'])}")
+            print(f"  - {issue['key']}: {'；'.join(details)}")
+        if len(issues) > 20:
+            print(f"  ... 还有 {len(issues) - 20} 个")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='预编译插值消息并检查各语言的占位符是否与源语言一致')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--source-lang', default='en', help='源语言代码 (默认: en)')
+    parser.add_argument('--languages', help='只处理这些语言，逗号分隔 (默认: 目录中的全部语言)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'编译结果路径 (默认: {DEFAULT_OUTPUT})')
+    parser.add_argument('--check', action='store_true', help='只检查占位符，不写入编译结果')
+    parser.add_argument('--verify', action='store_true', help='不写入编译结果，已提交的编译结果过期时返回 1')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='检查结果的输出格式 (默认: text)')
+    
+    args = parser.parse_args()
+    
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+    result = compile_messages(args.locales, args.source_lang, languages)
+    
+    if args.format == 'json':
+        print(json.dumps({'stats': result['stats'], 'issues': result['issues'],
+                          'double_braces': result['double_braces'], 'errors': result['errors']},
+                         ensure_ascii=False, indent=2))
+    else:
+        print_compile_report(result)
+    
+    if args.verify:
+        exit_code = compile_exit_code(result)
+        if args.source_lang in result['messages'] and is_stale(args.output, result):
+            print(f"\n✗ {args.output} 已过期，请运行 python compile_messages.py 并提交")
+            return max(exit_code, EXIT_INCOMPLETE)
+        return exit_code
+    if not args.check and args.source_lang in result['messages']:
+        atomic_write_json(args.output, compiled_payload(result), indent=None)
+        if args.format == 'text':
+            print(f"\n✓ 编译结果已保存到: {args.output}")
+    return compile_exit_code(result)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
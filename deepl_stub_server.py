@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+本地 DeepL 模拟服务
+实现 DeepL /v2/translate 接口的请求和响应格式（重复 text 参数、translations 列表），
+返回确定性的伪翻译，可配置延迟和错误率，用于在无网络环境下压测整个翻译流程。
+
+使用方法:
+    python deepl_stub_server.py --port 8765 --latency 0.2 --error-rate 0.05
+    python auto_translate.py --source en.json --target ar.json --lang ar \\
+        --api deepl --api-key test --deepl-url http://127.0.0.1:8765/v2/translate
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from translation_engines import DEEPL_LANG_MAP, pseudo_translate
+
+# DeepL 语言代码 -> 项目语言代码
+_LANG_CODES = {code: lang for lang, code in DEEPL_LANG_MAP.items()}
+
+
+class DeepLStubHandler(BaseHTTPRequestHandler):
+    """处理 POST /v2/translate"""
+    
+    protocol_version = 'HTTP/1.1'   # 支持 keep-alive
+    
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+        
+        if self.path.split('?')[0] != '/v2/translate':
+            return self._send(404, {'message': 'Not found'})
+        
+        auth_header = self.headers.get('Authorization', '')
+        if not form.get('auth_key') and not auth_header.startswith('DeepL-Auth-Key '):
+            return self._send(403, {'message': 'Authorization failed'})
+        
+        texts = form.get('text', [])
+        target_code = (form.get('target_lang') or [''])[0]
+        if not texts or not target_code:
+            return self._send(400, {'message': 'Parameter text or target_lang not specified'})
+        if len(texts) > 50:
+            return self._send(413, {'message': 'Too many texts'})
+        
+        with server.lock:
+            server.request_count += 1
+            roll = server.random.random()
+            error_status = server.random.choice((429, 503, 456)) if roll < server.error_rate else None
+        
+        if server.latency:
+            time.sleep(server.latency)
+        
+        if error_status == 429:
+            return self._send(429, {'message': 'Too many requests'}, {'Retry-After': str(server.retry_after)})
+        if error_status:
+            return self._send(error_status, {'message': 'Simulated error'})
+        
+        target_lang = _LANG_CODES.get(target_code.upper(), target_code.lower())
+        source_code = (form.get('source_lang') or ['EN'])[0]
+        self._send(200, {
+            'translations': [
+                {'detected_source_language': source_code.upper(), 'text': pseudo_translate(text, target_lang)}
+                for text in texts
+            ]
+        })
+    
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(host='127.0.0.1', port=8765, latency=0.0, error_rate=0.0, retry_after=1, seed=None,
+                  verbose=False):
+    """创建模拟服务（port=0 时自动选择端口，见 server.server_address）"""
+    server = ThreadingHTTPServer((host, port), DeepLStubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.error_rate = error_rate
+    server.retry_after = retry_after
+    server.random = random.Random(seed)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.verbose = verbose
+    return server
+
+
+def start_in_background(**options):
+    """在后台线程中启动模拟服务，返回 (server, 接口地址)"""
+    server = create_server(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v2/translate"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地 DeepL 模拟服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址 (默认: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口 (默认: 8765)')
+    parser.add_argument('--latency', type=float, default=0.0, help='每次请求的模拟延迟（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='请求失败的概率 (0-1)，随机返回 429/456/503')
+    parser.add_argument('--retry-after', type=int, default=1, help='429 响应的 Retry-After 秒数 (默认: 1)')
+    parser.add_argument('--seed', type=int, help='随机种子（固定后失败序列可复现）')
+    parser.add_argument('--verbose', action='store_true', help='打印每个请求')
+    
+    args = parser.parse_args()
+    
+    server = create_server(args.host, args.port, args.latency, args.error_rate, args.retry_after, args.seed,
+                           args.verbose)
+    print(f"DeepL 模拟服务已启动: http://{args.host}:{args.port}/v2/translate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"已处理 {server.request_count} 个请求")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
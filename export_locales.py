@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+导出生产用的语言文件
+frontend/src/i18n/locales 下的文件保持 indent=2 便于人工编辑；生产环境使用本脚本导出的文件：
+- 压缩空白的 JSON（可选把键展开为 "travel.title" 形式的扁平键，只保留叶子）
+- 预压缩的 .gz 和 .br 文件（与 JSON 同名，供 nginx gzip_static / brotli_static 直接使用）
+- 文件名带内容哈希，manifest.json 记录每个语言的文件名和大小
+
+brotli 为可选依赖（pip install brotli），未安装时只生成 .gz。
+
+使用方法:
+    python export_locales.py
+    python export_locales.py --output frontend/public/i18n --flatten-keys
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+from check_translations import load_json
+from locale_index import flatten
+from translation_journal import atomic_write_json
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+DEFAULT_EXPORT_DIR = "frontend/public/i18n"
+MANIFEST_NAME = "manifest.json"
+EXPORT_MANIFEST_VERSION = 1
+HASH_LENGTH = 8
+
+
+def minify_json(data):
+    """压缩空白的 JSON 字节（非 ASCII 字符不转义，避免 \\uXXXX 增大体积）"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def flatten_keys(data):
+    """只保留叶子，键展开为 i18next 可直接查找的扁平键 {'travel.title': ...}"""
+    return {
+        '.'.join(str(part) for part in path): value
+        for path, value in flatten(data).items()
+        if value is not None and not isinstance(value, (dict, list))
+    }
+
+
+def content_hash(payload):
+    """内容哈希（文件名的一部分，内容不变则文件名不变，可长期缓存）"""
+    return hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+
+
+def compress_payload(payload):
+    """返回 {'gz': 字节, 'br': 字节或 None}；gzip 固定 mtime，相同内容输出相同"""
+    return {
+        'gz': gzip.compress(payload, compresslevel=9, mtime=0),
+        'br': brotli.compress(payload, mode=brotli.MODE_TEXT, quality=11) if BROTLI_AVAILABLE else None
+    }
+
+
+def write_hashed(output_dir, stem, payload, compress=True):
+    """
+    写入 <stem>.<哈希>.json 以及 .gz/.br 压缩文件（已存在则跳过），stem 可以包含子目录（如 ar/travel）
+    返回 {'file', 'hash', 'bytes', 'gzip', 'brotli'}，压缩大小未生成时为 None
+    """
+    digest = content_hash(payload)
+    name = f"{stem}.{digest}.json"
+    path = Path(output_dir) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {'file': name, 'hash': digest, 'bytes': len(payload), 'gzip': None, 'brotli': None}
+    if not path.exists():
+        path.write_bytes(payload)
+    if compress:
+        siblings = {'gz': Path(f"{path}.gz"), 'br': Path(f"{path}.br")}
+        if not siblings['gz'].exists() or (BROTLI_AVAILABLE and not siblings['br'].exists()):
+            for suffix, data in compress_payload(payload).items():
+                if data is not None:
+                    siblings[suffix].write_bytes(data)
+        entry['gzip'] = siblings['gz'].stat().st_size
+        if siblings['br'].exists():
+            entry['brotli'] = siblings['br'].stat().st_size
+    return entry
+
+
+def remove_stale(output_dir, previous, current):
+    """删除上次清单中有、本次不再引用的文件（连同压缩文件），返回删除数"""
+    current_files = {entry['file'] for entry in current}
+    removed = 0
+    for entry in previous:
+        if entry['file'] in current_files:
+            continue
+        for suffix in ('', '.gz', '.br'):
+            path = Path(output_dir) / (entry['file'] + suffix)
+            if path.exists():
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def export_locales(locales_dir=LOCALES_DIR, output_dir=DEFAULT_EXPORT_DIR, languages=None, flat=False,
+                   compress=True):
+    """
+    导出所有语言，返回清单 {'version', 'flat_keys', 'languages': {语言: {'file', 'hash', 'bytes', 'gzip',
+    'brotli', 'source_bytes'}}}
+    """
+    locales_dir = Path(locales_dir)
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = load_json(manifest_path, {})
+    
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob('*.json'))
+    
+    manifest = {'version': EXPORT_MANIFEST_VERSION, 'flat_keys': flat, 'languages': {}}
+    for lang in languages:
+        source_path = locales_dir / f'{lang}.json'
+        data = load_json(source_path)
+        entry = write_hashed(output_dir, lang, minify_json(flatten_keys(data) if flat else data), compress)
+        entry['source_bytes'] = source_path.stat().st_size
+        manifest['languages'][lang] = entry
+    
+    remove_stale(output_dir, previous.get('languages', {}).values(), manifest['languages'].values())
+    atomic_write_json(manifest_path, manifest)
+    return manifest
+
+
+def print_size_report(manifest):
+    """打印每个语言的原始、压缩空白、gzip、brotli 大小"""
+    def kb(size):
+        return f"{size / 1024:.1f} KB" if size is not None else '-'
+    
+    print(f"{'语言':<6} {'源文件':>10} {'压缩空白':>10} {'gzip':>10} {'brotli':>10}  文件")
+    totals = {'source_bytes': 0, 'bytes': 0, 'gzip': 0, 'brotli': 0}
+    for lang, entry in manifest['languages'].items():
+        print(f"{lang:<6} {kb(entry['source_bytes']):>10} {kb(entry['bytes']):>10} "
+              f"{kb(entry['gzip']):>10} {kb(entry['brotli']):>10}  {entry['file']}")
+        for field in totals:
+            totals[field] = None if totals[field] is None or entry[field] is None else totals[field] + entry[field]
+    print(f"{'总计':<6} {kb(totals['source_bytes']):>10} {kb(totals['bytes']):>10} "
+          f"{kb(totals['gzip']):>10} {kb(totals['brotli']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='导出压缩、预压缩、带内容哈希的生产用语言文件')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--output', default=DEFAULT_EXPORT_DIR, help=f'输出目录 (默认: {DEFAULT_EXPORT_DIR})')
+    parser.add_argument('--languages', help='只处理这些语言，逗号分隔 (默认: 目录中的全部语言)')
+    parser.add_argument('--flatten-keys', action='store_true', help='键展开为 "a.b.c" 形式的扁平键，只保留叶子')
+    parser.add_argument('--no-compress', action='store_true', help='不生成 .gz/.br 文件')
+    
+    args = parser.parse_args()
+    
+    if not BROTLI_AVAILABLE and not args.no_compress:
+        print("提示: 未安装 brotli，只生成 .gz 文件（pip install brotli）")
+    
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+    manifest = export_locales(args.locales, args.output, languages, args.flatten_keys, not args.no_compress)
+    print_size_report(manifest)
+    print(f"\n✓ 清单: {Path(args.output) / MANIFEST_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+// 预编译的插值消息
+// compiled_messages.json 由 compile_messages.py 生成（修改语言文件后重新运行），
+// 带占位符的消息已解析为 token 列表，渲染时直接拼接，不再在运行时用正则解析 {name}。
+// 列表等高频渲染路径可以用 tc() 代替 t()：不含占位符的字符串直接返回资源，同样跳过插值解析；
+// 复数、上下文、嵌套引用和缺失的键回退到 i18n.t。
+import i18n from './index';
+import compiled from './compiled_messages.json';
+
+const messages = compiled.messages || {};
+// zh-Hans、zh-Hans-CN 与 index.js 一样使用 zh 的资源
+const aliases = compiled.aliases || {};
+
+/**
+ * 按 a.b 路径读取插值参数（与 i18next 一致）
+ */
+const getValue = (values, name) =>
+  name.split('.').reduce((obj, part) => (obj == null ? undefined : obj[part]), values);
+
+/**
+ * 拼接 token 列表
+ * 缺少参数时保留原占位符（与 i18next 的 skipOnVariables 行为一致）
+ */
+export const renderTokens = (tokens, values = {}, lng = i18n.language) => {
+  let result = '';
+  for (const token of tokens) {
+    if (typeof token === 'string') {
+      result += token;
+      continue;
+    }
+    const value = getValue(values, token.v);
+    if (value === undefined) {
+      result += token.f ? `{${token.v}, ${token.f}}` : `{${token.v}}`;
+    } else if (token.f && i18n.services && i18n.services.formatter) {
+      result += i18n.services.formatter.format(value, token.f, lng, values);
+    } else {
+      result += value;
+    }
+  }
+  return result;
+};
+
+/**
+ * 与 t(key, values) 相同，优先使用预编译结果
+ * 按当前语言的回退链查找：某个语言有该键时，有编译结果则拼接，是普通字符串则直接返回，否则交给 i18n.t
+ */
+export const tc = (key, values = {}) => {
+  // 复数和上下文需要 i18next 选择实际的键
+  if (values.count !== undefined || values.context !== undefined) {
+    return i18n.t(key, values);
+  }
+  const languages = i18n.languages && i18n.languages.length ? i18n.languages : [i18n.language];
+  for (const lng of languages) {
+    const compiledLng = aliases[lng] || lng;
+    const tokens = messages[compiledLng] && messages[compiledLng][key];
+    if (tokens) {
+      return renderTokens(tokens, values, lng);
+    }
+    const resource = i18n.getResource(lng, 'translation', key);
+    if (resource !== undefined) {
+      if (typeof resource === 'string' && !resource.includes('{') && !resource.includes('$t(')) {
+        return resource;
+      }
+      break;
+    }
+  }
+  return i18n.t(key, values);
+};
+
+export default tc;
@@ -45,6 +45,7 @@ import {
   ContentCopy as ContentCopyIcon
 } from '@mui/icons-material';
 import { useTranslation } from 'react-i18next';
+import { tc } from '../../i18n/compiledMessages';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNotification } from '../../contexts/NotificationContext';
 import { PERMISSIONS } from '../../config/permissions';
@@ -59,15 +60,16 @@ const devError = (...args) => {
 
 // 优化的表格行组件，使用React.memo避免不必要的重渲染
 const ExpenseTableRow = React.memo(({ expense, onMenuOpen, getStatusColor, getCategoryIcon, t, showNotification }) => {
+  // 行内文本用预编译的 tc()；t 仍作为属性传入，切换语言时触发重新渲染
   const formatDate = useDateFormat(false);
   
   const handleCopyNumber = useCallback((e, number) => {
     e.stopPropagation();
     if (number && number !== '-') {
       navigator.clipboard.writeText(number).then(() => {
-        showNotification(t('common.copied') || '已复制', 'success');
+        showNotification(tc('common.copied') || '已复制', 'success');
       }).catch(() => {
-        showNotification(t('common.copyFailed') || '复制失败', 'error');
+        showNotification(tc('common.copyFailed') || '复制失败', 'error');
       });
     }
   }, [showNotification, t]);
@@ -116,7 +118,7 @@ const ExpenseTableRow = React.memo(({ expense, onMenuOpen, getStatusColor, getCa
           </Avatar>
           <Box>
             <Typography variant="subtitle2" sx={{ fontWeight: 'bold' }}>
-              {expense.title || expense.expenseItem?.itemName || t('expense.untitled')}
+              {expense.title || expense.expenseItem?.itemName || tc('expense.untitled')}
             </Typography>
             <Typography variant="body2" color="text.secondary">
               {(expense.travel?.title && expense.travel.title.trim()) || 
@@ -167,7 +169,7 @@ const ExpenseTableRow = React.memo(({ expense, onMenuOpen, getStatusColor, getCa
           </Typography>
         </Box>
         {expense.isBillable && (
-          <Chip label={t('expense.billable')} size="small" color="success" sx={{ mt: 0.5 }} />
+          <Chip label={tc('expense.billable')} size="small" color="success" sx={{ mt: 0.5 }} />
         )}
       </TableCell>
       <TableCell>
@@ -182,8 +184,8 @@ const ExpenseTableRow = React.memo(({ expense, onMenuOpen, getStatusColor, getCa
         <Chip
           label={
             expense.matchSource === 'auto' || expense.autoMatched === true
-              ? (t('expense.generationType.ai') || 'AI生成')
-              : (t('expense.generationType.manual') || '手动生成')
+              ? (tc('expense.generationType.ai') || 'AI生成')
+              : (tc('expense.generationType.manual') || '手动生成')
           }
           color={expense.matchSource === 'auto' || expense.autoMatched === true ? 'primary' : 'default'}
           size="small"
@@ -192,7 +194,7 @@ const ExpenseTableRow = React.memo(({ expense, onMenuOpen, getStatusColor, getCa
       </TableCell>
       <TableCell>
         <Chip
-          label={t(`expense.statuses.${expense.status}`) || expense.status}
+          label={tc(`expense.statuses.${expense.status}`) || expense.status}
           color={getStatusColor(expense.status)}
           size="small"
         />
@@ -48,6 +48,7 @@ import {
   ContentCopy as ContentCopyIcon
 } from '@mui/icons-material';
 import { useTranslation } from 'react-i18next';
+import { tc } from '../../i18n/compiledMessages';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNotification } from '../../contexts/NotificationContext';
 import { PERMISSIONS } from '../../config/permissions';
@@ -57,6 +58,7 @@ import { useDateFormat } from '../../utils/dateFormatter';
 
 // 优化的表格行组件，使用React.memo避免不必要的重渲染
 const TravelTableRow = React.memo(({ travel, onMenuOpen, getStatusColor, t, showNotification }) => {
+  // 行内文本用预编译的 tc()；t 仍作为属性传入，切换语言时触发重新渲染
   const formatDate = useDateFormat(false);
   const formatDateRange = useDateFormat(true);
   
@@ -64,9 +66,9 @@ const TravelTableRow = React.memo(({ travel, onMenuOpen, getStatusColor, t, show
     e.stopPropagation();
     if (number && number !== '-') {
       navigator.clipboard.writeText(number).then(() => {
-        showNotification(t('common.copied') || '已复制', 'success');
+        showNotification(tc('common.copied') || '已复制', 'success');
       }).catch(() => {
-        showNotification(t('common.copyFailed') || '复制失败', 'error');
+        showNotification(tc('common.copyFailed') || '复制失败', 'error');
       });
     }
   }, [showNotification, t]);
@@ -189,7 +191,7 @@ const TravelTableRow = React.memo(({ travel, onMenuOpen, getStatusColor, t, show
       </TableCell>
       <TableCell>
         <Chip
-          label={t(`travel.statuses.${travel.status}`) || travel.status}
+          label={tc(`travel.statuses.${travel.status}`) || travel.status}
           color={getStatusColor(travel.status)}
           size="small"
         />
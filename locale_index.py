@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+语言文件的扁平化索引
+一次遍历把嵌套的 JSON 转成 {路径元组: 叶子值} 的有序字典，供检查和翻译脚本共用；
+支持列表，可以还原回嵌套结构，源文件与目标文件的比较是线性时间。
+
+路径元组中字符串表示对象的键，整数表示列表下标，例如 ('travel', 'steps', 0, 'title')。
+字符串形式沿用 get_all_keys 的格式 travel.steps[0].title，
+键本身包含 . [ ] \\ 时用反斜杠转义（如 role.permissions\\.selected）。
+"""
+
+import re
+
+_ESCAPE_PATTERN = re.compile(r'([\\.\[\]])')
+
+
+def flatten(data, expand_lists=True):
+    """
+    一次遍历生成 {路径元组: 叶子值}，顺序与 JSON 中的顺序一致
+    空对象和空列表作为叶子保留，保证可以还原
+    expand_lists=False 时列表整体作为叶子（补丁、回退补齐等按整个列表处理的场景）
+    """
+    flat = {}
+    stack = [((), data)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict) and value:
+            stack.extend(((path + (key,), child) for key, child in reversed(list(value.items()))))
+        elif isinstance(value, list) and value and expand_lists:
+            stack.extend(((path + (i,), child) for i, child in reversed(list(enumerate(value)))))
+        elif path:
+            flat[path] = value
+    return flat
+
+
+def unflatten(flat):
+    """把 {路径元组: 叶子值} 还原为嵌套结构（整数路径段还原为列表）"""
+    root = {}
+    for path, value in flat.items():
+        current = root
+        for key, next_key in zip(path, path[1:]):
+            container = [] if isinstance(next_key, int) else {}
+            if isinstance(current, list):
+                while len(current) <= key:
+                    current.append(None)
+                if current[key] is None:
+                    current[key] = container
+                current = current[key]
+            else:
+                current = current.setdefault(key, container)
+        last = path[-1]
+        if isinstance(current, list):
+            while len(current) <= last:
+                current.append(None)
+        current[last] = value
+    return root
+
+
+def path_to_str(path):
+    """路径元组转字符串，如 ('a', 'b', 0) -> 'a.b[0]'"""
+    parts = []
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        else:
+            escaped = _ESCAPE_PATTERN.sub(r'\\\1', key)
+            parts.append(f".{escaped}" if parts else escaped)
+    return ''.join(parts)
+
+
+def parse_path(path_str):
+    """字符串路径转路径元组，path_to_str 的逆操作"""
+    if isinstance(path_str, tuple):
+        return path_str
+    path = []
+    current = []
+    i = 0
+    in_key = False
+    while i < len(path_str):
+        ch = path_str[i]
+        if ch == '\\' and i + 1 < len(path_str):
+            current.append(path_str[i + 1])
+            in_key = True
+            i += 2
+            continue
+        if ch == '.':
+            if in_key:
+                path.append(''.join(current))
+            current = []
+            in_key = False
+        elif ch == '[':
+            if in_key:
+                path.append(''.join(current))
+            end = path_str.index(']', i)
+            path.append(int(path_str[i + 1:end]))
+            current = []
+            in_key = False
+            i = end
+        else:
+            current.append(ch)
+            in_key = True
+        i += 1
+    if in_key:
+        path.append(''.join(current))
+    return tuple(path)
+
+
+def join_path(path_str, key):
+    """在字符串路径后追加一个键或下标"""
+    if isinstance(key, int):
+        return f"{path_str}[{key}]"
+    escaped = _ESCAPE_PATTERN.sub(r'\\\1', key)
+    return f"{path_str}.{escaped}" if path_str else escaped
+
+
+def get_value(data, path):
+    """按路径取值，不存在时返回 None"""
+    value = data
+    for key in parse_path(path):
+        if isinstance(key, int):
+            if not isinstance(value, list) or key >= len(value):
+                return None
+        elif not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def set_value(data, path, value):
+    """按路径设值，自动创建中间的对象或列表"""
+    keys = parse_path(path)
+    current = data
+    for key, next_key in zip(keys, keys[1:]):
+        container = [] if isinstance(next_key, int) else {}
+        if isinstance(key, int):
+            while len(current) <= key:
+                current.append(None)
+            if not isinstance(current[key], (dict, list)):
+                current[key] = container
+        elif not isinstance(current.get(key), (dict, list)):
+            current[key] = container
+        current = current[key]
+    last = keys[-1]
+    if isinstance(last, int):
+        while len(current) <= last:
+            current.append(None)
+    current[last] = value
+
+
+def delete_value(data, path):
+    """按路径删除对象中的键，并清理因此变空的父对象"""
+    keys = parse_path(path)
+    parents = []
+    current = data
+    for key in keys[:-1]:
+        if get_value(current, (key,)) is None:
+            return
+        parents.append((current, key))
+        current = current[key]
+    if isinstance(current, dict):
+        current.pop(keys[-1], None)
+    for parent, key in reversed(parents):
+        if isinstance(parent, dict) and parent[key] == {}:
+            del parent[key]
+
+
+def diff_flat(source_flat, target_flat):
+    """
+    线性时间比较两个扁平索引
+    返回 (缺失的路径, 值与源相同的路径)，顺序与源文件一致
+    """
+    missing = []
+    identical = []
+    for path, source_value in source_flat.items():
+        # 空对象、空列表和 null 不需要翻译
+        if source_value is None or isinstance(source_value, (dict, list)):
+            continue
+        if path not in target_flat or target_flat[path] is None:
+            missing.append(path)
+        elif isinstance(source_value, str) and source_value == target_flat[path] and source_value.strip():
+            identical.append(path)
+    return missing, identical
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+插值占位符解析
+与 frontend/src/i18n/index.js 的 i18next 配置一致：单花括号（prefix '{'、suffix '}'），
+格式用 formatSeparator ',' 分隔，如 "{amount, currency}"。
+compile_messages 用它编译消息，translation_fuzzy 用它判断相似译文的占位符是否一致。
+"""
+
+import re
+
+FORMAT_SEPARATOR = ','   # 与 frontend/src/i18n/index.js 的 interpolation.formatSeparator 一致
+
+# 与 i18next 按 prefix/suffix 生成的插值正则一致（非贪婪匹配到第一个 }）
+_PLACEHOLDER_PATTERN = re.compile(r'\{(.+?)\}')
+
+
+def parse_message(text):
+    """
+    把消息解析为 token 列表：字符串为原文片段，{'v': 变量名, 'f': 格式（可选）} 为占位符
+    没有占位符时返回 None
+    """
+    tokens = []
+    position = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(text):
+        name, _, fmt = match.group(1).partition(FORMAT_SEPARATOR)
+        name = name.strip()
+        if not name:
+            continue
+        if match.start() > position:
+            tokens.append(text[position:match.start()])
+        token = {'v': name}
+        if fmt.strip():
+            token['f'] = fmt.strip()
+        tokens.append(token)
+        position = match.end()
+    if position == 0 and not tokens:
+        return None
+    if position < len(text):
+        tokens.append(text[position:])
+    return tokens
+
+
+def placeholder_names(tokens):
+    """token 列表中的占位符 {变量名: 格式}"""
+    return {token['v']: token.get('f') for token in tokens or () if isinstance(token, dict)}
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+发布带版本号的语言文件和增量补丁
+每次发布时，内容有变化的语言版本号加一，保存该版本的快照（最近 --keep 个），
+并为每个保留的旧版本生成一个直达最新版本的键级补丁:
+    {"lang": "ar", "from": 3, "to": 5, "set": [[["travel", "title"], "..."]], "delete": [["travel", "old"]]}
+已缓存旧版本的客户端只下载对应的补丁（先删除再设值）；版本差距超出保留范围、
+或补丁不比完整文件小时，清单中没有该补丁，客户端下载完整文件。
+客户端按内容哈希判断缓存是否最新、补丁是否适用（补丁记录旧版本的哈希 from_hash），
+版本号只用于命名，即使版本号被重置也不会把旧内容当作最新版本（规则见 plan_update）。
+目前 frontend/src/i18n/index.js 仍打包完整语言文件，这些补丁还没有前端使用方；
+index.js 改为按清单 fetch 语言文件并缓存后，才会按 plan_update 的规则只下载补丁。
+
+列表作为整体处理（任一元素变化时整体替换），路径统一用键的数组表示，键中的 . 不需要转义。
+
+发布状态（随代码提交，不部署；版本号、历史和快照用于计算下一次的补丁）:
+    frontend/src/i18n/releases/state.json                   每个语言的当前版本、哈希和历史
+    frontend/src/i18n/releases/snapshots/<语言>/<版本>.json.gz  历史快照
+发布目录（由发布状态和语言文件重新生成，可以随时删除）:
+    manifest.json                       每个语言的当前版本、完整文件和可用补丁
+    <语言>.<哈希>.json                   完整文件（压缩空白，可选 .gz/.br）
+    patches/<语言>/<旧版本>-<新版本>.<哈希>.json
+
+使用方法:
+    python release_locales.py                      # 发布后提交 frontend/src/i18n/releases
+    python release_locales.py --output frontend/public/i18n/releases --keep 10 --compress
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from check_translations import load_json
+from export_locales import content_hash, minify_json, remove_stale, write_hashed
+from locale_index import delete_value, flatten, set_value
+from translation_journal import atomic_write_json
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+DEFAULT_RELEASE_DIR = "frontend/public/i18n/releases"
+DEFAULT_STATE_DIR = "frontend/src/i18n/releases"
+MANIFEST_NAME = "manifest.json"
+STATE_NAME = "state.json"
+RELEASE_MANIFEST_VERSION = 2   # 2: 补丁带 from_hash，客户端按哈希判断
+DEFAULT_KEEP = 10   # 保留的历史版本数（超过该差距的客户端下载完整文件）
+
+
+def diff_locales(old_data, new_data):
+    """键级差异 (set: [[路径列表, 值]], delete: [路径列表])，应用时先删除再设值"""
+    # 列表和空对象作为叶子
+    old_leaves = flatten(old_data, expand_lists=False)
+    new_leaves = flatten(new_data, expand_lists=False)
+    delete = [list(path) for path in old_leaves if path not in new_leaves]
+    changes = [[list(path), value] for path, value in new_leaves.items()
+               if path not in old_leaves or old_leaves[path] != value]
+    return changes, delete
+
+
+def apply_patch(data, patch):
+    """把补丁应用到数据上（原地修改并返回），客户端应用补丁时使用同样的顺序"""
+    for path in patch['delete']:
+        delete_value(data, tuple(path))
+    for path, value in patch['set']:
+        set_value(data, tuple(path), value)
+    return data
+
+
+def _snapshot_path(state_dir, lang, version):
+    return Path(state_dir) / 'snapshots' / lang / f'{version}.json.gz'
+
+
+def _write_snapshot(path, payload):
+    """写入 gzip 快照（固定 mtime，相同内容输出相同字节，便于提交）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+
+
+def _read_snapshot(path):
+    return json.loads(gzip.decompress(path.read_bytes()).decode('utf-8'))
+
+
+def release_locale(output_dir, state_dir, lang, data, previous=None, keep=DEFAULT_KEEP, compress=False):
+    """
+    发布一个语言，返回 (清单条目, 状态条目, 是否发布了新版本)
+    内容没有变化时版本号不变，但仍按快照重新生成完整文件和补丁（发布目录可以从状态重建）
+    清单条目: {'version', 'hash', 'full': {...}, 'history': [{'version', 'hash', 'released_at'}],
+              'patches': {旧版本: {'file', 'bytes', 'gzip', 'brotli', 'set', 'delete', 'from_hash'}}}
+    状态条目: {'version', 'hash', 'history'}
+    """
+    payload = minify_json(data)
+    digest = content_hash(payload)
+    changed = not previous or previous['hash'] != digest
+    if changed:
+        version = previous['version'] + 1 if previous else 1
+        _write_snapshot(_snapshot_path(state_dir, lang, version), payload)
+        history = (previous['history'] if previous else []) + [
+            {'version': version, 'hash': digest, 'released_at': datetime.now().isoformat(timespec='seconds')}
+        ]
+        for expired in history[:-keep]:
+            _snapshot_path(state_dir, lang, expired['version']).unlink(missing_ok=True)
+        history = history[-keep:]
+    else:
+        version = previous['version']
+        history = previous['history']
+    
+    full = write_hashed(output_dir, lang, payload, compress)
+    patches = {}
+    for item in history[:-1]:
+        old_path = _snapshot_path(state_dir, lang, item['version'])
+        if not old_path.exists():
+            continue
+        old_data = _read_snapshot(old_path)
+        changes, delete = diff_locales(old_data, data)
+        patch = {'lang': lang, 'from': item['version'], 'to': version, 'set': changes, 'delete': delete}
+        if apply_patch(old_data, patch) != data:
+            raise ValueError(f"{lang} 补丁 {item['version']} -> {version} 校验失败")
+        patch_payload = minify_json(patch)
+        # 补丁不比完整文件小时不生成，客户端直接下载完整文件
+        if len(patch_payload) >= len(payload):
+            continue
+        entry = write_hashed(output_dir, f"patches/{lang}/{item['version']}-{version}", patch_payload, compress)
+        entry.update({'set': len(changes), 'delete': len(delete), 'from_hash': item['hash']})
+        patches[str(item['version'])] = entry
+    
+    manifest_entry = {'version': version, 'hash': digest, 'full': full, 'history': history, 'patches': patches}
+    return manifest_entry, {'version': version, 'hash': digest, 'history': history}, changed
+
+
+def release_locales(locales_dir=LOCALES_DIR, output_dir=DEFAULT_RELEASE_DIR, languages=None, keep=DEFAULT_KEEP,
+                    compress=False, state_dir=DEFAULT_STATE_DIR):
+    """
+    发布所有语言，返回 (清单, 本次发布了新版本的语言列表)
+    清单: {'version', 'keep', 'languages': {语言: 清单条目}}
+    未处理的语言沿用发布状态中的版本，同样重新生成发布文件
+    """
+    locales_dir = Path(locales_dir)
+    output_dir = Path(output_dir)
+    state_path = Path(state_dir) / STATE_NAME
+    manifest_path = output_dir / MANIFEST_NAME
+    state = load_json(state_path, {})
+    previous_states = state.get('languages', {})
+    previous = load_json(manifest_path, {})
+    
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob('*.json'))
+    requested = set(languages)
+    languages = sorted(requested | set(previous_states))
+    
+    manifest = {'version': RELEASE_MANIFEST_VERSION, 'keep': keep, 'languages': {}}
+    states = dict(previous_states)
+    released = []
+    for lang in languages:
+        if lang in requested:
+            data = load_json(locales_dir / f'{lang}.json')
+        else:
+            data = _read_snapshot(_snapshot_path(state_dir, lang, previous_states[lang]['version']))
+        entry, states[lang], changed = release_locale(output_dir, state_dir, lang, data, previous_states.get(lang),
+                                                      keep, compress)
+        manifest['languages'][lang] = entry
+        if changed:
+            released.append(lang)
+    
+    def files(languages):
+        return [item for entry in languages.values() for item in [entry['full'], *entry['patches'].values()]]
+    
+    remove_stale(output_dir, files(previous.get('languages', {})), files(manifest['languages']))
+    atomic_write_json(state_path, {'version': RELEASE_MANIFEST_VERSION, 'keep': keep, 'languages': states})
+    atomic_write_json(manifest_path, manifest)
+    return manifest, released
+
+
+def plan_update(manifest, lang, cached_version=None, cached_hash=None):
+    """
+    客户端更新计划，按内容哈希判断，版本号只用于查找补丁
+    返回 ('current', None) | ('patch', 补丁条目) | ('full', 完整文件条目)
+    """
+    entry = manifest['languages'][lang]
+    if cached_hash is not None and cached_hash == entry['hash']:
+        return 'current', None
+    patch = entry['patches'].get(str(cached_version)) if cached_version is not None else None
+    if patch and cached_hash is not None and patch['from_hash'] == cached_hash:
+        return 'patch', patch
+    return 'full', entry['full']
+
+
+def print_release_report(manifest, released):
+    """打印每个语言的版本、完整文件大小和落后一个版本的客户端需要下载的大小"""
+    def kb(size):
+        return f"{size / 1024:.1f} KB"
+    
+    print(f"{'语言':<6} {'版本':>6} {'完整文件':>10} {'补丁数':>6} {'落后 1 版本下载':>16}")
+    for lang, entry in manifest['languages'].items():
+        full = entry['full']['gzip'] or entry['full']['bytes']
+        line = f"{lang:<6} {entry['version']:>6} {kb(entry['full']['bytes']):>10} {len(entry['patches']):>6}"
+        behind = entry['history'][-2] if len(entry['history']) > 1 else {'version': None, 'hash': None}
+        action, target = plan_update(manifest, lang, behind['version'], behind['hash'])
+        if action == 'patch':
+            size = target['gzip'] or target['bytes']
+            line += f" {kb(size):>16}（{size / full:.1%}，设值 {target['set']}，删除 {target['delete']}）"
+        else:
+            line += f" {'-':>16}"
+        if lang in released:
+            line += "  ← 新版本"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='发布带版本号的语言文件，生成旧版本到最新版本的增量补丁')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--output', default=DEFAULT_RELEASE_DIR, help=f'发布目录 (默认: {DEFAULT_RELEASE_DIR})')
+    parser.add_argument('--state', default=DEFAULT_STATE_DIR,
+                        help=f'发布状态目录，随代码提交 (默认: {DEFAULT_STATE_DIR})')
+    parser.add_argument('--languages', help='只处理这些语言，逗号分隔 (默认: 目录中的全部语言)')
+    parser.add_argument('--keep', type=int, default=DEFAULT_KEEP,
+                        help=f'保留的历史版本数，落后更多的客户端下载完整文件 (默认: {DEFAULT_KEEP})')
+    parser.add_argument('--compress', action='store_true', help='同时生成预压缩的 .gz/.br 文件（见 export_locales）')
+    
+    args = parser.parse_args()
+    
+    if args.keep < 1:
+        parser.error('--keep 至少为 1')
+    
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+    manifest, released = release_locales(args.locales, args.output, languages, args.keep, args.compress, args.state)
+    print_release_report(manifest, released)
+    print(f"\n✓ {len(released)} 个语言发布了新版本" if released else "\n✓ 内容没有变化，版本号不变")
+    print(f"✓ 清单: {Path(args.output) / MANIFEST_NAME}")
+    print(f"✓ 发布状态: {Path(args.state) / STATE_NAME}（请提交）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
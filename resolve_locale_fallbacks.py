@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+构建时展开回退链
+frontend/src/i18n/index.js 把 getFallbackChain(resolvedLocale) 作为 fallbackLng，ar/th/vi 等语言中缺失的键
+在运行时要沿回退链逐个查找，并触发 missingKeyHandler → i18nMonitor。
+本脚本按 frontend/src/utils/localeResolver.js 中的 FALLBACK_CHAINS 预先展开每个语言：
+缺失的键从回退链中第一个有该键的语言补齐，输出完整的语言包（带内容哈希的文件 + manifest.json），
+运行时第一次查找即可命中。
+
+哪些键由哪个回退语言补齐记录在 fallback_report.json 中（这些键仍然需要翻译）。
+
+使用方法:
+    python resolve_locale_fallbacks.py
+    python resolve_locale_fallbacks.py --output frontend/public/i18n/resolved --compress
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from build_locale_bundles import LANGUAGE_ALIASES
+from check_translations import load_json
+from export_locales import minify_json, remove_stale, write_hashed
+from locale_index import flatten, set_value
+from translation_journal import atomic_write_json
+from translation_usage import key_of
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+LOCALE_RESOLVER = "frontend/src/utils/localeResolver.js"
+DEFAULT_RESOLVED_DIR = "frontend/public/i18n/resolved"
+MANIFEST_NAME = "manifest.json"
+REPORT_NAME = "fallback_report.json"
+RESOLVED_MANIFEST_VERSION = 1
+DEFAULT_LOCALE = 'en'   # 与 localeResolver.js 的 DEFAULT_LOCALE 一致
+
+_CHAINS_BLOCK_PATTERN = re.compile(r'export\s+const\s+FALLBACK_CHAINS\s*=\s*\{(.*?)\};', re.S)
+_CHAIN_PATTERN = re.compile(r"""['"]?([\w-]+)['"]?\s*:\s*\[([^\]]*)\]""")
+_CODE_PATTERN = re.compile(r"""['"]([\w-]+)['"]""")
+
+
+def load_fallback_chains(resolver_path=LOCALE_RESOLVER):
+    """从 localeResolver.js 读取 FALLBACK_CHAINS {语言: [回退链]}"""
+    text = Path(resolver_path).read_text(encoding='utf-8')
+    block = _CHAINS_BLOCK_PATTERN.search(text)
+    if not block:
+        raise ValueError(f"{resolver_path} 中没有找到 FALLBACK_CHAINS")
+    body = re.sub(r'//[^\n]*', '', block.group(1))
+    return {match.group(1): _CODE_PATTERN.findall(match.group(2)) for match in _CHAIN_PATTERN.finditer(body)}
+
+
+def fallback_chain(chains, lang):
+    """与 getFallbackChain 一致（未配置的语言使用默认语言的链），并保证语言本身在最前"""
+    chain = chains.get(lang) or chains.get(DEFAULT_LOCALE) or [DEFAULT_LOCALE]
+    return [lang] + [code for code in chain if code != lang]
+
+
+def _copy_json(data):
+    """深拷贝 JSON 数据（比 copy.deepcopy 快）"""
+    if isinstance(data, dict):
+        return {key: _copy_json(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_copy_json(value) for value in data]
+    return data
+
+
+def _is_blocked(data, path):
+    """路径上的某个父节点已经是非对象值（此时不补齐，避免覆盖已有的值）"""
+    current = data
+    for key in path[:-1]:
+        if key not in current:
+            return False
+        current = current[key]
+        if not isinstance(current, dict):
+            return True
+    return False
+
+
+def resolve_locale(lang, resources, chains):
+    """
+    按回退链补齐一个语言
+    resources: {语言或别名: 数据}（已加载的语言文件，别名指向同一份数据）
+    返回 (补齐后的数据, {回退语言: [补齐的键]})
+    """
+    resolved = _copy_json(resources[lang])
+    # 列表整体补齐，不与回退语言的列表逐项合并
+    present = set(flatten(resolved, expand_lists=False))
+    filled = {}
+    for fallback in fallback_chain(chains, lang)[1:]:
+        data = resources.get(fallback)
+        if data is None or data is resources[lang]:
+            continue
+        for path, value in flatten(data, expand_lists=False).items():
+            if path in present or value is None or _is_blocked(resolved, path):
+                continue
+            set_value(resolved, path, value)
+            present.add(path)
+            filled.setdefault(fallback, []).append(key_of(path))
+    return resolved, filled
+
+
+def resolve_all(locales_dir=LOCALES_DIR, output_dir=DEFAULT_RESOLVED_DIR, resolver_path=LOCALE_RESOLVER,
+                languages=None, compress=False):
+    """
+    展开所有语言，写入带哈希的文件、清单和回退报告
+    返回 (清单, 报告)
+    清单: {'version', 'aliases', 'languages': {语言: {'file', 'hash', 'bytes', 'gzip', 'brotli', 'filled'}}}
+    报告: {语言: {'chain', 'filled': {回退语言: [键]}}}
+    """
+    locales_dir = Path(locales_dir)
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = load_json(manifest_path, {})
+    chains = load_fallback_chains(resolver_path)
+    
+    available = sorted(path.stem for path in locales_dir.glob('*.json'))
+    if languages is None:
+        languages = available
+    # 与 index.js 的 resources 一致：别名使用同一份数据
+    resources = {lang: load_json(locales_dir / f'{lang}.json') for lang in available}
+    for alias, lang in LANGUAGE_ALIASES.items():
+        if lang in resources:
+            resources[alias] = resources[lang]
+    
+    manifest = {
+        'version': RESOLVED_MANIFEST_VERSION,
+        'aliases': {alias: lang for alias, lang in LANGUAGE_ALIASES.items() if lang in languages},
+        'languages': {}
+    }
+    report = {}
+    for lang in languages:
+        resolved, filled = resolve_locale(lang, resources, chains)
+        entry = write_hashed(output_dir, lang, minify_json(resolved), compress)
+        entry['filled'] = sum(len(keys) for keys in filled.values())
+        manifest['languages'][lang] = entry
+        report[lang] = {'chain': fallback_chain(chains, lang), 'filled': filled}
+    
+    remove_stale(output_dir, previous.get('languages', {}).values(), manifest['languages'].values())
+    atomic_write_json(manifest_path, manifest)
+    atomic_write_json(output_dir / REPORT_NAME, report)
+    return manifest, report
+
+
+def print_fallback_report(report):
+    """打印每个语言的回退链和从各回退语言补齐的键数"""
+    print(f"{'语言':<6} {'回退链':<28} {'补齐':>6}  来源")
+    for lang, entry in report.items():
+        total = sum(len(keys) for keys in entry['filled'].values())
+        sources = '，'.join(f"{fallback} {len(keys)}" for fallback, keys in entry['filled'].items()) or '-'
+        print(f"{lang:<6} {' → '.join(entry['chain']):<28} {total:>6}  {sources}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按 FALLBACK_CHAINS 预先展开回退链，输出完整的语言包')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--resolver', default=LOCALE_RESOLVER, help=f'定义 FALLBACK_CHAINS 的文件 (默认: {LOCALE_RESOLVER})')
+    parser.add_argument('--output', default=DEFAULT_RESOLVED_DIR, help=f'输出目录 (默认: {DEFAULT_RESOLVED_DIR})')
+    parser.add_argument('--languages', help='只处理这些语言，逗号分隔 (默认: 目录中的全部语言)')
+    parser.add_argument('--compress', action='store_true', help='同时生成预压缩的 .gz/.br 文件（见 export_locales）')
+    
+    args = parser.parse_args()
+    
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+    manifest, report = resolve_all(args.locales, args.output, args.resolver, languages, args.compress)
+    print_fallback_report(report)
+    print(f"\n✓ 清单: {Path(args.output) / MANIFEST_NAME}")
+    print(f"✓ 回退报告: {Path(args.output) / REPORT_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+按路由拆分翻译键
+frontend/src/pages 下每个页面目录（Travel、TravelStandard、Expense、Invoice、Flight、Hotel、Approval 等）
+只用到 en.json 中的一小部分键，但每个页面都加载了全部键。本脚本静态分析每个页面目录及其（递归）导入的
+组件、工具模块引用的键（扫描规则与 check_translations --usage 相同），为每个语言生成:
+    core.<哈希>.json       公共包：应用外壳（index.js、App.js、Layout 等，不含页面）用到的键，
+                          以及至少 --core-min-routes 个路由共用的键
+    <路由>.<哈希>.json     该路由独有的键（不含公共包中的键）
+每个路由相对完整语言文件节省的字节数写入报告，用于评估按路由加载翻译的收益。
+目前 App.js 静态导入所有页面、index.js 打包完整语言文件，这些子集还没有前端使用方；
+改为路由级代码拆分（React.lazy）后，进入路由时用 i18n.addResourceBundle 加载公共包和该路由的子集。
+
+动态键（t(`travel.statuses.${status}`)）按前缀整体计入引用它的路由；没有被任何文件静态引用的键不进入
+任何子集（数量记录在清单的 unreferenced 中），需要时仍可回退到完整语言文件。
+
+输出目录:
+    manifest.json      {'version', 'aliases', 'routes': {路由: {'paths', 'files', 'keys'}}, 'core': {'keys'},
+                        'unreferenced', 'languages': {语言: {'full_bytes', 'core': {...}, 'routes': {路由: {...}}}}}
+    <语言>/core.<哈希>.json、<语言>/<路由>.<哈希>.json
+
+使用方法:
+    python route_locale_subsets.py
+    python route_locale_subsets.py --output frontend/public/i18n/routes --core-min-routes 3 --compress
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+
+from build_locale_bundles import LANGUAGE_ALIASES
+from check_translations import load_json
+from export_locales import minify_json, remove_stale, write_hashed
+from locale_cache import load_locale
+from locale_index import unflatten
+from translation_journal import atomic_write_json
+from translation_usage import (
+    DEFAULT_SRC_DIR, DEFAULT_USAGE_CACHE, SCAN_EXTENSIONS, defined_keys, keys_used_by, scan_sources
+)
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+DEFAULT_ROUTES_DIR = "frontend/public/i18n/routes"
+MANIFEST_NAME = "manifest.json"
+ROUTES_MANIFEST_VERSION = 1
+PAGES_DIR = 'pages'
+SHELL_ENTRIES = ('index.js', 'App.js')
+CORE_NAME = 'core'
+DEFAULT_CORE_MIN_ROUTES = 3   # 至少这么多个路由共用的键放入公共包
+
+# import x from './a' / import './a' / export { x } from './a' / import('./a') / require('./a')
+_IMPORT_PATTERN = re.compile(
+    r"""(?:\bfrom\s+|\bimport\s*\(?\s*|\brequire\s*\(\s*)(['"])(\.{1,2}/[^'"]*)\1"""
+)
+_PAGE_IMPORT_PATTERN = re.compile(r"""import\s+(\w+)\s+from\s+['"]\./pages/([\w-]+)/""")
+_ROUTE_PATH_PATTERN = re.compile(r"""<Route\b[^>]*?\bpath=["']([^"']+)["']""", re.S)
+_COMPONENT_PATTERN = re.compile(r"<([A-Z]\w*)")
+
+
+def _resolve_import(from_file, specifier):
+    """解析相对导入为源文件路径（补全扩展名或 index 文件），不是源文件时返回 None"""
+    base = os.path.normpath(os.path.join(os.path.dirname(from_file), specifier))
+    candidates = [base] + [base + ext for ext in SCAN_EXTENSIONS] + [os.path.join(base, 'index' + ext)
+                                                                   for ext in SCAN_EXTENSIONS]
+    for candidate in candidates:
+        if candidate.endswith(SCAN_EXTENSIONS) and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def import_graph(files):
+    """{文件: [导入的源文件]}（只跟踪相对导入，node_modules 中的包不参与）"""
+    graph = {}
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        imports = (_resolve_import(path, match.group(2)) for match in _IMPORT_PATTERN.finditer(text))
+        graph[path] = sorted({target for target in imports if target})
+    return graph
+
+
+def reachable(graph, entries, exclude_dir=None):
+    """从入口文件出发可以到达的文件集合；exclude_dir 下的文件不进入（用于应用外壳不展开页面）"""
+    seen = set()
+    stack = [entry for entry in entries if entry in graph]
+    while stack:
+        path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for target in graph.get(path, ()):
+            if exclude_dir and target.startswith(exclude_dir + os.sep):
+                continue
+            if target not in seen:
+                stack.append(target)
+    return seen
+
+
+def route_paths(app_file):
+    """从 App.js 的 <Route path=... element={<页面 />}> 读取每个页面目录对应的 URL 路径 {页面目录: [路径]}"""
+    if not os.path.isfile(app_file):
+        return {}
+    with open(app_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    components = {match.group(1): match.group(2) for match in _PAGE_IMPORT_PATTERN.finditer(text)}
+    paths = {}
+    matches = list(_ROUTE_PATH_PATTERN.finditer(text))
+    for match, following in zip(matches, matches[1:] + [None]):
+        # path 到下一个 <Route path= 之间的第一个页面组件
+        element = text[match.end():following.start() if following else len(text)]
+        for component in _COMPONENT_PATTERN.findall(element):
+            if component in components:
+                paths.setdefault(components[component], []).append(match.group(1))
+                break
+    return paths
+
+
+def analyze_routes(source_data, src_dir=DEFAULT_SRC_DIR, cache_path=DEFAULT_USAGE_CACHE,
+                   core_min_routes=DEFAULT_CORE_MIN_ROUTES, workers=None):
+    """
+    静态分析每个页面目录用到的键
+    返回 {'routes': {路由: {'paths', 'files', 'keys': [键]}}, 'core': [键], 'unreferenced': 键数,
+          'paths': {键: 路径元组}}
+    路由的键已去掉公共包中的键，键的顺序与 en.json 一致
+    """
+    src_dir = os.path.normpath(src_dir)
+    pages_dir = os.path.join(src_dir, PAGES_DIR)
+    scan_results, _ = scan_sources(src_dir, cache_path, workers)
+    scan_results = {os.path.normpath(path): result for path, result in scan_results.items()}
+    graph = import_graph(scan_results)
+    defined_paths, containers = defined_keys(source_data)
+    
+    def used(files):
+        return keys_used_by((scan_results[path] for path in files if path in scan_results), defined_paths, containers)
+    
+    shell_files = reachable(graph, [os.path.join(src_dir, name) for name in SHELL_ENTRIES], exclude_dir=pages_dir)
+    core = used(shell_files)
+    
+    urls = route_paths(os.path.join(src_dir, 'App.js'))
+    routes = {}
+    for route_dir in sorted(Path(pages_dir).iterdir() if os.path.isdir(pages_dir) else []):
+        if not route_dir.is_dir():
+            continue
+        prefix = str(route_dir) + os.sep
+        entries = [path for path in graph if path.startswith(prefix)]
+        files = reachable(graph, entries)
+        routes[route_dir.name] = {'paths': urls.get(route_dir.name, []), 'files': len(files), 'keys': used(files)}
+    
+    # 多个路由共用的键放入公共包
+    counts = {}
+    for entry in routes.values():
+        for key in entry['keys']:
+            counts[key] = counts.get(key, 0) + 1
+    core.update(key for key, count in counts.items() if count >= core_min_routes)
+    referenced = set(core)
+    for entry in routes.values():
+        referenced.update(entry['keys'])
+        entry['keys'] = [key for key in defined_paths if key in entry['keys'] and key not in core]
+    
+    return {
+        'routes': routes,
+        'core': [key for key in defined_paths if key in core],
+        'unreferenced': len(defined_paths) - len(referenced),
+        'paths': defined_paths
+    }
+
+
+def subset(flat, paths):
+    """从扁平索引中取出给定路径，还原为嵌套结构（目标语言缺少的键跳过，运行时按 fallbackLng 回退）"""
+    return unflatten({path: flat[path] for path in paths if path in flat})
+
+
+def build_route_subsets(locales_dir=LOCALES_DIR, output_dir=DEFAULT_ROUTES_DIR, src_dir=DEFAULT_SRC_DIR,
+                        source_lang='en', languages=None, core_min_routes=DEFAULT_CORE_MIN_ROUTES, compress=False,
+                        cache_path=DEFAULT_USAGE_CACHE):
+    """分析路由、写入每个语言的公共包和路由子集以及清单，返回清单"""
+    locales_dir = Path(locales_dir)
+    output_dir = Path(output_dir)
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = load_json(manifest_path, {})
+    
+    source_data = load_locale(locales_dir / f'{source_lang}.json')
+    analysis = analyze_routes(source_data, src_dir, cache_path, core_min_routes)
+    paths = analysis['paths']
+    if languages is None:
+        languages = sorted(path.stem for path in locales_dir.glob('*.json'))
+    
+    manifest = {
+        'version': ROUTES_MANIFEST_VERSION,
+        'aliases': {alias: lang for alias, lang in LANGUAGE_ALIASES.items() if lang in languages},
+        'routes': {name: {'paths': entry['paths'], 'files': entry['files'], 'keys': len(entry['keys'])}
+                   for name, entry in analysis['routes'].items()},
+        'core': {'keys': len(analysis['core'])},
+        'unreferenced': analysis['unreferenced'],
+        'languages': {}
+    }
+    for lang in languages:
+        locale_path = locales_dir / f'{lang}.json'
+        data, flat = load_locale(locale_path, with_flat=True)
+        entry = {
+            'full_bytes': len(minify_json(data)),
+            'core': write_hashed(output_dir, f'{lang}/{CORE_NAME}',
+                                 minify_json(subset(flat, [paths[key] for key in analysis['core']])), compress),
+            'routes': {}
+        }
+        for name, route in analysis['routes'].items():
+            entry['routes'][name] = write_hashed(output_dir, f'{lang}/{name}',
+                                                 minify_json(subset(flat, [paths[key] for key in route['keys']])),
+                                                 compress)
+        manifest['languages'][lang] = entry
+    
+    def files(languages):
+        return [item for entry in languages.values() for item in [entry['core'], *entry['routes'].values()]]
+    
+    remove_stale(output_dir, files(previous.get('languages', {})), files(manifest['languages']))
+    atomic_write_json(manifest_path, manifest)
+    return manifest
+
+
+def route_savings(manifest, lang):
+    """{路由: {'bytes': 公共包 + 路由子集, 'saved': 比完整文件少的字节数, 'ratio'}}"""
+    entry = manifest['languages'][lang]
+    savings = {}
+    for name, route in entry['routes'].items():
+        size = entry['core']['bytes'] + route['bytes']
+        saved = entry['full_bytes'] - size
+        savings[name] = {'bytes': size, 'saved': saved,
+                         'ratio': round(saved / entry['full_bytes'], 4) if entry['full_bytes'] else 0.0}
+    return savings
+
+
+def print_route_report(manifest, lang):
+    """打印每个路由的键数和相对完整语言文件节省的字节数"""
+    def kb(size):
+        return f"{size / 1024:.1f} KB"
+    
+    entry = manifest['languages'][lang]
+    print(f"语言 {lang}: 完整文件 {kb(entry['full_bytes'])}，公共包 {kb(entry['core']['bytes'])}"
+          f"（{manifest['core']['keys']} 个键），未被静态引用的键 {manifest['unreferenced']} 个")
+    print(f"{'路由':<16} {'文件':>5} {'独有键':>7} {'公共包+子集':>12} {'节省':>20}")
+    for name, saving in route_savings(manifest, lang).items():
+        route = manifest['routes'][name]
+        print(f"{name:<16} {route['files']:>5} {route['keys']:>7} {kb(saving['bytes']):>12} "
+              f"{kb(saving['saved']):>10}（{saving['ratio']:.1%}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按页面目录静态分析翻译键引用，生成公共包和每个路由的语言子集')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--src-dir', default=DEFAULT_SRC_DIR, help=f'源码目录 (默认: {DEFAULT_SRC_DIR})')
+    parser.add_argument('--output', default=DEFAULT_ROUTES_DIR, help=f'输出目录 (默认: {DEFAULT_ROUTES_DIR})')
+    parser.add_argument('--source-lang', default='en', help='源语言代码（按它的键分析引用）')
+    parser.add_argument('--languages', help='只处理这些语言，逗号分隔 (默认: 目录中的全部语言)')
+    parser.add_argument('--core-min-routes', type=int, default=DEFAULT_CORE_MIN_ROUTES,
+                        help=f'至少被这么多个路由引用的键放入公共包 (默认: {DEFAULT_CORE_MIN_ROUTES})')
+    parser.add_argument('--usage-cache', default=DEFAULT_USAGE_CACHE, help=f'扫描缓存路径 (默认: {DEFAULT_USAGE_CACHE})')
+    parser.add_argument('--compress', action='store_true', help='同时生成预压缩的 .gz/.br 文件（见 export_locales）')
+    parser.add_argument('--report-lang', default='en', help='报告中展示节省字节数的语言 (默认: en)')
+    
+    args = parser.parse_args()
+    
+    if args.core_min_routes < 1:
+        parser.error('--core-min-routes 至少为 1')
+    
+    languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
+    manifest = build_route_subsets(args.locales, args.output, args.src_dir, args.source_lang, languages,
+                                   args.core_min_routes, args.compress, args.usage_cache)
+    report_lang = args.report_lang if args.report_lang in manifest['languages'] else next(iter(manifest['languages']))
+    print_route_report(manifest, report_lang)
+    print(f"\n✓ 清单: {Path(args.output) / MANIFEST_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
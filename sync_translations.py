@@ -2,15 +2,34 @@
 """
 同步所有语言的翻译
 自动检查并翻译所有目标语言文件
+
+en.json 只解析一次，各目标语言在同一进程内并行处理，
+结果以结构化数据返回（不再启动子进程并解析输出）。
 """
 
-import json
-import subprocess
+import io
 import sys
-from pathlib import Path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from check_translations import build_coverage_matrix
+from locale_cache import add_locale_cache_arguments, configure_locale_cache_from_args, load_locale
+from auto_translate import auto_translate_missing
+from translation_memory import DEFAULT_MEMORY_PATH, TranslationMemory, add_memory_arguments
+from translation_concurrency import DEFAULT_CONCURRENCY, add_concurrency_arguments, create_limiter
+from translation_journal import DEFAULT_CHECKPOINT_INTERVAL, add_journal_arguments
+from translation_manifest import DEFAULT_MANIFEST_PATH, SyncManifest, compute_fingerprints
+from translation_clients import add_client_arguments, close_clients, configure_clients
+from translation_engines import add_engine_arguments, configure_engines_from_args
+from translation_allowlist import add_allowlist_arguments, open_allowlist
+from translation_fuzzy import add_fuzzy_arguments, open_fuzzy
+from translation_metrics import add_metrics_arguments, instrumented, stage
+from translation_retry import AdaptiveController, add_retry_arguments, configure_retry_from_args, format_controller_summary
 
 # 配置
 SOURCE_FILE = "frontend/src/i18n/locales/en.json"
+LOCALES_DIR = "frontend/src/i18n/locales"
 TARGET_LANGUAGES = {
     'ar': 'Arabic',
     'vi': 'Vietnamese',
@@ -20,90 +39,205 @@ TARGET_LANGUAGES = {
     'ko': 'Korean'
 }
 
-def sync_all_translations(api_type='google', api_key=None, dry_run=False):
-    """同步所有语言的翻译"""
-    results = {}
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    按线程分流 stdout：工作线程的输出写入各自的缓冲区，
+    处理完成后整段打印，避免多个语言的日志交错
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def capture(self):
+        self._local.buffer = io.StringIO()
+    
+    def release(self):
+        buffer = getattr(self._local, 'buffer', None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer else ''
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self.stream).write(text)
     
-    for lang_code, lang_name in TARGET_LANGUAGES.items():
-        if lang_code == 'en':
-            continue
-        
-        target_file = f"frontend/src/i18n/locales/{lang_code}.json"
-        
-        print(f"\n{'='*60}")
-        print(f"处理语言: {lang_name} ({lang_code})")
-        print(f"{'='*60}")
-        
-        # 检查缺失的翻译
-        cmd = [
-            sys.executable, 'check_translations.py',
-            '--source', SOURCE_FILE,
-            '--target', target_file
-        ]
-        
+    def flush(self):
+        self.stream.flush()
+
+
+def sync_language(lang_code, source_data, api_type='google', api_key=None, dry_run=False, memory=None,
+                  concurrency=DEFAULT_CONCURRENCY, limiter=None, changes=None, journal=True,
+                  checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, coverage=None, controller=None, fuzzy=None,
+                  source_flat=None, allowlist=None):
+    """
+    同步单个语言，返回结构化结果
+    {'status': complete|needs_translation|translated|error, 'missing', 'untranslated', ...}
+    changes: 增量模式下自上次同步以来的变化，None 表示全量检查
+    journal: 断点续传，中断后再次同步只翻译剩余的键（见 translation_journal）
+    coverage: 仅检查模式下已计算好的覆盖率（build_coverage_matrix 的 summary 条目），不再单独比较
+    controller: 所有语言共用的 AdaptiveController，限流时整体降速（见 translation_retry）
+    fuzzy: 所有语言共用的 FuzzyReuse，请求前查找相似的已有翻译（见 translation_fuzzy）
+    source_flat: source_data 的扁平索引，所有语言共用
+    allowlist: 所有语言共用的 IdenticalAllowlist，其中的键与原文相同也不再翻译（见 translation_allowlist）
+    """
+    target_file = f"{LOCALES_DIR}/{lang_code}.json"
+    start = time.time()
+    
+    try:
+        if dry_run and changes is not None:
+            total_missing = len(changes['added']) + len(changes['changed'])
+            result = {
+                'status': 'needs_translation' if total_missing or changes['deleted'] else 'complete',
+                'missing': total_missing,
+                'missing_count': len(changes['added']),
+                'untranslated_count': len(changes['changed']),
+                'deleted_count': len(changes['deleted'])
+            }
+        elif dry_run:
+            if coverage is None:
+                target_data, target_flat = load_locale(target_file, {}, with_flat=True)
+                verified = {lang_code: allowlist.for_locale(lang_code)} if allowlist else None
+                matrix = build_coverage_matrix(source_data, {lang_code: target_data}, source_flat,
+                                               {lang_code: target_flat}, verified)
+                coverage = matrix['summary'][lang_code]
+            total_missing = coverage['missing'] + coverage['untranslated']
+            result = {
+                'status': 'needs_translation' if total_missing else 'complete',
+                'missing': total_missing,
+                'missing_count': coverage['missing'],
+                'untranslated_count': coverage['untranslated'],
+                'coverage': coverage['coverage']
+            }
+        else:
+            summary = auto_translate_missing(
+                SOURCE_FILE, target_file, lang_code,
+                api_type=api_type, api_key=api_key, memory=memory,
+                concurrency=concurrency, limiter=limiter, source_data=source_data, changes=changes,
+                journal=journal, checkpoint_interval=checkpoint_interval, controller=controller,
+                fuzzy=fuzzy, source_flat=source_flat, allowlist=allowlist
+            )
+            total_missing = summary['missing'] + summary['untranslated']
+            result = {
+                'status': 'translated' if total_missing or summary['deleted'] else 'complete',
+                'missing': total_missing,
+                'missing_count': summary['missing'],
+                'untranslated_count': summary['untranslated'],
+                'deleted_count': summary['deleted'],
+                'translated': summary['translated'],
+                'skipped': summary['skipped'],
+                'failed': summary['failed'],
+                'failed_paths': summary['failed_paths'],
+                'unique_texts': summary['unique_texts'],
+                'requests': summary['requests'],
+                'dedup_ratio': summary['dedup_ratio']
+            }
+    except Exception as e:
+        result = {'status': 'error', 'error': str(e)}
+    
+    result['elapsed'] = round(time.time() - start, 3)
+    return result
+
+
+def sync_all_translations(api_type='google', api_key=None, dry_run=False, memory_path=DEFAULT_MEMORY_PATH,
+                          use_memory=True, workers=None, concurrency=DEFAULT_CONCURRENCY,
+                          requests_per_sec=None, chars_per_sec=None, incremental=True,
+                          manifest_path=DEFAULT_MANIFEST_PATH, journal=True,
+                          checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, fuzzy=None, allowlist=None,
+                          memory_max_age_days=None, memory_max_entries=None):
+    """
+    同步所有语言的翻译
+    所有语言共用同一个翻译记忆库（memory_path），use_memory=False 时禁用；命中统计在全部语言完成后打印一次
+    memory_max_age_days/memory_max_entries: 关闭记忆库时的淘汰策略（见 TranslationMemory）
+    workers: 并行处理的语言数（默认每个语言一个线程）
+    concurrency: 每个语言内部的并发请求数，同一引擎的限速器由所有语言共享
+    requests_per_sec/chars_per_sec: 覆盖引擎默认限速
+    incremental: 有同步记录的语言只处理自上次同步以来新增、修改、删除的键（见 translation_manifest）
+    journal/checkpoint_interval: 断点续传，见 auto_translate_missing
+    fuzzy: FuzzyReuse 实例，每个语言用自己已有的翻译建立模糊匹配索引，报告在全部语言完成后保存
+    allowlist: IdenticalAllowlist 实例，确认与原文相同的键不再翻译，新记录在全部语言完成后保存
+    """
+    # 只解析一次源文件
+    with stage('load'):
+        source_data, source_flat = load_locale(SOURCE_FILE, with_flat=True)
+    languages = [lang_code for lang_code in TARGET_LANGUAGES if lang_code != 'en']
+    
+    # 增量同步：根据指纹清单计算每个语言的变化
+    fingerprints = compute_fingerprints(source_data)
+    manifest = SyncManifest(manifest_path)
+    changes = {
+        lang_code: manifest.get_changes(lang_code, fingerprints) if incremental else None
+        for lang_code in languages
+    }
+    
+    # 仅检查模式：需要全量检查的语言一次性计算覆盖率矩阵（源数据只展开一次）
+    coverage = {}
+    if dry_run:
+        full_check = [lang_code for lang_code in languages if changes[lang_code] is None]
+        with stage('load'):
+            loaded = {lang_code: load_locale(f"{LOCALES_DIR}/{lang_code}.json", {}, with_flat=True)
+                      for lang_code in full_check}
+        with stage('diff'):
+            coverage = build_coverage_matrix(
+                source_data, {lang_code: data for lang_code, (data, _) in loaded.items()}, source_flat,
+                {lang_code: flat for lang_code, (_, flat) in loaded.items()},
+                {lang_code: allowlist.for_locale(lang_code) for lang_code in loaded} if allowlist else None
+            )['summary']
+    
+    memory = None
+    if use_memory and not dry_run:
+        memory = TranslationMemory(memory_path, max_age_days=memory_max_age_days, max_entries=memory_max_entries)
+    limiter = None
+    controller = None
+    if not dry_run:
+        limiter = create_limiter(api_type, concurrency * len(languages), requests_per_sec, chars_per_sec)
+        controller = AdaptiveController(concurrency * len(languages), limiter)
+    output = _ThreadOutput(sys.stdout)
+    
+    def run(lang_code):
+        output.capture()
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            print(result.stdout)
-            
-            if result.returncode != 0:
-                print(f"错误: {result.stderr}")
-                results[lang_code] = {'status': 'error', 'error': result.stderr}
-                continue
-            
-            # 解析输出，获取缺失数量
-            missing_count = 0
-            untranslated_count = 0
-            for line in result.stdout.split('\n'):
-                if '缺失的键:' in line:
-                    try:
-                        missing_count = int(line.split(':')[1].strip())
-                    except:
-                        pass
-                elif '可能未翻译的键:' in line:
-                    try:
-                        untranslated_count = int(line.split(':')[1].strip())
-                    except:
-                        pass
-            
-            total_missing = missing_count + untranslated_count
-            
-            if total_missing == 0:
-                print(f"✓ {lang_name} 翻译完整")
-                results[lang_code] = {'status': 'complete', 'missing': 0}
-                continue
-            
-            if dry_run:
-                print(f"发现 {total_missing} 个缺失的翻译（仅检查模式）")
-                results[lang_code] = {'status': 'needs_translation', 'missing': total_missing}
-                continue
-            
-            # 执行自动翻译
-            print(f"\n开始自动翻译 {total_missing} 个缺失的键...")
-            cmd = [
-                sys.executable, 'auto_translate.py',
-                '--source', SOURCE_FILE,
-                '--target', target_file,
-                '--lang', lang_code,
-                '--api', api_type
-            ]
-            
-            if api_key:
-                cmd.extend(['--api-key', api_key])
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            print(result.stdout)
-            
-            if result.returncode == 0:
-                results[lang_code] = {'status': 'translated', 'missing': total_missing}
-            else:
-                print(f"错误: {result.stderr}")
-                results[lang_code] = {'status': 'error', 'error': result.stderr}
-        except subprocess.TimeoutExpired:
-            print(f"超时: {lang_name}")
-            results[lang_code] = {'status': 'timeout'}
-        except Exception as e:
-            print(f"异常: {e}")
-            results[lang_code] = {'status': 'error', 'error': str(e)}
+            result = sync_language(lang_code, source_data, api_type, api_key, dry_run, memory, concurrency, limiter,
+                                   changes[lang_code], journal, checkpoint_interval, coverage.get(lang_code),
+                                   controller, fuzzy, source_flat, allowlist)
+        finally:
+            log = output.release()
+        return lang_code, result, log
+    
+    results = {}
+    original_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=workers or len(languages)) as executor:
+            for lang_code, result, log in executor.map(run, languages):
+                lang_name = TARGET_LANGUAGES[lang_code]
+                print(f"\n{'='*60}")
+                print(f"处理语言: {lang_name} ({lang_code})")
+                print(f"{'='*60}")
+                if changes[lang_code] is not None:
+                    print("增量模式（基于上次同步记录）")
+                print(log, end='')
+                if result['status'] == 'complete':
+                    print(f"✓ {lang_name} 翻译完整")
+                elif result['status'] == 'needs_translation':
+                    print(f"发现 {result['missing']} 个缺失的翻译（仅检查模式）")
+                results[lang_code] = result
+    finally:
+        sys.stdout = original_stdout
+        if memory:
+            memory.print_stats()
+            memory.close()
+        if fuzzy and not dry_run:
+            fuzzy.save_report()
+        if allowlist and allowlist.save():
+            print(f"✓ 白名单已更新: {allowlist.path}（新增 {sum(allowlist.recorded.values())} 个确认与原文相同的键）")
+    
+    # 记录本次同步成功的语言
+    if not dry_run:
+        for lang_code, result in results.items():
+            if result['status'] != 'error':
+                manifest.record(lang_code, fingerprints, result.get('failed_paths', []))
+        manifest.save()
     
     # 打印总结
     print(f"\n{'='*60}")
@@ -115,32 +249,70 @@ def sync_all_translations(api_type='google', api_key=None, dry_run=False):
         if status == 'complete':
             print(f"✓ {TARGET_LANGUAGES[lang_code]}: 翻译完整")
         elif status == 'translated':
-            print(f"✓ {TARGET_LANGUAGES[lang_code]}: 已翻译 {result['missing']} 个键")
+            failed_note = f"，{result['failed']} 个失败保留为待翻译" if result.get('failed') else ""
+            print(f"✓ {TARGET_LANGUAGES[lang_code]}: 已翻译 {result['missing']} 个键{failed_note}")
         elif status == 'needs_translation':
             print(f"⚠ {TARGET_LANGUAGES[lang_code]}: 需要翻译 {result['missing']} 个键")
-        elif status == 'timeout':
-            print(f"⏱ {TARGET_LANGUAGES[lang_code]}: 超时")
         else:
             print(f"✗ {TARGET_LANGUAGES[lang_code]}: 错误 - {result.get('error', 'Unknown error')}")
     
+    # 所有语言的去重统计：唯一的 (文本, 目标语言) 单元数与键路径数之比
+    translated = [r for r in results.values() if 'unique_texts' in r]
+    total_keys = sum(r['translated'] + r['failed'] for r in translated)
+    total_units = sum(r['unique_texts'] for r in translated)
+    if total_keys:
+        print(f"去重: {total_keys} 个 (键, 语言) → {total_units} 个唯一 (文本, 语言)"
+              f"（去重率 {1 - total_units / total_keys:.1%}），"
+              f"{sum(r['requests'] for r in translated)} 次请求")
+    controller_summary = format_controller_summary(controller.summary()) if controller else None
+    if controller_summary:
+        print(controller_summary)
+    fuzzy_summary = fuzzy.summary() if fuzzy and not dry_run else {}
+    if fuzzy_summary:
+        print("模糊匹配: " + '，'.join(f"{lang} 建议 {item['suggested']} / 复用 {item['applied']}"
+                                     for lang, item in fuzzy_summary.items()))
+    
     return results
 
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='同步所有语言的翻译')
-    parser.add_argument('--api', choices=['google', 'deepl'], default='google', help='使用的翻译 API')
-    parser.add_argument('--api-key', help='API 密钥（DeepL 需要）')
+    add_engine_arguments(parser)
     parser.add_argument('--dry-run', action='store_true', help='仅检查，不翻译')
+    add_memory_arguments(parser)
+    parser.add_argument('--workers', type=int, help='并行处理的语言数 (默认: 全部语言同时处理)')
+    parser.add_argument('--full', action='store_true', help='忽略同步记录，全量检查所有键')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH, help=f'同步清单路径 (默认: {DEFAULT_MANIFEST_PATH})')
+    add_concurrency_arguments(parser)
+    add_client_arguments(parser)
+    add_journal_arguments(parser)
+    add_retry_arguments(parser)
+    add_fuzzy_arguments(parser)
+    add_allowlist_arguments(parser)
+    add_locale_cache_arguments(parser)
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
-    results = sync_all_translations(args.api, args.api_key, args.dry_run)
+    error = configure_engines_from_args(args)
+    if error and not args.dry_run:
+        print(f"错误: {error}")
+        sys.exit(1)
+    
+    # 所有语言共用同一组长连接客户端
+    configure_clients(args.pool_size, args.timeout)
+    configure_retry_from_args(args)
+    configure_locale_cache_from_args(args)
     
-    # 如果有错误，返回非零退出码
-    has_errors = any(r['status'] == 'error' for r in results.values())
+    with instrumented(args, 'sync_translations'):
+        results = sync_all_translations(args.api, args.api_key, args.dry_run, args.memory, not args.no_memory,
+                                        args.workers, args.concurrency, args.rps, args.cps,
+                                        not args.full, args.manifest, not args.no_journal, args.checkpoint_interval,
+                                        open_fuzzy(args), open_allowlist(args),
+                                        args.memory_max_age_days, args.memory_max_entries)
+    close_clients()
+    
+    # 如果有错误或翻译失败的键，返回非零退出码
+    has_errors = any(r['status'] == 'error' or r.get('failed') for r in results.values())
     sys.exit(1 if has_errors else 0)
-
-
-
-
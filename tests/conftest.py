@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 翻译脚本都在仓库根目录，直接按模块名导入
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
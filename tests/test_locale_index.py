@@ -0,0 +1,94 @@
+import pytest
+
+from locale_index import (
+    delete_value, diff_flat, flatten, get_value, join_path, parse_path, path_to_str, set_value, unflatten
+)
+
+
+SAMPLE = {
+    'travel': {
+        'title': 'Travel',
+        'steps': [{'title': 'Book'}, {'title': 'Approve'}],
+        'empty': {},
+        'tags': [],
+    },
+    'role': {'permissions.selected': 'Selected', 'a[0]': 'Bracket', 'back\\slash': 'Backslash'},
+    'nothing': None,
+}
+
+
+def test_flatten_keeps_source_order_and_empty_containers():
+    flat = flatten(SAMPLE)
+    assert list(flat) == [
+        ('travel', 'title'),
+        ('travel', 'steps', 0, 'title'),
+        ('travel', 'steps', 1, 'title'),
+        ('travel', 'empty'),
+        ('travel', 'tags'),
+        ('role', 'permissions.selected'),
+        ('role', 'a[0]'),
+        ('role', 'back\\slash'),
+        ('nothing',),
+    ]
+    assert flat[('travel', 'empty')] == {}
+    assert flat[('travel', 'tags')] == []
+
+
+def test_flatten_can_keep_lists_as_leaves():
+    flat = flatten(SAMPLE, expand_lists=False)
+    assert flat[('travel', 'steps')] == [{'title': 'Book'}, {'title': 'Approve'}]
+    assert ('travel', 'steps', 0, 'title') not in flat
+    assert unflatten(flat) == SAMPLE
+
+
+def test_unflatten_round_trip():
+    assert unflatten(flatten(SAMPLE)) == SAMPLE
+
+
+@pytest.mark.parametrize('path, expected', [
+    (('travel', 'title'), 'travel.title'),
+    (('travel', 'steps', 0, 'title'), 'travel.steps[0].title'),
+    (('role', 'permissions.selected'), 'role.permissions\\.selected'),
+    (('role', 'a[0]'), 'role.a\\[0\\]'),
+    (('role', 'back\\slash'), 'role.back\\\\slash'),
+    (('list', 0, 1), 'list[0][1]'),
+])
+def test_path_to_str_escapes_and_parse_path_inverts(path, expected):
+    assert path_to_str(path) == expected
+    assert parse_path(expected) == path
+
+
+def test_every_sample_path_round_trips():
+    for path in flatten(SAMPLE):
+        assert parse_path(path_to_str(path)) == path
+
+
+def test_join_path_matches_path_to_str():
+    assert join_path('', 'role') == 'role'
+    assert join_path('role', 'permissions.selected') == path_to_str(('role', 'permissions.selected'))
+    assert join_path('travel.steps', 1) == 'travel.steps[1]'
+
+
+def test_get_set_delete_value():
+    data = {}
+    set_value(data, 'travel.steps[1].title', 'Approve')
+    assert data == {'travel': {'steps': [None, {'title': 'Approve'}]}}
+    assert get_value(data, 'travel.steps[1].title') == 'Approve'
+    assert get_value(data, 'travel.steps[5].title') is None
+    assert get_value(data, 'travel.missing') is None
+    
+    set_value(data, ('role', 'permissions.selected'), 'Selected')
+    assert data['role'] == {'permissions.selected': 'Selected'}
+    delete_value(data, 'role.permissions\\.selected')
+    # 变空的父对象一起删除
+    assert 'role' not in data
+    delete_value(data, 'not.there')
+
+
+def test_diff_flat_reports_missing_and_identical_in_source_order():
+    source = flatten({'a': 'Save', 'b': 'Cancel', 'c': '  ', 'd': None, 'e': {}, 'f': 'OK'})
+    target = flatten({'a': 'Save', 'b': 'Annuler', 'c': '  ', 'f': None})
+    missing, identical = diff_flat(source, target)
+    assert missing == [('f',)]
+    # 空白字符串与源相同不算未翻译；null、空对象不需要翻译
+    assert identical == [('a',)]
@@ -0,0 +1,122 @@
+import copy
+import json
+import shutil
+
+import pytest
+
+from release_locales import apply_patch, diff_locales, plan_update, release_locales
+
+
+def write_locale(locales_dir, lang, data):
+    locales_dir.mkdir(parents=True, exist_ok=True)
+    (locales_dir / f'{lang}.json').write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def sample_locale(**changes):
+    data = {
+        'common': {f'label{i}': f'ラベル {i}' for i in range(30)},
+        'travel': {'title': '出張', 'status': {'draft': '下書き', 'approved': '承認済み'}},
+        'steps': ['申請', '承認'],
+        'a.b': 'ドットを含むキー'
+    }
+    data.update(changes)
+    return data
+
+
+@pytest.mark.parametrize('old, new', [
+    ({'a': '1'}, {'a': '2'}),
+    ({'a': '1', 'b': '2'}, {'a': '1'}),
+    ({'a': {'b': {'c': '1'}}}, {'a': {'d': '2'}}),
+    ({'a': {'b': '1'}}, {'a': '平文'}),
+    ({'a': '平文'}, {'a': {'b': '1'}}),
+    ({'list': ['x', 'y']}, {'list': ['x', 'z', 'w']}),
+    ({'a': {}}, {'a': {'b': '1'}}),
+    ({'a.b': '1', 'a': {'b': '2'}}, {'a.b': '3', 'a': {'b': '2'}}),
+    ({}, sample_locale()),
+    (sample_locale(), {}),
+])
+def test_patch_round_trip(old, new):
+    changes, delete = diff_locales(old, new)
+    patched = apply_patch(copy.deepcopy(old), {'set': changes, 'delete': delete})
+    assert patched == new
+
+
+def test_diff_replaces_lists_as_a_whole():
+    changes, delete = diff_locales({'steps': ['a', 'b']}, {'steps': ['a', 'c']})
+    assert changes == [[['steps'], ['a', 'c']]]
+    assert delete == []
+
+
+def test_diff_of_identical_data_is_empty():
+    assert diff_locales(sample_locale(), sample_locale()) == ([], [])
+
+
+def test_release_bumps_version_and_writes_patches(tmp_path):
+    locales_dir, output_dir, state_dir = tmp_path / 'locales', tmp_path / 'public', tmp_path / 'state'
+    options = {'locales_dir': locales_dir, 'output_dir': output_dir, 'state_dir': state_dir}
+    
+    v1 = sample_locale()
+    write_locale(locales_dir, 'ja', v1)
+    manifest, released = release_locales(**options)
+    assert released == ['ja']
+    first = manifest['languages']['ja']
+    assert first['version'] == 1 and first['patches'] == {}
+    
+    manifest, released = release_locales(**options)
+    assert released == []
+    assert manifest['languages']['ja']['version'] == 1
+    
+    v2 = sample_locale(travel={'title': '出張申請', 'status': {'draft': '下書き'}})
+    write_locale(locales_dir, 'ja', v2)
+    manifest, released = release_locales(**options)
+    entry = manifest['languages']['ja']
+    assert released == ['ja']
+    assert entry['version'] == 2
+    patch_entry = entry['patches']['1']
+    assert patch_entry['from_hash'] == first['hash']
+    assert (patch_entry['set'], patch_entry['delete']) == (1, 1)
+    
+    patch = json.loads((output_dir / patch_entry['file']).read_text(encoding='utf-8'))
+    assert (patch['from'], patch['to']) == (1, 2)
+    assert apply_patch(copy.deepcopy(v1), patch) == v2
+    full = json.loads((output_dir / entry['full']['file']).read_text(encoding='utf-8'))
+    assert full == v2
+    # 旧版本的完整文件已删除
+    assert not (output_dir / first['full']['file']).exists()
+
+
+def test_plan_update_is_hash_based(tmp_path):
+    locales_dir, output_dir, state_dir = tmp_path / 'locales', tmp_path / 'public', tmp_path / 'state'
+    options = {'locales_dir': locales_dir, 'output_dir': output_dir, 'state_dir': state_dir}
+    write_locale(locales_dir, 'ja', sample_locale())
+    first = release_locales(**options)[0]['languages']['ja']
+    write_locale(locales_dir, 'ja', sample_locale(steps=['申請', '承認', '精算']))
+    manifest = release_locales(**options)[0]
+    entry = manifest['languages']['ja']
+    
+    assert plan_update(manifest, 'ja', 2, entry['hash']) == ('current', None)
+    assert plan_update(manifest, 'ja', 1, first['hash']) == ('patch', entry['patches']['1'])
+    # 版本号相同但内容不同（例如版本号被重置）时不能套用补丁
+    assert plan_update(manifest, 'ja', 1, 'other') == ('full', entry['full'])
+    assert plan_update(manifest, 'ja', 2, first['hash']) == ('full', entry['full'])
+    assert plan_update(manifest, 'ja') == ('full', entry['full'])
+
+
+def test_release_dir_is_rebuilt_from_state(tmp_path):
+    locales_dir, output_dir, state_dir = tmp_path / 'locales', tmp_path / 'public', tmp_path / 'state'
+    options = {'locales_dir': locales_dir, 'output_dir': output_dir, 'state_dir': state_dir}
+    write_locale(locales_dir, 'ja', sample_locale())
+    write_locale(locales_dir, 'ko', sample_locale(travel={'title': '출장'}))
+    release_locales(**options)
+    write_locale(locales_dir, 'ja', sample_locale(steps=['申請']))
+    expected = release_locales(**options)[0]
+    
+    # 发布目录不提交，删除后只发布一个语言，其他语言按状态中的快照重建
+    shutil.rmtree(output_dir)
+    manifest, released = release_locales(languages=['ko'], **options)
+    assert released == []
+    assert manifest == expected
+    for entry in manifest['languages'].values():
+        assert (output_dir / entry['full']['file']).exists()
+        for patch in entry['patches'].values():
+            assert (output_dir / patch['file']).exists()
@@ -0,0 +1,72 @@
+import json
+
+from translation_journal import Checkpointer, TranslationJournal, atomic_write_json, journal_path_for
+
+
+def test_replay_recovers_completed_translations(tmp_path):
+    journal = TranslationJournal(tmp_path / 'ja.json.journal', 'ja')
+    journal.append([('a', 'Save', '保存'), ('b', 'Cancel', 'キャンセル')])
+    journal.close()
+    
+    recovered, remaining = TranslationJournal(tmp_path / 'ja.json.journal', 'ja').replay(
+        [('a', 'Save'), ('b', 'Cancel'), ('c', 'Delete')]
+    )
+    assert recovered == {'a': '保存', 'b': 'キャンセル'}
+    assert remaining == [('c', 'Delete')]
+
+
+def test_replay_ignores_changed_source_and_other_languages(tmp_path):
+    path = tmp_path / 'ja.json.journal'
+    TranslationJournal(path, 'ko').append([('a', 'Save', '저장')])
+    journal = TranslationJournal(path, 'ja')
+    journal.append([('b', 'Old text', '古い')])
+    journal.close()
+    
+    recovered, remaining = TranslationJournal(path, 'ja').replay([('a', 'Save'), ('b', 'New text')])
+    assert recovered == {}
+    assert remaining == [('a', 'Save'), ('b', 'New text')]
+
+
+def test_truncated_last_line_is_skipped_and_not_merged_with_new_records(tmp_path):
+    path = tmp_path / 'ja.json.journal'
+    record = json.dumps({'lang': 'ja', 'path': 'a', 'source': 'Save', 'translation': '保存'}, ensure_ascii=False)
+    # 上次中断时最后一行只写了一半
+    path.write_text(record + '\n' + record[:20], encoding='utf-8')
+    
+    journal = TranslationJournal(path, 'ja')
+    assert journal.load() == {'a': ('Save', '保存')}
+    journal.append([('b', 'Cancel', 'キャンセル')])
+    journal.close()
+    assert TranslationJournal(path, 'ja').load() == {'a': ('Save', '保存'), 'b': ('Cancel', 'キャンセル')}
+
+
+def test_discard_removes_journal(tmp_path):
+    path = tmp_path / 'ja.json.journal'
+    journal = TranslationJournal(path, 'ja')
+    journal.append([('a', 'Save', '保存')])
+    journal.discard()
+    assert not path.exists()
+    assert TranslationJournal(path, 'ja').load() == {}
+
+
+def test_atomic_write_json_leaves_no_temp_files(tmp_path):
+    target = tmp_path / 'nested' / 'ja.json'
+    atomic_write_json(target, {'a': '保存'})
+    assert json.loads(target.read_text(encoding='utf-8')) == {'a': '保存'}
+    assert [item.name for item in target.parent.iterdir()] == ['ja.json']
+
+
+def test_checkpointer_writes_only_after_interval(tmp_path):
+    target = tmp_path / 'ja.json'
+    data = {'a': '保存'}
+    checkpointer = Checkpointer(target, data, interval=3600)
+    checkpointer.maybe_write()
+    assert not target.exists()
+    checkpointer.interval = 0
+    checkpointer.maybe_write()
+    assert checkpointer.writes == 1
+    assert json.loads(target.read_text(encoding='utf-8')) == data
+
+
+def test_journal_path_is_next_to_target():
+    assert str(journal_path_for('frontend/src/i18n/locales/ja.json')).endswith('ja.json.journal')
@@ -0,0 +1,147 @@
+import time
+
+import pytest
+import requests
+
+from translation_engines import TranslationEngineError
+from translation_retry import AdaptiveController, classify_error, error_retry_after, error_status
+
+
+def http_error(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(f'{status_code} error', response=response)
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.scales = []
+    
+    def acquire(self, weight=0):
+        pass
+    
+    def set_rate_scale(self, scale):
+        self.scales.append(scale)
+
+
+def failing(errors, result='ok'):
+    """依次抛出 errors 中的异常，之后返回 result"""
+    calls = []
+    
+    def func():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return func, calls
+
+
+def controller(**kwargs):
+    options = {'max_retries': 3, 'base_delay': 0.001, 'max_delay': 0.01}
+    options.update(kwargs)
+    return AdaptiveController(**options)
+
+
+@pytest.mark.parametrize('error, kind', [
+    (TranslationEngineError('limited', 429), 'throttle'),
+    (TranslationEngineError('quota', 456), 'quota'),
+    (TranslationEngineError('unavailable', 503), 'server'),
+    (TranslationEngineError('forbidden', 403), 'fatal'),
+    (http_error(429), 'throttle'),
+    (http_error(502), 'server'),
+    (Exception('Unexpected status code "429" from https://translate.google.com'), 'throttle'),
+    (Exception('Unexpected status code "503" from https://translate.google.com'), 'server'),
+    (TimeoutError('timed out'), 'network'),
+    (requests.ConnectionError('reset'), 'network'),
+    (ValueError('bad response'), 'fatal'),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_error_status_and_retry_after():
+    assert error_status(ValueError('status 429')) is None
+    assert error_retry_after(TranslationEngineError('limited', 429, retry_after=2.5)) == 2.5
+    assert error_retry_after(http_error(429, {'Retry-After': '3'})) == 3.0
+    assert error_retry_after(http_error(429)) is None
+    assert error_retry_after(Exception('Unexpected status code "429"')) is None
+
+
+def test_throttle_halves_limit_and_rate_then_recovers_additively():
+    limiter = FakeLimiter()
+    adaptive = controller(max_concurrency=8, limiter=limiter)
+    func, calls = failing([TranslationEngineError('limited', 429)])
+    
+    assert adaptive.call(func) == 'ok'
+    assert len(calls) == 2
+    assert adaptive.stats['throttled'] == 1
+    assert adaptive.stats['decreases'] == 1
+    assert adaptive.stats['min_limit'] == 4.0
+    assert limiter.scales[0] == 0.5
+    # 重试成功后加性增加 1/limit
+    assert adaptive.limit == pytest.approx(4.25)
+    assert limiter.scales[-1] == pytest.approx(0.52)
+    
+    for _ in range(200):
+        adaptive.call(lambda: 'ok')
+    assert adaptive.limit == 8.0
+    assert adaptive.rate_scale == 1.0
+
+
+def test_limit_never_drops_below_one():
+    adaptive = controller(max_concurrency=2, max_retries=5)
+    func, calls = failing([TranslationEngineError('limited', 429)] * 4)
+    adaptive.call(func)
+    assert adaptive.stats['min_limit'] == 1.0
+
+
+def test_retry_after_pauses_requests():
+    adaptive = controller(max_delay=0.2)
+    func, calls = failing([TranslationEngineError('limited', 429, retry_after=0.1)])
+    started = time.monotonic()
+    adaptive.call(func)
+    assert time.monotonic() - started >= 0.1
+    assert adaptive.resume_at > started
+
+
+def test_retry_after_is_capped_by_max_delay():
+    adaptive = controller(max_delay=0.01)
+    func, calls = failing([TranslationEngineError('limited', 429, retry_after=60)])
+    started = time.monotonic()
+    adaptive.call(func)
+    assert time.monotonic() - started < 1
+
+
+def test_server_errors_retry_until_max_retries():
+    adaptive = controller(max_retries=2)
+    func, calls = failing([TranslationEngineError('unavailable', 503)] * 5)
+    with pytest.raises(TranslationEngineError):
+        adaptive.call(func)
+    assert len(calls) == 3
+    assert adaptive.stats['retries'] == 2
+    # 5xx 不调整并发数
+    assert adaptive.stats['decreases'] == 0
+
+
+def test_fatal_error_is_not_retried():
+    adaptive = controller()
+    func, calls = failing([TranslationEngineError('forbidden', 403)])
+    with pytest.raises(TranslationEngineError):
+        adaptive.call(func)
+    assert len(calls) == 1
+    assert adaptive.aborted is None
+
+
+def test_quota_aborts_later_requests():
+    adaptive = controller()
+    func, calls = failing([TranslationEngineError('quota', 456)])
+    with pytest.raises(TranslationEngineError):
+        adaptive.call(func)
+    assert len(calls) == 1
+    
+    later, later_calls = failing([])
+    with pytest.raises(TranslationEngineError, match='quota'):
+        adaptive.call(later)
+    assert later_calls == []
+    assert adaptive.summary()['aborted'] == 'quota'
@@ -16,44 +16,41 @@ import argparse
 import time
 import sys
 import os
-from pathlib import Path
 
-try:
-    from googletrans import Translator
-    GOOGLETRANS_AVAILABLE = True
-except ImportError:
-    GOOGLETRANS_AVAILABLE = False
+from translation_clients import GOOGLETRANS_AVAILABLE, REQUESTS_AVAILABLE
+
+if not GOOGLETRANS_AVAILABLE:
     print("警告: googletrans 未安装，使用: pip install googletrans==4.0.0rc1")
 
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+if not REQUESTS_AVAILABLE:
     print("警告: requests 未安装，使用: pip install requests")
 
+from locale_index import flatten, get_value, join_path, path_to_str, set_value
+from auto_translate import (
+    DEFAULT_BATCH_SIZE, DEFAULT_BATCH_CHARS, format_dedup_stats, translate_pending, translate_text
+)
+from translation_engines import add_engine_arguments, configure_engines_from_args
+from translation_clients import add_client_arguments, configure_clients
+from translation_memory import add_memory_arguments, open_memory
+from translation_concurrency import DEFAULT_CONCURRENCY, add_concurrency_arguments, create_limiter
+from translation_metrics import add_metrics_arguments, instrumented, stage
+from translation_journal import atomic_write_json
+from translation_retry import AdaptiveController, add_retry_arguments, configure_retry_from_args, format_controller_summary
+
+# 翻译失败的值：不写入原文，目标文件中保持原有值（没有则缺失），下次运行仍会翻译
+_PENDING = object()
+
+MAX_LISTED_PENDING = 20   # 失败摘要中最多列出的键数
+
 
 def get_nested_value(data, path):
     """获取嵌套值"""
-    keys = path.split('.')
-    value = data
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
-            return None
-    return value
+    return get_value(data, path)
 
 
 def set_nested_value(data, path, value):
     """设置嵌套值"""
-    keys = path.split('.')
-    current = data
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        current = current[key]
-    current[keys[-1]] = value
+    set_value(data, path, value)
 
 
 def should_skip_translation(value):
@@ -84,88 +81,72 @@ def should_skip_translation(value):
     return False
 
 
-def translate_with_google(text, target_lang, source_lang='en'):
-    """使用 Google Translate 翻译"""
-    if not GOOGLETRANS_AVAILABLE:
-        raise ImportError("googletrans 未安装")
-    
-    translator = Translator()
-    try:
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        return result.text
-    except Exception as e:
-        print(f"翻译失败: {e}")
-        return text
-
-
-def translate_with_deepl(text, target_lang, api_key, source_lang='EN'):
-    """使用 DeepL API 翻译"""
-    if not REQUESTS_AVAILABLE:
-        raise ImportError("requests 未安装")
-    
-    # DeepL 语言代码映射
-    deepl_lang_map = {
-        'ar': 'AR',
-        'vi': 'VI',
-        'th': 'TH',
-        'en': 'EN',
-        'zh': 'ZH',
-        'ja': 'JA',
-        'ko': 'KO'
-    }
-    
-    target_lang_code = deepl_lang_map.get(target_lang, target_lang.upper())
-    source_lang_code = deepl_lang_map.get(source_lang, source_lang.upper())
-    
-    url = "https://api-free.deepl.com/v2/translate"
-    
-    params = {
-        'auth_key': api_key,
-        'text': text,
-        'source_lang': source_lang_code,
-        'target_lang': target_lang_code,
-        'preserve_formatting': '1'
-    }
-    
-    try:
-        response = requests.post(url, data=params, timeout=10)
-        if response.status_code == 200:
-            return response.json()['translations'][0]['text']
-        else:
-            raise Exception(f"DeepL API 错误: {response.status_code} - {response.text}")
-    except Exception as e:
-        print(f"DeepL 翻译失败: {e}")
-        return text
-
-
-def translate_value(value, path, target_data, target_lang, source_lang, api_type, api_key=None):
-    """递归翻译值"""
+def translate_value(value, path, target_data, target_lang, source_lang, api_type, api_key=None, translations=None,
+                    memory=None, controller=None, pending=None):
+    """
+    递归翻译值
+    translations: 批量模式下预先翻译好的 {路径: 译文}，命中时不再请求 API；失败的路径对应 _PENDING
+    memory: TranslationMemory 实例，请求 API 前先查询翻译记忆库
+    controller: AdaptiveController，限流、5xx、超时时重试（见 translation_retry）
+    pending: 列表，翻译失败的路径追加到其中
+    翻译失败的字符串返回 _PENDING，由上层保留目标文件中的原有值
+    """
     if isinstance(value, dict):
         result = {}
         for key, val in value.items():
-            current_path = f"{path}.{key}" if path else key
-            result[key] = translate_value(val, current_path, target_data, target_lang, source_lang, api_type, api_key)
+            current_path = join_path(path, key)
+            translated = translate_value(val, current_path, target_data, target_lang, source_lang, api_type, api_key,
+                                         translations, memory, controller, pending)
+            if translated is _PENDING:
+                translated = get_nested_value(target_data, current_path)
+                if translated is None:
+                    continue
+            result[key] = translated
         return result
     elif isinstance(value, list):
-        return [translate_value(item, path, target_data, target_lang, source_lang, api_type, api_key) for item in value]
+        result = []
+        for i, item in enumerate(value):
+            translated = translate_value(item, join_path(path, i), target_data, target_lang, source_lang, api_type,
+                                         api_key, translations, memory, controller, pending)
+            if translated is _PENDING:
+                # 列表不能留空位，没有原有值时暂用原文
+                existing = get_nested_value(target_data, join_path(path, i))
+                translated = existing if existing is not None else item
+            result.append(translated)
+        return result
     elif isinstance(value, str):
         # 检查是否应该跳过翻译
         if should_skip_translation(value):
             return value
         
         # 检查是否已经翻译过（如果目标文件存在该键）
-        if path:
-            existing = get_nested_value(target_data, path)
-            if existing and existing != value and existing.strip():
-                print(f"保留现有翻译: {path}")
-                return existing
+        existing = _get_existing_translation(target_data, path, value)
+        if existing is not None:
+            print(f"保留现有翻译: {path}")
+            return existing
+        
+        # 批量模式已翻译
+        if translations is not None and path in translations:
+            if translations[path] is _PENDING and pending is not None:
+                pending.append(path)
+            return translations[path]
+        
+        # 优先使用翻译记忆库
+        cached = memory.get(value, source_lang, target_lang, api_type) if memory else None
+        if cached is not None:
+            print(f"翻译（记忆库）: {path[:50]}... -> {cached[:30]}...")
+            return cached
         
         # 执行翻译
         try:
-            if api_type == 'deepl' and api_key:
-                translated = translate_with_deepl(value, target_lang, api_key, source_lang)
+            if controller is not None:
+                translated = controller.call(lambda: translate_text(value, target_lang, source_lang, api_type, api_key),
+                                             len(value))
             else:
-                translated = translate_with_google(value, target_lang, source_lang)
+                translated = translate_text(value, target_lang, source_lang, api_type, api_key)
+            
+            if memory:
+                memory.put(value, translated, source_lang, target_lang, api_type)
             
             if translated != value:
                 print(f"翻译: {path[:50]}... = {value[:30]}... -> {translated[:30]}...")
@@ -173,63 +154,125 @@ def translate_value(value, path, target_data, target_lang, source_lang, api_type
                 print(f"跳过（未变化）: {path[:50]}...")
             
             # 避免 API 限制
-            time.sleep(0.1)
+            with stage('throttle_sleep'):
+                time.sleep(0.1)
             return translated
         except Exception as e:
-            print(f"翻译失败 {path}: {e}")
-            return value
+            print(f"翻译失败 {path}: {e}（保留为待翻译）")
+            if pending is not None:
+                pending.append(path)
+            return _PENDING
     else:
         return value
 
 
-def translate_json_file(source_file, target_file, target_lang, source_lang='en', api_type='google', api_key=None):
+def _get_existing_translation(target_data, path, value):
+    """返回目标文件中已有的有效翻译，没有则返回 None"""
+    if not path:
+        return None
+    existing = get_nested_value(target_data, path)
+    if isinstance(existing, str) and existing != value and existing.strip():
+        return existing
+    return None
+
+
+def collect_pending_translations(source_data, target_data):
+    """一次遍历收集需要翻译的 (路径, 文本)，路径格式与 translate_value 一致"""
+    pending = []
+    for path, value in flatten(source_data).items():
+        if not isinstance(value, str) or should_skip_translation(value):
+            continue
+        path_str = path_to_str(path)
+        if _get_existing_translation(target_data, path_str, value) is not None:
+            continue
+        pending.append((path_str, value))
+    return pending
+
+
+def translate_json_file(source_file, target_file, target_lang, source_lang='en', api_type='google', api_key=None,
+                        batch=False, batch_size=DEFAULT_BATCH_SIZE, batch_chars=DEFAULT_BATCH_CHARS, memory=None,
+                        concurrency=DEFAULT_CONCURRENCY, limiter=None):
     """
-    翻译 JSON 文件
+    翻译 JSON 文件，全部翻译成功时返回 True；有键翻译失败时仍保存已翻译的部分，返回 False
+    batch=True 或 concurrency > 1 时先收集所有待翻译文本，批量/并发请求后再按原结构回填
+    memory: TranslationMemory 实例，请求 API 前先查询翻译记忆库
     """
     # 检查源文件是否存在
     if not os.path.exists(source_file):
         print(f"错误: 源文件不存在: {source_file}")
         return False
     
-    # 读取源文件
-    try:
-        with open(source_file, 'r', encoding='utf-8') as f:
-            source_data = json.load(f)
-    except Exception as e:
-        print(f"错误: 无法读取源文件: {e}")
-        return False
-    
-    # 读取目标文件（如果存在）
-    target_data = {}
-    if os.path.exists(target_file):
+    with stage('load'):
+        # 读取源文件
         try:
-            with open(target_file, 'r', encoding='utf-8') as f:
-                target_data = json.load(f)
-            print(f"已加载现有目标文件: {target_file}")
+            with open(source_file, 'r', encoding='utf-8') as f:
+                source_data = json.load(f)
         except Exception as e:
-            print(f"警告: 无法读取目标文件，将创建新文件: {e}")
+            print(f"错误: 无法读取源文件: {e}")
+            return False
+        
+        # 读取目标文件（如果存在）
+        target_data = {}
+        if os.path.exists(target_file):
+            try:
+                with open(target_file, 'r', encoding='utf-8') as f:
+                    target_data = json.load(f)
+                print(f"已加载现有目标文件: {target_file}")
+            except Exception as e:
+                print(f"警告: 无法读取目标文件，将创建新文件: {e}")
     
     # 翻译数据
     print(f"开始翻译 {source_file} -> {target_file}")
     print(f"源语言: {source_lang}, 目标语言: {target_lang}, API: {api_type}")
     print("-" * 60)
     
-    translated_data = translate_value(source_data, "", target_data, target_lang, source_lang, api_type, api_key)
+    translations = None
+    controller = AdaptiveController(concurrency, limiter)
+    if batch or concurrency > 1:
+        with stage('diff'):
+            pending = collect_pending_translations(source_data, target_data)
+        with stage('translate'):
+            translations, failed, dedup = translate_pending(
+                pending, target_lang, source_lang, api_type, api_key,
+                batch, batch_size, batch_chars, memory, concurrency, limiter, controller=controller
+            )
+        # 失败的键（已重试）保留为待翻译，不再逐条请求，也不写入原文
+        for path in failed:
+            translations[path] = _PENDING
+        if failed:
+            print(f"失败: {len(failed)} 个键保留为待翻译，下次运行重试")
+        print(format_dedup_stats(dedup))
     
-    # 确保目标目录存在
-    target_path = Path(target_file)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
+    pending_paths = []
+    with stage('translate'):
+        translated_data = translate_value(source_data, "", target_data, target_lang, source_lang, api_type, api_key,
+                                          translations, memory, controller, pending_paths)
+    controller_summary = format_controller_summary(controller.summary())
+    if controller_summary:
+        print(controller_summary)
+    if memory:
+        memory.print_stats()
     
-    # 保存翻译结果
+    # 保存翻译结果（原子替换，写入中途中断不会留下损坏的文件；目标目录不存在时自动创建）
     try:
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, ensure_ascii=False, indent=2)
-        print("-" * 60)
-        print(f"✓ 翻译完成！已保存到 {target_file}")
-        return True
+        with stage('write'):
+            atomic_write_json(target_file, translated_data)
     except Exception as e:
         print(f"错误: 无法保存文件: {e}")
         return False
+    
+    print("-" * 60)
+    print(f"已保存到 {target_file}")
+    # 有翻译失败的键时返回失败（失败的键保留为待翻译，CI 需要能区分）
+    if pending_paths:
+        print(f"✗ 翻译未完成: {len(pending_paths)} 个键失败，保留为待翻译，下次运行重试")
+        for path in pending_paths[:MAX_LISTED_PENDING]:
+            print(f"  - {path}")
+        if len(pending_paths) > MAX_LISTED_PENDING:
+            print(f"  ... 另有 {len(pending_paths) - MAX_LISTED_PENDING} 个")
+        return False
+    print("✓ 翻译完成！")
+    return True
 
 
 def main():
@@ -244,6 +287,15 @@ def main():
   # 使用 DeepL API
   python translate_files.py --source frontend/src/i18n/locales/en.json --target frontend/src/i18n/locales/ar.json --lang ar --api deepl --api-key YOUR_API_KEY
 
+  # 批量模式（每次请求最多 50 条 / 5000 字符）
+  python translate_files.py --source frontend/src/i18n/locales/en.json --target frontend/src/i18n/locales/ar.json --lang ar --batch
+
+  # 并发模式（8 个并发请求，按引擎默认配额限速）
+  python translate_files.py --source frontend/src/i18n/locales/en.json --target frontend/src/i18n/locales/ar.json --lang ar --batch --concurrency 8
+
+  # 离线伪翻译（无需网络，模拟每次请求 200ms 延迟）
+  python translate_files.py --source frontend/src/i18n/locales/en.json --target /tmp/ar.json --lang ar --api pseudo --pseudo-latency 0.2
+
   # 批量翻译多个语言
   for lang in ar vi th; do
     python translate_files.py --source frontend/src/i18n/locales/en.json --target frontend/src/i18n/locales/$lang.json --lang $lang
@@ -255,33 +307,53 @@ def main():
     parser.add_argument('--target', required=True, help='目标文件路径')
     parser.add_argument('--lang', required=True, help='目标语言代码 (ar, vi, th, zh, ja, ko)')
     parser.add_argument('--source-lang', default='en', help='源语言代码 (默认: en)')
-    parser.add_argument('--api', choices=['google', 'deepl'], default='google', help='使用的翻译 API (默认: google)')
-    parser.add_argument('--api-key', help='API 密钥（DeepL 需要）')
+    add_engine_arguments(parser)
+    parser.add_argument('--batch', action='store_true', help='批量模式：多条文本合并为一次请求')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help=f'每批最多条数 (默认: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--batch-chars', type=int, default=DEFAULT_BATCH_CHARS, help=f'每批最多字符数 (默认: {DEFAULT_BATCH_CHARS})')
+    add_memory_arguments(parser)
+    add_concurrency_arguments(parser)
+    add_client_arguments(parser)
+    add_retry_arguments(parser)
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
+    with instrumented(args, 'translate_files'):
+        success = run(args)
+    sys.exit(0 if success else 1)
+
+
+def run(args):
+    """执行 main 解析出的命令，返回是否成功"""
     # 验证 API 可用性
-    if args.api == 'deepl':
-        if not args.api_key:
-            print("错误: DeepL API 需要 --api-key 参数")
-            sys.exit(1)
-        if not REQUESTS_AVAILABLE:
-            print("错误: 需要安装 requests: pip install requests")
-            sys.exit(1)
-    else:
-        if not GOOGLETRANS_AVAILABLE:
-            print("错误: 需要安装 googletrans: pip install googletrans==4.0.0rc1")
-            sys.exit(1)
+    error = configure_engines_from_args(args)
+    if error:
+        print(f"错误: {error}")
+        return False
     
     # 执行翻译
-    success = translate_json_file(
-        args.source,
-        args.target,
-        args.lang,
-        args.source_lang,
-        args.api,
-        args.api_key
-    )
+    configure_clients(args.pool_size, args.timeout)
+    configure_retry_from_args(args)
+    memory = open_memory(args)
+    try:
+        success = translate_json_file(
+            args.source,
+            args.target,
+            args.lang,
+            args.source_lang,
+            args.api,
+            args.api_key,
+            args.batch,
+            args.batch_size,
+            args.batch_chars,
+            memory,
+            args.concurrency,
+            create_limiter(args.api, args.concurrency, args.rps, args.cps)
+        )
+    finally:
+        if memory:
+            memory.close()
     
     if success:
         # 验证 JSON 格式
@@ -293,7 +365,7 @@ def main():
             print(f"警告: JSON 格式可能有问题: {e}")
             print("请手动检查文件")
     
-    sys.exit(0 if success else 1)
+    return success
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+确认与原文相同的译文（白名单）
+品牌名、代码、"OK"、"Email"、只有占位符的文本等在目标语言中本来就与原文相同，
+检查时会被当作"未翻译"，每次同步都重新发送给 API，返回的仍是原文。
+本模块按语言记录这些键，检查脚本据此排除，稳定状态下的同步不再产生多余的请求。
+
+记录方式:
+    - 自动: 翻译引擎返回的译文与原文相同的键
+            （按规则跳过翻译的键不记录：should_skip_translation 会误判，如 "ADD" 中的 DD、"COMMENT" 中的 MM）
+    - 手工: 直接编辑白名单文件
+
+文件格式（frontend/src/i18n/verified_identical.json）:
+    {"version": 1, "locales": {
+        "*":  {"common.brand": true},          # 所有语言都适用
+        "ja": {"common.ok": "OK"}              # 记录时的原文
+    }}
+值为原文时只在 en.json 中该键仍是这段原文时生效（原文修改后需要重新确认），值为 true 时始终生效。
+
+使用方法:
+    python translation_allowlist.py --lang ja
+    python translation_allowlist.py --lang ja --add common.ok --add common.email
+"""
+
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+
+from translation_journal import atomic_write_json
+
+DEFAULT_ALLOWLIST_PATH = "frontend/src/i18n/verified_identical.json"
+ALLOWLIST_VERSION = 1
+ALL_LOCALES = '*'
+
+
+def is_verified(verified, key, source_value):
+    """verified（for_locale 的结果）中是否确认该键可以与原文相同"""
+    if not verified:
+        return False
+    entry = verified.get(key)
+    return entry is True or (entry is not None and entry == source_value)
+
+
+class IdenticalAllowlist:
+    """按语言记录 {键: 原文 | true}（线程安全，多个语言同步时共用）"""
+    
+    def __init__(self, path=DEFAULT_ALLOWLIST_PATH):
+        self.path = str(path)
+        self.locales = {}
+        self.recorded = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if Path(self.path).exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == ALLOWLIST_VERSION:
+                self.locales = data.get('locales', {})
+    
+    def for_locale(self, lang):
+        """该语言生效的条目 {键: 原文 | true}（包括所有语言通用的条目）"""
+        with self._lock:
+            verified = dict(self.locales.get(ALL_LOCALES, {}))
+            verified.update(self.locales.get(lang, {}))
+        return verified
+    
+    def record(self, lang, entries):
+        """
+        记录确认与原文相同的键 [(键, 原文)]，返回新增或更新的条目数
+        手工标记为 true 的条目保持不变
+        """
+        changed = 0
+        with self._lock:
+            locale = self.locales.setdefault(lang, {})
+            for key, source_value in entries:
+                if locale.get(key) is True or locale.get(key) == source_value:
+                    continue
+                locale[key] = source_value
+                changed += 1
+            if changed:
+                self._dirty = True
+                self.recorded[lang] = self.recorded.get(lang, 0) + changed
+        return changed
+    
+    def mark(self, lang, keys):
+        """手工标记：这些键始终可以与原文相同"""
+        with self._lock:
+            self.locales.setdefault(lang, {}).update((key, True) for key in keys)
+            self._dirty = True
+    
+    def remove(self, lang, keys):
+        """删除这些键的记录（下次检查时重新视为未翻译）"""
+        with self._lock:
+            locale = self.locales.get(lang, {})
+            for key in keys:
+                locale.pop(key, None)
+            self._dirty = True
+    
+    def save(self):
+        """有新记录时原子写入文件（键排序，方便审阅和手工编辑）"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {'version': ALLOWLIST_VERSION,
+                    'locales': {lang: dict(sorted(entries.items())) for lang, entries in sorted(self.locales.items())}}
+            self._dirty = False
+        atomic_write_json(self.path, data)
+        return True
+
+
+def open_allowlist(args):
+    """根据命令行参数打开白名单（--no-allowlist 时返回 None）"""
+    if getattr(args, 'no_allowlist', False):
+        return None
+    return IdenticalAllowlist(getattr(args, 'allowlist', DEFAULT_ALLOWLIST_PATH) or DEFAULT_ALLOWLIST_PATH)
+
+
+def add_allowlist_arguments(parser):
+    """为检查和翻译脚本添加白名单参数"""
+    parser.add_argument('--allowlist', default=DEFAULT_ALLOWLIST_PATH,
+                        help=f'确认与原文相同的译文白名单 (默认: {DEFAULT_ALLOWLIST_PATH})')
+    parser.add_argument('--no-allowlist', action='store_true', help='不使用白名单，与原文相同的值都视为未翻译')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='查看或编辑确认与原文相同的译文白名单')
+    parser.add_argument('--lang', required=True, help=f'语言代码（{ALL_LOCALES} 表示所有语言）')
+    parser.add_argument('--add', action='append', default=[], help='把该键标记为始终可以与原文相同（可重复）')
+    parser.add_argument('--remove', action='append', default=[], help='删除该键的记录（可重复）')
+    parser.add_argument('--allowlist', default=DEFAULT_ALLOWLIST_PATH, help=f'白名单路径 (默认: {DEFAULT_ALLOWLIST_PATH})')
+    
+    args = parser.parse_args()
+    
+    allowlist = IdenticalAllowlist(args.allowlist)
+    if args.add or args.remove:
+        allowlist.mark(args.lang, args.add)
+        allowlist.remove(args.lang, args.remove)
+        allowlist.save()
+        print(f"✓ 已保存到: {args.allowlist}")
+    
+    entries = allowlist.locales.get(args.lang, {})
+    print(f"{args.lang}: {len(entries)} 个确认与原文相同的键")
+    for key, value in entries.items():
+        print(f"  - {key}: {'(始终)' if value is True else value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+翻译引擎的长连接客户端
+所有键、所有语言共用同一组客户端（keep-alive 连接池），
+避免每次请求都重新建立 TCP + TLS 连接。
+"""
+
+import threading
+
+try:
+    from googletrans import Translator
+    GOOGLETRANS_AVAILABLE = True
+except ImportError:
+    GOOGLETRANS_AVAILABLE = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+DEFAULT_POOL_SIZE = 10   # 每个主机保持的连接数
+DEFAULT_TIMEOUT = 15     # 单次请求超时（秒）
+
+_config = {
+    'pool_size': DEFAULT_POOL_SIZE,
+    'timeout': DEFAULT_TIMEOUT,
+    'generation': 0   # 配置变化时递增，各线程据此丢弃旧的客户端
+}
+_lock = threading.Lock()
+_local = threading.local()
+_deepl_session = None
+
+
+def configure_clients(pool_size=None, timeout=None):
+    """修改连接池大小和超时；已创建的客户端会被丢弃，下次使用时按新配置创建"""
+    global _deepl_session
+    with _lock:
+        if pool_size is not None:
+            _config['pool_size'] = pool_size
+        if timeout is not None:
+            _config['timeout'] = timeout
+        if _deepl_session is not None:
+            _deepl_session.close()
+            _deepl_session = None
+        _config['generation'] += 1
+
+
+def get_timeout():
+    """当前的请求超时（秒）"""
+    return _config['timeout']
+
+
+def get_google_translator():
+    """
+    获取 googletrans 客户端
+    Translator 内部的 HTTP 客户端不保证线程安全，因此每个线程复用一个实例
+    raise_exception=True: 非 200 响应时抛出异常（默认会把原文当作译文返回），由 translation_retry 按状态码重试
+    """
+    if not GOOGLETRANS_AVAILABLE:
+        raise ImportError("googletrans 未安装，使用: pip install googletrans==4.0.0rc1")
+    
+    if getattr(_local, 'generation', None) != _config['generation']:
+        _local.google_translator = Translator(timeout=_config['timeout'], raise_exception=True)
+        _local.generation = _config['generation']
+    return _local.google_translator
+
+
+def get_deepl_session():
+    """获取 DeepL 使用的 requests.Session（所有线程共享一个连接池）"""
+    global _deepl_session
+    if not REQUESTS_AVAILABLE:
+        raise ImportError("requests 未安装，使用: pip install requests")
+    
+    with _lock:
+        if _deepl_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=_config['pool_size'], pool_maxsize=_config['pool_size'])
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _deepl_session = session
+        return _deepl_session
+
+
+def close_clients():
+    """关闭所有客户端（脚本结束时调用）"""
+    configure_clients()
+
+
+def add_client_arguments(parser):
+    """为翻译脚本添加连接池参数"""
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f'每个翻译服务保持的连接数 (默认: {DEFAULT_POOL_SIZE})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'单次请求超时秒数 (默认: {DEFAULT_TIMEOUT})')
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+并发翻译与令牌桶限速
+并发模式下用令牌桶（每秒请求数 + 每秒字符数）代替固定的 time.sleep(0.1)，
+在不超过服务商配额的前提下尽量占满配额；结果始终按输入顺序返回。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from translation_metrics import stage
+
+# 默认并发数（1 表示顺序执行，保持原有行为）
+DEFAULT_CONCURRENCY = 1
+
+# 各翻译引擎的默认限速
+ENGINE_RATE_LIMITS = {
+    'google': {'requests_per_sec': 5, 'chars_per_sec': 10000},
+    'deepl': {'requests_per_sec': 10, 'chars_per_sec': 100000},
+    'pseudo': {'requests_per_sec': 1000, 'chars_per_sec': 10000000},
+}
+
+
+class TokenBucket:
+    """令牌桶：以 rate 个/秒的速度补充令牌，最多积累 capacity 个"""
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, amount=1):
+        """取出 amount 个令牌，不足时阻塞等待；超过桶容量的请求按容量计算"""
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class EngineRateLimiter:
+    """单个翻译引擎的限速器：同时受每秒请求数和每秒字符数约束"""
+    
+    def __init__(self, requests_per_sec, chars_per_sec):
+        self.requests = TokenBucket(requests_per_sec)
+        self.chars = TokenBucket(chars_per_sec)
+        self.base_rates = (self.requests.rate, self.chars.rate)
+    
+    @classmethod
+    def for_engine(cls, engine, requests_per_sec=None, chars_per_sec=None):
+        """按引擎默认配置创建，可单独覆盖某一项"""
+        limits = ENGINE_RATE_LIMITS.get(engine, ENGINE_RATE_LIMITS['google'])
+        return cls(
+            requests_per_sec or limits['requests_per_sec'],
+            chars_per_sec or limits['chars_per_sec']
+        )
+    
+    def set_rate_scale(self, scale):
+        """按配置速率的比例调整补充速度（自适应限速使用，见 translation_retry）"""
+        with self.requests._lock, self.chars._lock:
+            self.requests.rate = self.base_rates[0] * scale
+            self.chars.rate = self.base_rates[1] * scale
+    
+    def acquire(self, chars):
+        """一次请求前调用：占用 1 个请求令牌和 chars 个字符令牌"""
+        self.requests.acquire(1)
+        if chars:
+            self.chars.acquire(chars)
+
+
+def iter_concurrently(func, units, concurrency=DEFAULT_CONCURRENCY, limiter=None, weight=None, controller=None):
+    """
+    以 concurrency 个线程执行 func(unit)，按 units 的顺序逐个产出 (unit, 结果, 异常)
+    limiter 非空时每次调用前按 weight(unit) 个字符限速
+    controller 非空时由它负责限速、自适应并发和重试（见 translation_retry.AdaptiveController），不再使用 limiter
+    """
+    def call(unit):
+        if controller is not None:
+            try:
+                return unit, controller.call(lambda: func(unit), weight(unit) if weight else 0), None
+            except Exception as e:
+                return unit, None, e
+        if limiter is not None:
+            with stage('rate_limit_wait'):
+                limiter.acquire(weight(unit) if weight else 0)
+        try:
+            return unit, func(unit), None
+        except Exception as e:
+            return unit, None, e
+    
+    if concurrency <= 1:
+        for unit in units:
+            yield call(unit)
+        return
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # executor.map 按提交顺序返回结果，保证回填顺序确定
+        for item in executor.map(call, units):
+            yield item
+
+
+def create_limiter(engine, concurrency, requests_per_sec=None, chars_per_sec=None):
+    """并发模式（concurrency > 1）或显式指定限速时返回限速器，否则返回 None"""
+    if concurrency <= 1 and requests_per_sec is None and chars_per_sec is None:
+        return None
+    return EngineRateLimiter.for_engine(engine, requests_per_sec, chars_per_sec)
+
+
+def add_concurrency_arguments(parser):
+    """为翻译脚本添加并发与限速参数"""
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'并发请求数 (默认: {DEFAULT_CONCURRENCY}，即顺序执行)')
+    parser.add_argument('--rps', type=float, help='每秒最多请求数（默认按引擎配置）')
+    parser.add_argument('--cps', type=float, help='每秒最多发送字符数（默认按引擎配置）')
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+翻译引擎注册表
+所有引擎实现同一个支持批量的接口 translate_batch(texts, target_lang, source_lang)，
+脚本通过 --api 名称选择引擎，不再在各处写 if api_type == 'deepl' 分支。
+
+内置引擎:
+    google  googletrans（免费，无需 API Key）
+    deepl   DeepL API（需要 API Key，可用 --deepl-url 指向本地模拟服务 deepl_stub_server.py）
+    pseudo  离线伪翻译（确定性输出，可配置延迟和错误率，用于压测和离线调试）
+"""
+
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from translation_clients import (
+    GOOGLETRANS_AVAILABLE, REQUESTS_AVAILABLE, get_deepl_session, get_google_translator, get_timeout
+)
+
+# DeepL 语言代码映射
+DEEPL_LANG_MAP = {
+    'ar': 'AR',
+    'vi': 'VI',
+    'th': 'TH',
+    'en': 'EN',
+    'zh': 'ZH',
+    'ja': 'JA',
+    'ko': 'KO'
+}
+DEEPL_FREE_URL = "https://api-free.deepl.com/v2/translate"
+
+ENGINES = {}
+
+
+class TranslationEngineError(Exception):
+    """
+    翻译引擎请求失败，status_code 为 HTTP 状态码（非 HTTP 错误时为 None），
+    retry_after 为服务商要求的等待秒数（Retry-After 响应头，没有时为 None）
+    """
+    
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """解析 Retry-After 响应头（秒数或 HTTP 日期），无法解析时返回 None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TranslationEngine:
+    """翻译引擎接口"""
+    
+    name = None
+    max_batch_size = 50   # 单次请求最多文本数
+    
+    def translate_batch(self, texts, target_lang, source_lang='en'):
+        """翻译一组文本，返回顺序一致的译文列表；失败时抛出异常"""
+        raise NotImplementedError
+    
+    def translate(self, text, target_lang, source_lang='en'):
+        """翻译单条文本"""
+        return self.translate_batch([text], target_lang, source_lang)[0]
+    
+    @classmethod
+    def requirement_error(cls, api_key=None):
+        """检查依赖和参数，缺少时返回错误信息，否则返回 None"""
+        return None
+
+
+def register_engine(cls):
+    """注册翻译引擎（类装饰器）"""
+    ENGINES[cls.name] = cls
+    return cls
+
+
+def engine_names():
+    """所有已注册的引擎名称"""
+    return list(ENGINES)
+
+
+_engine_options = {}
+_engine_instances = {}
+_lock = threading.Lock()
+
+
+def configure_engine(name, **options):
+    """设置引擎的构造参数（如 DeepL 的 url、伪翻译的延迟），已创建的实例会被丢弃"""
+    with _lock:
+        _engine_options.setdefault(name, {}).update(options)
+        for key in [key for key in _engine_instances if key[0] == name]:
+            del _engine_instances[key]
+
+
+def get_engine(name, api_key=None):
+    """获取引擎实例（同名同密钥共用一个实例）"""
+    if name not in ENGINES:
+        raise ValueError(f"未知的翻译引擎: {name}（可用: {', '.join(engine_names())}）")
+    with _lock:
+        key = (name, api_key)
+        if key not in _engine_instances:
+            options = dict(_engine_options.get(name, {}))
+            if api_key is not None:
+                options['api_key'] = api_key
+            _engine_instances[key] = ENGINES[name](**options)
+        return _engine_instances[key]
+
+
+@register_engine
+class GoogleEngine(TranslationEngine):
+    """googletrans（传入列表即为批量请求）"""
+    
+    name = 'google'
+    
+    def __init__(self, api_key=None):
+        pass
+    
+    def translate_batch(self, texts, target_lang, source_lang='en'):
+        translator = get_google_translator()
+        results = translator.translate(list(texts), src=source_lang, dest=target_lang)
+        return [result.text for result in results]
+    
+    @classmethod
+    def requirement_error(cls, api_key=None):
+        if not GOOGLETRANS_AVAILABLE:
+            return "需要安装 googletrans: pip install googletrans==4.0.0rc1"
+        return None
+
+
+@register_engine
+class DeepLEngine(TranslationEngine):
+    """DeepL API（同一请求中重复 text 参数即为批量请求）"""
+    
+    name = 'deepl'
+    
+    def __init__(self, api_key=None, url=DEEPL_FREE_URL):
+        self.api_key = api_key
+        self.url = url or DEEPL_FREE_URL
+    
+    def translate_batch(self, texts, target_lang, source_lang='en'):
+        params = [
+            ('auth_key', self.api_key),
+            ('source_lang', DEEPL_LANG_MAP.get(source_lang, source_lang.upper())),
+            ('target_lang', DEEPL_LANG_MAP.get(target_lang, target_lang.upper())),
+            ('preserve_formatting', '1')
+        ]
+        params.extend(('text', text) for text in texts)
+        
+        response = get_deepl_session().post(self.url, data=params, timeout=get_timeout())
+        if response.status_code != 200:
+            raise TranslationEngineError(f"DeepL API 错误: {response.status_code} - {response.text}",
+                                         response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+        translations = response.json()['translations']
+        if len(translations) != len(texts):
+            raise TranslationEngineError(f"DeepL 返回数量不匹配: {len(translations)} != {len(texts)}")
+        return [item['text'] for item in translations]
+    
+    @classmethod
+    def requirement_error(cls, api_key=None):
+        if not api_key:
+            return "DeepL API 需要 --api-key 参数"
+        if not REQUESTS_AVAILABLE:
+            return "需要安装 requests: pip install requests"
+        return None
+
+
+# 伪翻译：字母替换为带重音的形式，占位符保持不变
+_PSEUDO_MAP = str.maketrans(
+    'AaCcEeIiNnOoUuYy',
+    'ÅåÇçÉéÎîÑñÖöÛûÝý'
+)
+_PLACEHOLDER_PATTERN = re.compile(r'(\{\{[^{}]*\}\}|\{[^{}]*\}|<[^<>]*>)')
+
+
+def pseudo_translate(text, target_lang):
+    """确定性的伪翻译，如 'Save {name}' -> '[ar] Såvé {name}'，占位符和标签原样保留"""
+    parts = _PLACEHOLDER_PATTERN.split(text)
+    translated = ''.join(part if i % 2 else part.translate(_PSEUDO_MAP) for i, part in enumerate(parts))
+    return f"[{target_lang}] {translated}"
+
+
+@register_engine
+class PseudoEngine(TranslationEngine):
+    """
+    离线伪翻译引擎
+    latency: 每次请求的模拟延迟（秒），per_char_latency: 每个字符额外的延迟
+    error_rate: 请求失败的概率（抛出 429/503 错误），seed 固定时失败序列可复现
+    rate_limit: 模拟服务商的每秒请求数限额，超过时抛出带 Retry-After 的 429 错误
+    """
+    
+    name = 'pseudo'
+    
+    def __init__(self, api_key=None, latency=0.0, per_char_latency=0.0, error_rate=0.0, seed=None, rate_limit=None):
+        self.latency = latency
+        self.per_char_latency = per_char_latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = []   # 最近一秒内的请求时间
+        self.requests = 0
+    
+    def translate_batch(self, texts, target_lang, source_lang='en'):
+        with self._lock:
+            self.requests += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self._recent = [t for t in self._recent if now - t < 1.0]
+                if len(self._recent) >= self.rate_limit:
+                    retry_after = round(1.0 - (now - self._recent[0]), 3)
+                    raise TranslationEngineError("伪翻译模拟限流: 429", 429, retry_after)
+                self._recent.append(now)
+            failed = self.error_rate and self._random.random() < self.error_rate
+            status_code = self._random.choice((429, 503)) if failed else None
+        delay = self.latency + self.per_char_latency * sum(len(text) for text in texts)
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise TranslationEngineError(f"伪翻译模拟错误: {status_code}", status_code)
+        return [pseudo_translate(text, target_lang) for text in texts]
+
+
+def add_engine_arguments(parser):
+    """为翻译脚本添加引擎选择参数"""
+    parser.add_argument('--api', choices=engine_names(), default='google', help='使用的翻译 API')
+    parser.add_argument('--api-key', help='API 密钥（DeepL 需要）')
+    parser.add_argument('--deepl-url', help=f'DeepL 接口地址 (默认: {DEEPL_FREE_URL})')
+    parser.add_argument('--pseudo-latency', type=float, default=0.0, help='伪翻译引擎每次请求的模拟延迟（秒）')
+    parser.add_argument('--pseudo-error-rate', type=float, default=0.0, help='伪翻译引擎的模拟失败率 (0-1)')
+    parser.add_argument('--pseudo-rate-limit', type=float, help='伪翻译引擎模拟的每秒请求数限额，超过时返回 429')
+
+
+def configure_engines_from_args(args):
+    """根据命令行参数配置引擎，返回错误信息（没有错误时返回 None）"""
+    if args.deepl_url:
+        configure_engine('deepl', url=args.deepl_url)
+    configure_engine('pseudo', latency=args.pseudo_latency, error_rate=args.pseudo_error_rate,
+                     rate_limit=getattr(args, 'pseudo_rate_limit', None))
+    return ENGINES[args.api].requirement_error(args.api_key)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+模糊翻译记忆（相似文本复用）
+用 en.json 与目标语言文件中已对齐的 (原文, 译文) 建立字符 n-gram 的 MinHash 索引（LSH 分桶），
+请求 API 之前为每个待翻译文本查找相似度不低于阈值的已有翻译:
+    "Delete {name}?"  ≈  "Delete {name}"   （0.92）
+默认只把匹配结果写入报告供人工确认；--fuzzy-apply 时直接复用达到阈值的译文，不再发送请求。
+占位符不一致的匹配不会被复用（译文中的占位符会对不上）。
+
+相似度为规范化后（小写、合并空白）字符 3-gram 集合与单词集合两个 Jaccard 系数的平均值
+（只看字符时 "Activated" 与 "Deactivated" 这类只差一个前缀的文本分数过高）。
+MinHash 只用于快速找出候选，最终分数按实际集合计算。
+
+使用方法:
+    python auto_translate.py --source en.json --target ar.json --lang ar --fuzzy-threshold 0.85 \\
+        --fuzzy-report fuzzy.json [--fuzzy-apply]
+    python translation_fuzzy.py --source en.json --target ar.json --text "Delete {name}?"
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+
+from locale_index import flatten, path_to_str
+from locale_placeholders import parse_message, placeholder_names
+from translation_journal import atomic_write_json
+
+DEFAULT_FUZZY_THRESHOLD = 0.85
+NGRAM_SIZE = 3
+NUM_PERM = 32     # MinHash 签名长度
+BANDS = 8         # LSH 分桶数（每桶 NUM_PERM // BANDS 行），候选的大致相似度下限为 (1/BANDS) ** (BANDS/NUM_PERM)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_WORD_PATTERN = re.compile(r'\w+')
+_PERMUTATIONS = [(random.Random(i).randrange(1, _MERSENNE_PRIME), random.Random(-i - 1).randrange(0, _MERSENNE_PRIME))
+                 for i in range(NUM_PERM)]
+
+
+def shingles(text, size=NGRAM_SIZE):
+    """规范化后的字符 n-gram 集合（短文本整体作为一个 n-gram）"""
+    text = _WHITESPACE_PATTERN.sub(' ', text.lower()).strip()
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def words(text):
+    """小写后的单词集合（忽略标点）"""
+    return set(_WORD_PATTERN.findall(text.lower()))
+
+
+def jaccard(a, b):
+    """两个集合的 Jaccard 系数"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(grams):
+    """MinHash 签名（同一进程内 hash() 稳定，索引只在内存中使用）"""
+    hashes = [hash(gram) & _MAX_HASH for gram in grams]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+class FuzzyIndex:
+    """已对齐的 (原文, 译文) 的 MinHash LSH 索引"""
+    
+    def __init__(self, pairs=()):
+        self.rows = NUM_PERM // BANDS
+        self.buckets = [{} for _ in range(BANDS)]
+        self.entries = []   # [(原文, 译文, n-gram 集合, 单词集合)]
+        self._exact = {}    # {原文: 译文}
+        for source, translation in pairs:
+            self.add(source, translation)
+    
+    def _bands(self, signature):
+        for band in range(BANDS):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+    
+    def add(self, source, translation):
+        if source in self._exact:
+            return
+        self._exact[source] = translation
+        grams = shingles(source)
+        index = len(self.entries)
+        self.entries.append((source, translation, grams, words(source)))
+        for band, key in self._bands(minhash(grams)):
+            self.buckets[band].setdefault(key, []).append(index)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def best_match(self, text, threshold=DEFAULT_FUZZY_THRESHOLD):
+        """
+        返回相似度最高且不低于阈值的 {'source', 'translation', 'score'}，没有时返回 None
+        完全相同的原文（同一文本已在其他键下翻译过）直接返回，相似度为 1.0
+        """
+        if text in self._exact:
+            return {'source': text, 'translation': self._exact[text], 'score': 1.0}
+        grams = shingles(text)
+        text_words = words(text)
+        candidates = set()
+        for band, key in self._bands(minhash(grams)):
+            candidates.update(self.buckets[band].get(key, ()))
+        best = None
+        for index in candidates:
+            source, translation, source_grams, source_words = self.entries[index]
+            score = (jaccard(grams, source_grams) + jaccard(text_words, source_words)) / 2
+            if score >= threshold and (best is None or score > best['score']):
+                best = {'source': source, 'translation': translation, 'score': round(score, 4)}
+        return best
+
+
+def aligned_pairs(source_data, target_data, exclude=()):
+    """
+    en.json 与目标语言中已翻译的 (原文, 译文)（两边都是非空字符串且不相同）
+    exclude: 不参与索引的键（如增量同步中原文已修改、译文已过期的键）
+    """
+    exclude = set(exclude)
+    target_flat = flatten(target_data)
+    pairs = []
+    for path, source in flatten(source_data).items():
+        if path_to_str(path) in exclude:
+            continue
+        translation = target_flat.get(path)
+        if (isinstance(source, str) and isinstance(translation, str) and source.strip() and translation.strip()
+                and translation != source):
+            pairs.append((source, translation))
+    return pairs
+
+
+def same_placeholders(a, b):
+    """两个文本的占位符集合是否一致"""
+    return placeholder_names(parse_message(a)).keys() == placeholder_names(parse_message(b)).keys()
+
+
+class FuzzyReuse:
+    """
+    模糊匹配配置与报告（多个语言共用）
+    threshold: 相似度阈值；apply: 是否直接复用匹配到的译文
+    """
+    
+    def __init__(self, threshold=DEFAULT_FUZZY_THRESHOLD, apply=False, report_path=None):
+        self.threshold = threshold
+        self.apply = apply
+        self.report_path = report_path
+        self.report = {}
+        self._lock = threading.Lock()
+    
+    def for_locale(self, source_data, target_data, target_lang, exclude=()):
+        """为一个目标语言建立索引（exclude 见 aligned_pairs）"""
+        return LocaleFuzzyMatcher(self, FuzzyIndex(aligned_pairs(source_data, target_data, exclude)), target_lang)
+    
+    def record(self, target_lang, entries):
+        with self._lock:
+            self.report.setdefault(target_lang, []).extend(entries)
+    
+    def summary(self):
+        """{语言: {'suggested', 'applied'}}"""
+        with self._lock:
+            return {lang: {'suggested': len(entries), 'applied': sum(1 for e in entries if e['applied'])}
+                    for lang, entries in self.report.items()}
+    
+    def save_report(self):
+        """写入报告（按相似度从高到低排序）"""
+        if not self.report_path:
+            return
+        with self._lock:
+            report = {
+                'threshold': self.threshold,
+                'applied': self.apply,
+                'languages': {lang: sorted(entries, key=lambda e: -e['score']) for lang, entries in self.report.items()}
+            }
+        atomic_write_json(self.report_path, report)
+        print(f"✓ 模糊匹配报告已保存到: {self.report_path}")
+
+
+class LocaleFuzzyMatcher:
+    """单个目标语言的模糊匹配"""
+    
+    def __init__(self, reuse, index, target_lang):
+        self.reuse = reuse
+        self.index = index
+        self.target_lang = target_lang
+    
+    @property
+    def threshold(self):
+        return self.reuse.threshold
+    
+    @property
+    def apply(self):
+        return self.reuse.apply
+    
+    def suggest(self, texts):
+        """
+        为待翻译文本查找相似的已有翻译，记录到报告
+        返回可以直接复用的 {文本: 译文}（未开启 apply 时为空）
+        """
+        reusable = {}
+        entries = []
+        for text in texts:
+            match = self.index.best_match(text, self.threshold)
+            if match is None:
+                continue
+            compatible = same_placeholders(text, match['source']) and same_placeholders(text, match['translation'])
+            applied = self.apply and compatible
+            entries.append({'text': text, 'match': match['source'], 'translation': match['translation'],
+                            'score': match['score'], 'placeholders_match': compatible, 'applied': applied})
+            if applied:
+                reusable[text] = match['translation']
+        if entries:
+            self.reuse.record(self.target_lang, entries)
+            print(f"模糊匹配: {len(entries)} 个文本找到相似度 ≥ {self.threshold:.0%} 的已有翻译"
+                  + (f"，复用 {len(reusable)} 个" if self.apply else "（仅建议，未复用）"))
+        return reusable
+
+
+def open_fuzzy(args):
+    """根据命令行参数创建 FuzzyReuse（未指定 --fuzzy-threshold 时返回 None）"""
+    if getattr(args, 'fuzzy_threshold', None) is None:
+        return None
+    return FuzzyReuse(args.fuzzy_threshold, args.fuzzy_apply, args.fuzzy_report)
+
+
+def add_fuzzy_arguments(parser):
+    """为翻译脚本添加模糊匹配参数"""
+    parser.add_argument('--fuzzy-threshold', type=float,
+                        help=f'请求 API 前查找相似度不低于该值的已有翻译（0-1，建议 {DEFAULT_FUZZY_THRESHOLD}）')
+    parser.add_argument('--fuzzy-apply', action='store_true', help='直接复用模糊匹配到的译文，不再请求 API')
+    parser.add_argument('--fuzzy-report', help='把模糊匹配结果（相似度、匹配的原文和译文）写入该 JSON 文件')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='在已有翻译中查找相似文本')
+    parser.add_argument('--source', required=True, help='源文件路径')
+    parser.add_argument('--target', required=True, help='目标文件路径')
+    parser.add_argument('--text', action='append', required=True, help='要查找的文本（可重复）')
+    parser.add_argument('--threshold', type=float, default=0.5, help='相似度阈值 (默认: 0.5)')
+    
+    args = parser.parse_args()
+    
+    with open(args.source, 'r', encoding='utf-8') as f:
+        source_data = json.load(f)
+    with open(args.target, 'r', encoding='utf-8') as f:
+        target_data = json.load(f)
+    index = FuzzyIndex(aligned_pairs(source_data, target_data))
+    print(f"索引: {len(index)} 个已翻译文本")
+    for text in args.text:
+        match = index.best_match(text, args.threshold)
+        if match:
+            print(f"{text!r} ≈ {match['source']!r} ({match['score']:.2f}) -> {match['translation']!r}")
+        else:
+            print(f"{text!r}: 没有相似度 ≥ {args.threshold:.0%} 的已有翻译")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
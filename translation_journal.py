@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+翻译日志（断点续传）
+每完成一批翻译就把 (路径, 原文, 译文) 追加写入日志，并定期用原子替换写入语言文件；
+运行中断（超时、崩溃、Ctrl+C）后重新运行时先从日志恢复，只需翻译剩余的键。
+运行正常结束后日志会被删除。
+
+日志为 JSON Lines 格式，默认保存在目标文件旁边（如 ar.json.journal）。
+
+使用方法:
+    python translation_journal.py --target frontend/src/i18n/locales/ar.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+JOURNAL_SUFFIX = '.journal'
+DEFAULT_CHECKPOINT_INTERVAL = 30   # 两次写入语言文件之间的最长间隔（秒）
+
+
+def journal_path_for(target_file):
+    """目标文件对应的日志路径"""
+    return f"{target_file}{JOURNAL_SUFFIX}"
+
+
+def atomic_write_json(path, data, indent=2):
+    """先写临时文件再重命名，写入过程中崩溃不会留下损坏的 JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class TranslationJournal:
+    """追加写入的翻译日志"""
+    
+    def __init__(self, path, target_lang):
+        self.path = Path(path)
+        self.target_lang = target_lang
+        self._file = None
+        self.appended = 0
+    
+    def load(self):
+        """
+        读取日志中已完成的翻译 {路径: (原文, 译文)}
+        其他语言的记录和最后一行写了一半的记录会被忽略
+        """
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('lang') == self.target_lang:
+                    records[record['path']] = (record['source'], record['translation'])
+        return records
+    
+    def replay(self, pending):
+        """
+        从日志恢复 pending [(路径, 原文)] 中已完成的翻译
+        原文已经变化的记录不使用；返回 ({路径: 译文}, 剩余的 pending)
+        """
+        records = self.load()
+        recovered = {}
+        remaining = []
+        for key_path, source_value in pending:
+            record = records.get(key_path)
+            if record is not None and record[0] == source_value:
+                recovered[key_path] = record[1]
+            else:
+                remaining.append((key_path, source_value))
+        return recovered, remaining
+    
+    def append(self, entries):
+        """追加 [(路径, 原文, 译文)] 并立即刷新到磁盘"""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 上次中断时最后一行可能只写了一半，另起一行，避免和新记录拼在一起
+            truncated = self.path.exists() and self.path.stat().st_size and not self.path.read_bytes().endswith(b'\n')
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if truncated:
+                self._file.write('\n')
+        for key_path, source_value, translation in entries:
+            self._file.write(json.dumps({
+                'lang': self.target_lang,
+                'path': key_path,
+                'source': source_value,
+                'translation': translation
+            }, ensure_ascii=False) + '\n')
+            self.appended += 1
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def discard(self):
+        """运行正常结束后删除日志"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+class Checkpointer:
+    """每隔 interval 秒把语言文件原子写入一次"""
+    
+    def __init__(self, target_file, data, interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.target_file = target_file
+        self.data = data
+        self.interval = interval
+        self.last_write = time.monotonic()
+        self.writes = 0
+    
+    def maybe_write(self):
+        if time.monotonic() - self.last_write >= self.interval:
+            self.write()
+    
+    def write(self):
+        atomic_write_json(self.target_file, self.data)
+        self.last_write = time.monotonic()
+        self.writes += 1
+
+
+def add_journal_arguments(parser):
+    """为翻译脚本添加断点续传参数"""
+    parser.add_argument('--no-journal', action='store_true', help='不写翻译日志（中断后无法续传）')
+    parser.add_argument('--checkpoint-interval', type=float, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help=f'翻译过程中写入语言文件的间隔秒数 (默认: {DEFAULT_CHECKPOINT_INTERVAL})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='查看未完成的翻译日志')
+    parser.add_argument('--target', required=True, help='目标文件路径')
+    parser.add_argument('--discard', action='store_true', help='删除日志（放弃续传）')
+    
+    args = parser.parse_args()
+    
+    path = Path(journal_path_for(args.target))
+    if not path.exists():
+        print(f"{args.target}: 没有未完成的翻译日志")
+        return 0
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    print(f"{path}: {len(lines)} 条已完成的翻译")
+    for line in lines[-5:]:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            print("  （最后一条记录不完整，续传时忽略）")
+            continue
+        print(f"  [{record['lang']}] {record['path'][:60]} → {record['translation'][:40]}")
+    
+    if args.discard:
+        path.unlink()
+        print("✓ 已删除日志")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+源文件指纹清单（增量同步）
+记录每个目标语言上次同步成功时 en.json 每个叶子节点的哈希，
+下次同步只处理新增、修改、删除的键。
+
+使用方法:
+    python translation_manifest.py --source frontend/src/i18n/locales/en.json --lang ar
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from check_translations import load_json
+from locale_index import flatten, path_to_str
+
+DEFAULT_MANIFEST_PATH = "frontend/src/i18n/sync_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def fingerprint_value(value):
+    """计算单个叶子值的指纹"""
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def compute_fingerprints(source_data):
+    """计算源数据所有叶子节点的指纹 {路径: 指纹}"""
+    return {
+        path_to_str(path): fingerprint_value(value)
+        for path, value in flatten(source_data).items()
+        if not isinstance(value, (dict, list))
+    }
+
+
+def diff_fingerprints(current, previous):
+    """
+    比较当前指纹与上次同步的指纹
+    返回 {'added': [...], 'changed': [...], 'deleted': [...]}（按源文件顺序）
+    """
+    return {
+        'added': [path for path in current if path not in previous],
+        'changed': [path for path, fp in current.items() if path in previous and previous[path] != fp],
+        'deleted': [path for path in previous if path not in current]
+    }
+
+
+class SyncManifest:
+    """同步清单：{语言: {路径: 指纹}}"""
+    
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = str(path)
+        self.locales = {}
+        if Path(self.path).exists():
+            data = load_json(self.path)
+            if data.get('version') == MANIFEST_VERSION:
+                self.locales = data.get('locales', {})
+    
+    def has_locale(self, lang_code):
+        """该语言是否有上次同步的记录"""
+        return lang_code in self.locales
+    
+    def get_changes(self, lang_code, current):
+        """返回该语言自上次同步以来的变化；没有记录时返回 None（需要全量检查）"""
+        if not self.has_locale(lang_code):
+            return None
+        return diff_fingerprints(current, self.locales[lang_code])
+    
+    def record(self, lang_code, current, failed_paths=()):
+        """
+        记录一次成功的同步
+        翻译失败的键保留旧指纹（或不记录），下次同步仍会处理
+        """
+        previous = self.locales.get(lang_code, {})
+        recorded = dict(current)
+        for path in failed_paths:
+            if path in previous:
+                recorded[path] = previous[path]
+            else:
+                recorded.pop(path, None)
+        self.locales[lang_code] = recorded
+    
+    def save(self):
+        """原子写入清单文件"""
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'locales': self.locales}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='查看自上次同步以来 en.json 的变化')
+    parser.add_argument('--source', required=True, help='源文件路径')
+    parser.add_argument('--lang', required=True, help='目标语言代码')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH, help=f'同步清单路径 (默认: {DEFAULT_MANIFEST_PATH})')
+    
+    args = parser.parse_args()
+    
+    manifest = SyncManifest(args.manifest)
+    changes = manifest.get_changes(args.lang, compute_fingerprints(load_json(args.source)))
+    if changes is None:
+        print(f"{args.lang}: 没有同步记录，需要全量检查")
+        return 1
+    
+    print(f"{args.lang}: 自上次同步以来")
+    for kind, label in (('added', '新增'), ('changed', '修改'), ('deleted', '删除')):
+        print(f"  {label}: {len(changes[kind])}")
+        for path in changes[kind][:10]:
+            print(f"    - {path}")
+    
+    return 0 if not any(changes.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
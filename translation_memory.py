@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+翻译记忆库（Translation Memory）
+基于 SQLite 的本地缓存，所有翻译脚本在请求 API 之前先查询这里，
+源文本未变化时直接复用上次的译文。
+
+使用方法:
+    python translation_memory.py stats
+    python translation_memory.py evict --max-age-days 180 --max-entries 50000
+    python translation_memory.py export --file tm.json
+    python translation_memory.py import --file tm.json
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+# 默认位置：与 locales 目录相邻
+DEFAULT_MEMORY_PATH = "frontend/src/i18n/translation_memory.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source_text   TEXT NOT NULL,
+    source_lang   TEXT NOT NULL,
+    target_lang   TEXT NOT NULL,
+    engine        TEXT NOT NULL,
+    translation   TEXT NOT NULL,
+    created_at    REAL NOT NULL,
+    last_used_at  REAL NOT NULL,
+    hit_count     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source_text, source_lang, target_lang, engine)
+);
+CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used_at);
+"""
+
+
+def normalize_source(text):
+    """规范化源文本（Unicode NFC + 去除首尾空白），作为缓存键"""
+    return unicodedata.normalize('NFC', text).strip()
+
+
+class TranslationMemory:
+    """
+    翻译记忆库
+    键: (规范化源文本, 源语言, 目标语言, 翻译引擎)
+    """
+    
+    def __init__(self, db_path=DEFAULT_MEMORY_PATH, max_age_days=None, max_entries=None):
+        self.db_path = str(db_path)
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+    
+    def get(self, text, source_lang, target_lang, engine):
+        """查询单条译文，未命中返回 None"""
+        return self.get_many([text], source_lang, target_lang, engine).get(text)
+    
+    def get_many(self, texts, source_lang, target_lang, engine):
+        """批量查询，返回 {原文: 译文}（只包含命中的条目）"""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                key = normalize_source(text)
+                row = self._conn.execute(
+                    "SELECT translation FROM translations "
+                    "WHERE source_text = ? AND source_lang = ? AND target_lang = ? AND engine = ?",
+                    (key, source_lang, target_lang, engine)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    continue
+                self.hits += 1
+                found[text] = row[0]
+                self._conn.execute(
+                    "UPDATE translations SET last_used_at = ?, hit_count = hit_count + 1 "
+                    "WHERE source_text = ? AND source_lang = ? AND target_lang = ? AND engine = ?",
+                    (now, key, source_lang, target_lang, engine)
+                )
+            self._conn.commit()
+        return found
+    
+    def put(self, text, translation, source_lang, target_lang, engine):
+        """写入单条译文"""
+        self.put_many({text: translation}, source_lang, target_lang, engine)
+    
+    def put_many(self, translations, source_lang, target_lang, engine):
+        """
+        批量写入 {原文: 译文}
+        译文与原文相同的条目不写入：翻译失败已不再返回原文，引擎原样返回的文本按键记入白名单
+        （见 translation_allowlist，原文修改后失效），不作为记忆复用到其他键和语言
+        """
+        now = time.time()
+        rows = [
+            (normalize_source(text), source_lang, target_lang, engine, translated, now, now)
+            for text, translated in translations.items()
+            if isinstance(translated, str) and translated.strip() and translated != text
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO translations "
+                "(source_text, source_lang, target_lang, engine, translation, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source_text, source_lang, target_lang, engine) "
+                "DO UPDATE SET translation = excluded.translation, last_used_at = excluded.last_used_at",
+                rows
+            )
+            self._conn.commit()
+    
+    def evict(self, max_age_days=None, max_entries=None):
+        """
+        淘汰策略：
+        - 超过 max_age_days 未被使用的条目
+        - 条目数超过 max_entries 时，按最近使用时间淘汰最旧的条目
+        返回删除的条目数
+        """
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        max_entries = self.max_entries if max_entries is None else max_entries
+        removed = 0
+        with self._lock:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                cursor = self._conn.execute("DELETE FROM translations WHERE last_used_at < ?", (cutoff,))
+                removed += cursor.rowcount
+            if max_entries is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM translations WHERE rowid NOT IN ("
+                    "SELECT rowid FROM translations ORDER BY last_used_at DESC LIMIT ?)",
+                    (max_entries,)
+                )
+                removed += cursor.rowcount
+            self._conn.commit()
+        return removed
+    
+    def export_json(self, path):
+        """导出全部条目为 JSON 列表，返回条目数"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_text, source_lang, target_lang, engine, translation, created_at, last_used_at, hit_count "
+                "FROM translations ORDER BY engine, target_lang, source_text"
+            ).fetchall()
+        columns = ['source_text', 'source_lang', 'target_lang', 'engine', 'translation',
+                   'created_at', 'last_used_at', 'hit_count']
+        entries = [dict(zip(columns, row)) for row in rows]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        return len(entries)
+    
+    def import_json(self, path):
+        """从 JSON 列表导入条目（已存在的条目以导入内容为准），返回条目数"""
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        now = time.time()
+        rows = [
+            (normalize_source(e['source_text']), e['source_lang'], e['target_lang'], e['engine'],
+             e['translation'], e.get('created_at', now), e.get('last_used_at', now), e.get('hit_count', 0))
+            for e in entries
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(source_text, source_lang, target_lang, engine, translation, created_at, last_used_at, hit_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+    
+    def count(self):
+        """条目总数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    
+    def stats(self):
+        """本次会话的命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': self.count()
+        }
+    
+    def print_stats(self):
+        """打印命中统计"""
+        stats = self.stats()
+        print(f"翻译记忆库: 命中 {stats['hits']} / 未命中 {stats['misses']} "
+              f"(命中率 {stats['hit_rate']:.1%})，共 {stats['entries']} 条")
+    
+    def close(self):
+        """应用淘汰策略并关闭连接"""
+        if self.max_age_days is not None or self.max_entries is not None:
+            self.evict()
+        with self._lock:
+            self._conn.close()
+
+
+def open_memory(args):
+    """根据命令行参数打开翻译记忆库（--no-memory 时返回 None）"""
+    if getattr(args, 'no_memory', False):
+        return None
+    return TranslationMemory(
+        getattr(args, 'memory', DEFAULT_MEMORY_PATH) or DEFAULT_MEMORY_PATH,
+        max_age_days=getattr(args, 'memory_max_age_days', None),
+        max_entries=getattr(args, 'memory_max_entries', None)
+    )
+
+
+def add_memory_arguments(parser):
+    """为翻译脚本添加翻译记忆库相关参数"""
+    parser.add_argument('--memory', default=DEFAULT_MEMORY_PATH, help=f'翻译记忆库路径 (默认: {DEFAULT_MEMORY_PATH})')
+    parser.add_argument('--no-memory', action='store_true', help='不使用翻译记忆库')
+    parser.add_argument('--memory-max-age-days', type=float, help='淘汰超过指定天数未使用的条目')
+    parser.add_argument('--memory-max-entries', type=int, help='最多保留的条目数（按最近使用淘汰）')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='翻译记忆库管理')
+    parser.add_argument('command', choices=['stats', 'evict', 'export', 'import'], help='操作')
+    parser.add_argument('--memory', default=DEFAULT_MEMORY_PATH, help=f'翻译记忆库路径 (默认: {DEFAULT_MEMORY_PATH})')
+    parser.add_argument('--file', help='导入/导出文件路径（JSON）')
+    parser.add_argument('--max-age-days', type=float, help='淘汰超过指定天数未使用的条目')
+    parser.add_argument('--max-entries', type=int, help='最多保留的条目数')
+    
+    args = parser.parse_args()
+    
+    memory = TranslationMemory(args.memory)
+    try:
+        if args.command == 'stats':
+            print(f"翻译记忆库: {args.memory}")
+            print(f"条目数: {memory.count()}")
+        elif args.command == 'evict':
+            if args.max_age_days is None and args.max_entries is None:
+                print("错误: evict 需要 --max-age-days 或 --max-entries 参数")
+                return 1
+            removed = memory.evict(args.max_age_days, args.max_entries)
+            print(f"已淘汰 {removed} 条，剩余 {memory.count()} 条")
+        elif args.command in ('export', 'import'):
+            if not args.file:
+                print(f"错误: {args.command} 需要 --file 参数")
+                return 1
+            if args.command == 'export':
+                count = memory.export_json(args.file)
+                print(f"✓ 已导出 {count} 条到: {args.file}")
+            else:
+                count = memory.import_json(args.file)
+                print(f"✓ 已导入 {count} 条，当前共 {memory.count()} 条")
+    finally:
+        memory.close()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+翻译流程的性能统计
+记录各阶段耗时（加载、比较、翻译、写入、限速等待、固定间隔等待）、每个引擎的请求延迟直方图、
+发送字符数、重试次数、翻译记忆库命中数和吞吐量，运行结束后输出 JSON 报告，
+也可以输出 Prometheus textfile 格式（供 node_exporter 的 textfile collector 采集）。
+
+各脚本通过 add_metrics_arguments 添加参数:
+    --metrics-report run.json    JSON 运行报告
+    --prometheus i18n.prom       Prometheus textfile
+    --profile run.prof           同时用 cProfile 采样（python -m pstats run.prof 查看）
+
+多线程执行时各线程的阶段耗时累加，因此阶段耗时之和可能大于总耗时。
+cProfile 只采样启用它的线程，--profile 通过 threading.setprofile 为之后启动的每个线程（--concurrency、
+sync_translations 的语言线程池）各建一个 Profile，结束时合并；子进程（如源码扫描的进程池）不在采样范围内。
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# 请求延迟直方图的桶（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 计数器说明（也用作 Prometheus 的 HELP）
+COUNTERS = {
+    'keys_translated': '翻译成功的键数',
+    'keys_failed': '翻译失败的键数',
+    'cache_hits': '翻译记忆库命中的文本数',
+    'cache_misses': '翻译记忆库未命中的文本数',
+    'fuzzy_reused': '模糊匹配复用的文本数',
+    'locale_cache_hits': '语言文件缓存命中次数',
+    'locale_cache_misses': '语言文件缓存未命中次数',
+    'journal_recovered': '从翻译日志恢复的键数',
+    'retries': '请求重试次数',
+}
+
+
+class RunMetrics:
+    """一次运行的统计数据（线程安全）"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self.stages = {}
+            self.engines = {}
+            self.counters = {name: 0 for name in COUNTERS}
+    
+    @contextmanager
+    def stage(self, name):
+        """记录一个阶段的耗时（同名阶段累加）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+    
+    def add_stage_time(self, name, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(name, {'seconds': 0.0, 'count': 0})
+            entry['seconds'] += seconds
+            entry['count'] += 1
+    
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def observe_request(self, engine, seconds, texts, chars, ok=True):
+        """记录一次翻译请求"""
+        with self._lock:
+            entry = self.engines.setdefault(engine, {
+                'requests': 0, 'errors': 0, 'texts': 0, 'chars': 0,
+                'latencies': [], 'buckets': [0] * len(LATENCY_BUCKETS)
+            })
+            entry['requests'] += 1
+            entry['errors'] += 0 if ok else 1
+            entry['texts'] += texts
+            entry['chars'] += chars
+            entry['latencies'].append(seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    entry['buckets'][i] += 1
+    
+    @contextmanager
+    def request(self, engine, texts):
+        """记录包在其中的一次请求（抛出异常记为失败）"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.observe_request(engine, time.perf_counter() - start, len(texts), sum(len(text) for text in texts), ok)
+    
+    def report(self):
+        """生成运行报告"""
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+            engines = {}
+            for name, entry in self.engines.items():
+                latencies = sorted(entry['latencies'])
+                engines[name] = {
+                    'requests': entry['requests'],
+                    'errors': entry['errors'],
+                    'texts': entry['texts'],
+                    'chars': entry['chars'],
+                    'latency': {
+                        'count': len(latencies),
+                        'sum': round(sum(latencies), 4),
+                        'mean': round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+                        'p50': round(_percentile(latencies, 0.5), 4),
+                        'p95': round(_percentile(latencies, 0.95), 4),
+                        'max': round(latencies[-1], 4) if latencies else 0.0,
+                        'buckets': {str(bound): count for bound, count in zip(LATENCY_BUCKETS, entry['buckets'])}
+                    }
+                }
+            chars = sum(entry['chars'] for entry in self.engines.values())
+            return {
+                'started_at': self.started_at,
+                'elapsed': round(elapsed, 4),
+                'stages': {name: {'seconds': round(entry['seconds'], 4), 'count': entry['count']}
+                           for name, entry in self.stages.items()},
+                'engines': engines,
+                'counters': dict(self.counters),
+                'throughput': {
+                    'keys_per_sec': round(self.counters['keys_translated'] / elapsed, 2) if elapsed else 0.0,
+                    'chars_per_sec': round(chars / elapsed, 2) if elapsed else 0.0,
+                    'requests_per_sec': round(sum(e['requests'] for e in self.engines.values()) / elapsed, 2)
+                    if elapsed else 0.0
+                }
+            }
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# 进程内共用的统计实例
+METRICS = RunMetrics()
+
+
+def stage(name):
+    """METRICS.stage 的简写: with stage('load'): ..."""
+    return METRICS.stage(name)
+
+
+def _write_atomic(path, text):
+    """先写临时文件再重命名（textfile collector 要求文件原子出现）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def format_prometheus(report, command):
+    """把运行报告转换为 Prometheus 文本格式"""
+    lines = []
+    label = f'command="{command}"'
+    
+    def metric(name, metric_type, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(samples)
+    
+    metric('i18n_run_duration_seconds', 'gauge', 'Wall time of the last run',
+           [f"i18n_run_duration_seconds{{{label}}} {report['elapsed']}"])
+    metric('i18n_stage_seconds', 'gauge', 'Time spent per pipeline stage (summed across threads)',
+           [f'i18n_stage_seconds{{{label},stage="{name}"}} {entry["seconds"]}'
+            for name, entry in report['stages'].items()])
+    
+    latency_samples = []
+    for engine, entry in report['engines'].items():
+        engine_label = f'{label},engine="{engine}"'
+        for bound, count in entry['latency']['buckets'].items():
+            latency_samples.append(f'i18n_request_latency_seconds_bucket{{{engine_label},le="{bound}"}} {count}')
+        latency_samples.append(f'i18n_request_latency_seconds_bucket{{{engine_label},le="+Inf"}} '
+                               f"{entry['latency']['count']}")
+        latency_samples.append(f"i18n_request_latency_seconds_sum{{{engine_label}}} {entry['latency']['sum']}")
+        latency_samples.append(f"i18n_request_latency_seconds_count{{{engine_label}}} {entry['latency']['count']}")
+    metric('i18n_request_latency_seconds', 'histogram', 'Translation API request latency', latency_samples)
+    
+    metric('i18n_requests_total', 'counter', 'Translation API requests', [
+        f'i18n_requests_total{{{label},engine="{engine}",outcome="{outcome}"}} {count}'
+        for engine, entry in report['engines'].items()
+        for outcome, count in (('ok', entry['requests'] - entry['errors']), ('error', entry['errors']))
+    ])
+    metric('i18n_chars_sent_total', 'counter', 'Characters sent to translation APIs', [
+        f'i18n_chars_sent_total{{{label},engine="{engine}"}} {entry["chars"]}'
+        for engine, entry in report['engines'].items()
+    ])
+    for name, value in report['counters'].items():
+        metric(f'i18n_{name}_total', 'counter', name.replace('_', ' ').capitalize(),
+               [f"i18n_{name}_total{{{label}}} {value}"])
+    return '\n'.join(lines) + '\n'
+
+
+def print_summary(report):
+    """打印简要统计"""
+    print(f"\n性能统计（总耗时 {report['elapsed']:.2f}s）")
+    for name, entry in sorted(report['stages'].items(), key=lambda item: -item[1]['seconds']):
+        print(f"  {name:<16} {entry['seconds']:>8.3f}s  ({entry['count']} 次)")
+    for engine, entry in report['engines'].items():
+        latency = entry['latency']
+        print(f"  {engine}: {entry['requests']} 次请求（失败 {entry['errors']}），{entry['chars']} 字符，"
+              f"延迟 p50 {latency['p50'] * 1000:.0f}ms / p95 {latency['p95'] * 1000:.0f}ms / "
+              f"max {latency['max'] * 1000:.0f}ms")
+    counters = {name: value for name, value in report['counters'].items() if value}
+    if counters:
+        print("  " + '，'.join(f"{COUNTERS.get(name, name)} {value}" for name, value in counters.items()))
+    loads = report['counters'].get('locale_cache_hits', 0) + report['counters'].get('locale_cache_misses', 0)
+    if loads:
+        print(f"  语言文件缓存命中率 {report['counters'].get('locale_cache_hits', 0) / loads:.1%}")
+
+
+def add_metrics_arguments(parser):
+    """为脚本添加性能统计参数"""
+    parser.add_argument('--metrics-report', help='把运行报告（阶段耗时、请求延迟、计数器）写入该 JSON 文件')
+    parser.add_argument('--prometheus', help='同时以 Prometheus textfile 格式写入该文件')
+    parser.add_argument('--profile', help='用 cProfile 采样并把结果写入该文件')
+
+
+class ThreadProfiler:
+    """主线程和之后启动的所有线程的 cProfile（每个线程一个 Profile，结束时合并）"""
+    
+    def __init__(self):
+        self.main = cProfile.Profile()
+        self.threads = []
+        self._lock = threading.Lock()
+    
+    def _start_thread(self, frame, event, arg):
+        # 新线程的第一个事件：为该线程启用独立的 Profile（enable 会替换掉这个钩子）
+        profile = cProfile.Profile()
+        with self._lock:
+            self.threads.append(profile)
+        profile.enable()
+    
+    def enable(self):
+        threading.setprofile(self._start_thread)
+        self.main.enable()
+    
+    def dump_stats(self, path):
+        """停止采样，把所有线程的结果合并写入 path，返回采样的线程数"""
+        self.main.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(self.main)
+        with self._lock:
+            profiles = list(self.threads)
+        for profile in profiles:
+            stats.add(profile)
+        stats.dump_stats(path)
+        return 1 + len(profiles)
+
+
+@contextmanager
+def instrumented(args, command):
+    """
+    包住脚本的主体：重置统计、按需启动 cProfile，结束时写出报告
+    with instrumented(args, 'auto_translate'): ...
+    """
+    METRICS.reset()
+    profiler = ThreadProfiler() if getattr(args, 'profile', None) else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield METRICS
+    finally:
+        if profiler:
+            threads = profiler.dump_stats(args.profile)
+            print(f"✓ cProfile 结果（{threads} 个线程）已保存到: {args.profile}")
+        report = METRICS.report()
+        report['command'] = command
+        if getattr(args, 'metrics_report', None):
+            _write_atomic(args.metrics_report, json.dumps(report, ensure_ascii=False, indent=2))
+            print_summary(report)
+            print(f"✓ 运行报告已保存到: {args.metrics_report}")
+        if getattr(args, 'prometheus', None):
+            _write_atomic(args.prometheus, format_prometheus(report, command))
+            print(f"✓ Prometheus 指标已保存到: {args.prometheus}")
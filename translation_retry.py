@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+自适应重试与退避
+按错误类型处理翻译请求失败，不再把原文当作译文写入语言文件:
+    throttle  429（限流）        按 Retry-After 暂停所有请求后重试，并发数和限速减半
+    server    5xx                指数退避（带随机抖动）后重试
+    network   超时、连接错误      同 server
+    quota     456（DeepL 配额用尽）不重试，同一引擎后续请求直接失败，避免浪费调用
+    fatal     其他错误（如 403）  不重试
+HTTP 状态码取自 TranslationEngineError.status_code、httpx/requests 异常的 response.status_code，
+或 googletrans 的 "Unexpected status code" 错误信息（默认引擎的 429、5xx 同样会重试和限速）。
+重试次数用尽的键记为失败，由调用方保留为待翻译状态，下次运行再处理。
+
+并发数和限速按 AIMD 调整：每次成功加性增加，收到限流时乘性减少，
+吞吐量最终在服务商的实际限额附近波动，而不是反复超限浪费请求。
+"""
+
+import random
+import re
+import threading
+import time
+
+from translation_engines import parse_retry_after
+from translation_metrics import METRICS, stage
+
+try:
+    import requests
+    _NETWORK_ERRORS = (TimeoutError, ConnectionError, requests.Timeout, requests.ConnectionError)
+except ImportError:
+    _NETWORK_ERRORS = (TimeoutError, ConnectionError)
+
+try:
+    import httpx   # googletrans 使用 httpx
+    _NETWORK_ERRORS += (httpx.TimeoutException, httpx.NetworkError)
+except (ImportError, AttributeError):
+    pass
+
+# googletrans 收到非 200 响应时的错误信息（raise_exception=True，见 translation_clients）
+_GOOGLETRANS_STATUS_PATTERN = re.compile(r'Unexpected status code "(\d{3})"')
+
+# 默认重试配置
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 0.5    # 第一次退避的上限（秒），之后每次翻倍
+DEFAULT_MAX_DELAY = 30.0    # 单次等待的上限（秒），也是 Retry-After 的上限
+
+# AIMD 参数
+ADDITIVE_INCREASE = 1.0         # 每个窗口（约 limit 次成功）并发数 +1
+MULTIPLICATIVE_DECREASE = 0.5   # 限流时并发数和速率乘以该系数
+RATE_INCREASE = 0.02            # 每次成功速率恢复配置值的 2%
+MIN_RATE_SCALE = 0.05           # 速率最低降到配置值的 5%
+
+_policy = {
+    'max_retries': DEFAULT_MAX_RETRIES,
+    'base_delay': DEFAULT_BASE_DELAY,
+    'max_delay': DEFAULT_MAX_DELAY
+}
+
+
+def configure_retry(max_retries=None, base_delay=None, max_delay=None):
+    """修改全局重试配置（之后创建的 AdaptiveController 生效）"""
+    if max_retries is not None:
+        _policy['max_retries'] = max_retries
+    if base_delay is not None:
+        _policy['base_delay'] = base_delay
+    if max_delay is not None:
+        _policy['max_delay'] = max_delay
+
+
+def error_status(error):
+    """错误对应的 HTTP 状态码，不是 HTTP 错误时返回 None"""
+    status_code = getattr(error, 'status_code', None)
+    if status_code is not None:
+        return status_code
+    # httpx.HTTPStatusError、requests.HTTPError
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if isinstance(status_code, int):
+        return status_code
+    match = _GOOGLETRANS_STATUS_PATTERN.search(str(error))
+    return int(match.group(1)) if match else None
+
+
+def error_retry_after(error):
+    """服务商要求的等待秒数（异常的 retry_after 或响应的 Retry-After 头），没有时返回 None"""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        return retry_after
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    return parse_retry_after(headers.get('Retry-After')) if headers is not None else None
+
+
+def classify_error(error):
+    """错误类型: throttle | quota | server | network | fatal"""
+    status_code = error_status(error)
+    if status_code == 429:
+        return 'throttle'
+    if status_code == 456:
+        return 'quota'
+    if status_code is not None and 500 <= status_code < 600:
+        return 'server'
+    if isinstance(error, _NETWORK_ERRORS):
+        return 'network'
+    return 'fatal'
+
+
+class AdaptiveController:
+    """
+    单个翻译引擎的请求控制器（多个语言同步时共用）
+    - 同时进行的请求数不超过当前窗口 limit（AIMD 调整，介于 1 和 max_concurrency 之间）
+    - limiter（EngineRateLimiter）的速率随之按比例调整
+    - 收到 Retry-After 时所有线程暂停到指定时间
+    """
+    
+    def __init__(self, max_concurrency=1, limiter=None, max_retries=None, base_delay=None, max_delay=None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(self.max_concurrency)
+        self.limiter = limiter
+        self.rate_scale = 1.0
+        self.max_retries = _policy['max_retries'] if max_retries is None else max_retries
+        self.base_delay = _policy['base_delay'] if base_delay is None else base_delay
+        self.max_delay = _policy['max_delay'] if max_delay is None else max_delay
+        self.active = 0
+        self.resume_at = 0.0
+        self.last_decrease = 0.0
+        self.aborted = None   # 配额用尽时的错误，之后的请求直接失败
+        self.stats = {'throttled': 0, 'retries': 0, 'decreases': 0, 'min_limit': self.limit}
+        self._condition = threading.Condition()
+        self._random = random.Random()
+    
+    def _acquire_slot(self):
+        with self._condition:
+            while True:
+                if self.aborted is not None:
+                    raise self.aborted
+                wait = self.resume_at - time.monotonic()
+                if wait <= 0 and self.active < int(self.limit):
+                    self.active += 1
+                    return
+                self._condition.wait(wait if wait > 0 else None)
+    
+    def _release_slot(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+    
+    def _on_success(self):
+        with self._condition:
+            if self.limit < self.max_concurrency or self.rate_scale < 1.0:
+                self.limit = min(float(self.max_concurrency), self.limit + ADDITIVE_INCREASE / self.limit)
+                self.rate_scale = min(1.0, self.rate_scale + RATE_INCREASE)
+                self._apply_rate()
+                self._condition.notify_all()
+    
+    def _on_throttle(self, started, retry_after):
+        with self._condition:
+            self.stats['throttled'] += 1
+            if retry_after:
+                self.resume_at = max(self.resume_at, time.monotonic() + min(retry_after, self.max_delay))
+            # 同一轮超限（请求在上次减少之前发出）只减少一次
+            if started >= self.last_decrease:
+                self.limit = max(1.0, self.limit * MULTIPLICATIVE_DECREASE)
+                self.rate_scale = max(MIN_RATE_SCALE, self.rate_scale * MULTIPLICATIVE_DECREASE)
+                self.last_decrease = time.monotonic()
+                self.stats['decreases'] += 1
+                self.stats['min_limit'] = min(self.stats['min_limit'], self.limit)
+                self._apply_rate()
+    
+    def _apply_rate(self):
+        if self.limiter is not None:
+            self.limiter.set_rate_scale(self.rate_scale)
+    
+    def _backoff(self, attempt, retry_after=None):
+        """第 attempt 次重试前的等待时间：full jitter 指数退避，有 Retry-After 时不少于它"""
+        delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after:
+            delay = min(self.max_delay, retry_after) + self._random.uniform(0, self.base_delay)
+        return delay
+    
+    def call(self, func, weight=0):
+        """执行 func()，按错误类型重试；重试用尽或不可重试时抛出最后一个异常"""
+        attempt = 0
+        while True:
+            self._acquire_slot()
+            started = time.monotonic()
+            try:
+                if self.limiter is not None:
+                    with stage('rate_limit_wait'):
+                        self.limiter.acquire(weight)
+                result = func()
+            except Exception as e:
+                kind = classify_error(e)
+                retry_after = error_retry_after(e)
+                if kind == 'throttle':
+                    self._on_throttle(started, retry_after)
+                elif kind == 'quota':
+                    with self._condition:
+                        self.aborted = e
+                        self._condition.notify_all()
+                if kind in ('quota', 'fatal') or attempt >= self.max_retries:
+                    raise
+            else:
+                self._on_success()
+                return result
+            finally:
+                self._release_slot()
+            
+            delay = self._backoff(attempt, retry_after)
+            attempt += 1
+            with self._condition:
+                self.stats['retries'] += 1
+            METRICS.incr('retries')
+            with stage('retry_backoff'):
+                time.sleep(delay)
+    
+    def summary(self):
+        """调整情况摘要"""
+        with self._condition:
+            rate_scale = round(self.rate_scale, 3) if self.limiter is not None else None
+            return dict(self.stats, limit=round(self.limit, 2), rate_scale=rate_scale,
+                        aborted=str(self.aborted) if self.aborted else None)
+
+
+def format_controller_summary(summary):
+    """格式化控制器摘要（有限流或重试时才有内容）"""
+    if not summary['throttled'] and not summary['retries'] and not summary['aborted']:
+        return None
+    text = (f"自适应限速: 限流 {summary['throttled']} 次，重试 {summary['retries']} 次，"
+            f"并发窗口最低 {summary['min_limit']:.1f}、当前 {summary['limit']:.1f}")
+    if summary['rate_scale'] is not None:
+        text += f"，速率 {summary['rate_scale']:.0%}"
+    if summary['aborted']:
+        text += f"；已停止请求: {summary['aborted']}"
+    return text
+
+
+def add_retry_arguments(parser):
+    """为翻译脚本添加重试参数"""
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f'限流、5xx、超时的最多重试次数 (默认: {DEFAULT_MAX_RETRIES})')
+    parser.add_argument('--retry-base-delay', type=float, default=DEFAULT_BASE_DELAY,
+                        help=f'第一次退避的上限秒数，之后每次翻倍 (默认: {DEFAULT_BASE_DELAY})')
+    parser.add_argument('--retry-max-delay', type=float, default=DEFAULT_MAX_DELAY,
+                        help=f'单次等待的上限秒数 (默认: {DEFAULT_MAX_DELAY})')
+
+
+def configure_retry_from_args(args):
+    """根据命令行参数修改全局重试配置"""
+    configure_retry(args.max_retries, args.retry_base_delay, args.retry_max_delay)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+扫描前端源码中的翻译键引用
+并行扫描 frontend/src 下的 .js/.jsx/.ts/.tsx 文件，提取 t('...') 等字面量键引用，
+与 en.json 比较，按命名空间报告未使用的键（所有语言包中的冗余）和未定义的键（运行时会回退）。
+
+每个文件的扫描结果按 mtime + 大小缓存，再次扫描只处理修改过的文件。
+
+动态键（如 t(`travel.statuses.${status}`)、'currency.' + code）无法确定具体的键，
+记为动态前缀，前缀下的键视为可能被使用，不会报告为未使用，也不会被删除。
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from locale_index import delete_value, flatten
+from translation_journal import atomic_write_json
+
+DEFAULT_SRC_DIR = "frontend/src"
+DEFAULT_USAGE_CACHE = "frontend/src/i18n/key_usage_cache.json"
+SCAN_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+SCAN_EXCLUDE_DIRS = {'node_modules', 'locales', 'build', '__snapshots__'}
+USAGE_CACHE_VERSION = 2
+PARALLEL_THRESHOLD = 16   # 待扫描文件少于该数时不启动进程池
+
+_KEY = r"[A-Za-z_][\w-]*(?:\.[\w-]+)*"
+# t('a.b') / i18n.t("a.b") / t(`a.b`) / tc('a.b')（compiledMessages.js）
+_T_CALL_PATTERN = re.compile(r"\btc?\(\s*(['\"`])(" + _KEY + r")\1")
+# <Trans i18nKey="a.b"> / i18nKey: 'a.b'
+_I18N_KEY_PATTERN = re.compile(r"\bi18nKey\s*[=:]\s*\{?\s*(['\"`])(" + _KEY + r")\1")
+# 动态键: `a.b.${x}` 或 'a.b.' + x
+_TEMPLATE_PREFIX_PATTERN = re.compile(r"`(" + _KEY + r"\.)\$\{")
+_CONCAT_PREFIX_PATTERN = re.compile(r"(['\"])(" + _KEY + r"\.)\1\s*\+")
+# 其他看起来像键的字符串字面量（如 labelKey: 'travel.title'，之后再传给 t()）
+_KEY_LITERAL_PATTERN = re.compile(r"(['\"`])(" + _KEY + r"\.[\w-]+)\1")
+# i18next 复数后缀
+PLURAL_SUFFIXES = ('_zero', '_one', '_two', '_few', '_many', '_other', '_plural')
+
+
+def key_of(path):
+    """路径元组转 i18next 使用的键（以 . 连接，不转义）"""
+    return '.'.join(str(part) for part in path)
+
+
+def scan_source(text):
+    """
+    从一个源文件的内容中提取键引用
+    返回 {'keys': [[键, 行号]], 'prefixes': [动态前缀], 'literals': [像键的字符串]}
+    """
+    line_starts = [0]
+    for match in re.finditer('\n', text):
+        line_starts.append(match.end())
+    
+    def line_of(offset):
+        low, high = 0, len(line_starts)
+        while low + 1 < high:
+            mid = (low + high) // 2
+            if line_starts[mid] <= offset:
+                low = mid
+            else:
+                high = mid
+        return low + 1
+    
+    keys = []
+    for pattern in (_T_CALL_PATTERN, _I18N_KEY_PATTERN):
+        for match in pattern.finditer(text):
+            keys.append([match.group(2), line_of(match.start(2))])
+    prefixes = {match.group(1) for match in _TEMPLATE_PREFIX_PATTERN.finditer(text)}
+    prefixes.update(match.group(2) for match in _CONCAT_PREFIX_PATTERN.finditer(text))
+    literals = {match.group(2) for match in _KEY_LITERAL_PATTERN.finditer(text)}
+    return {'keys': keys, 'prefixes': sorted(prefixes), 'literals': sorted(literals)}
+
+
+def _scan_file(path):
+    """进程池中执行：读取并扫描一个文件"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return path, scan_source(f.read())
+
+
+def iter_source_files(src_dir=DEFAULT_SRC_DIR):
+    """遍历需要扫描的源文件"""
+    for root, dirs, files in os.walk(src_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SCAN_EXCLUDE_DIRS and not d.startswith('.'))
+        for name in sorted(files):
+            if name.endswith(SCAN_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def load_usage_cache(cache_path):
+    """读取扫描缓存 {文件: {'mtime_ns', 'size', 结果...}}，版本不符时丢弃"""
+    if not cache_path or not Path(cache_path).exists():
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data.get('files', {}) if data.get('version') == USAGE_CACHE_VERSION else {}
+
+
+def save_usage_cache(cache_path, files):
+    """保存扫描缓存"""
+    path = Path(cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': USAGE_CACHE_VERSION, 'files': files}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def scan_sources(src_dir=DEFAULT_SRC_DIR, cache_path=DEFAULT_USAGE_CACHE, workers=None):
+    """
+    扫描源码目录，未修改的文件使用缓存结果
+    返回 ({文件: 扫描结果}, {'files', 'scanned', 'cached'})
+    """
+    cache = load_usage_cache(cache_path)
+    results = {}
+    stale = []
+    for path in iter_source_files(src_dir):
+        stat = os.stat(path)
+        entry = cache.get(path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            results[path] = entry
+        else:
+            stale.append((path, stat))
+    
+    if len(stale) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scanned = list(executor.map(_scan_file, [path for path, _ in stale], chunksize=8))
+    else:
+        scanned = [_scan_file(path) for path, _ in stale]
+    for (path, stat), (_, result) in zip(stale, scanned):
+        results[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, **result}
+    
+    if cache_path:
+        save_usage_cache(cache_path, results)
+    return results, {'files': len(results), 'scanned': len(stale), 'cached': len(results) - len(stale)}
+
+
+def _resolve_key(key, defined, containers):
+    """
+    把引用的键解析为已定义的键列表
+    叶子键直接命中；对象键（returnObjects）对应其下所有叶子；复数键对应带后缀的键
+    """
+    if key in defined:
+        return [key]
+    if key in containers:
+        return [k for k in defined if k.startswith(key + '.')]
+    plural = [key + suffix for suffix in PLURAL_SUFFIXES if key + suffix in defined]
+    return plural
+
+
+def defined_keys(source_data):
+    """en.json 中定义的叶子键 {键: 路径元组}，以及所有对象键的集合"""
+    defined_paths = {key_of(path): path for path, value in flatten(source_data).items()
+                     if not isinstance(value, (dict, list))}
+    containers = set()
+    for key in defined_paths:
+        parts = key.split('.')
+        for i in range(1, len(parts)):
+            containers.add('.'.join(parts[:i]))
+    return defined_paths, containers
+
+
+def keys_used_by(scan_results, defined_paths, containers):
+    """
+    一组文件的扫描结果引用的已定义键（对象键展开为叶子，复数键包括各后缀，动态前缀下的键都算使用）
+    defined_paths/containers: defined_keys 的结果
+    """
+    defined = defined_paths.keys()
+    used = set()
+    prefixes = set()
+    for result in scan_results:
+        for key, _ in result['keys']:
+            used.update(_resolve_key(key, defined, containers))
+        prefixes.update(result['prefixes'])
+        used.update(literal for literal in result['literals'] if literal in defined)
+    if prefixes:
+        prefixes = tuple(prefixes)
+        used.update(key for key in defined if key.startswith(prefixes))
+    return used
+
+
+def analyze_usage(source_data, scan_results):
+    """
+    比较 en.json 与源码引用，按命名空间汇总
+    返回 {命名空间: {'defined', 'used', 'unused': [键], 'undefined': [{'key', 'locations'}], 'dynamic': [前缀]}}
+    """
+    defined_paths, containers = defined_keys(source_data)
+    defined = set(defined_paths)
+    
+    used = set()
+    undefined = {}
+    prefixes = set()
+    for path, result in scan_results.items():
+        for key, line in result['keys']:
+            resolved = _resolve_key(key, defined, containers)
+            if resolved:
+                used.update(resolved)
+            else:
+                undefined.setdefault(key, []).append(f"{path}:{line}")
+        prefixes.update(result['prefixes'])
+        # 其他位置出现的完整键字符串（之后通过变量传给 t()）
+        used.update(literal for literal in result['literals'] if literal in defined)
+    
+    def dynamically_used(key):
+        return any(key.startswith(prefix) for prefix in prefixes)
+    
+    report = {}
+    for key in defined_paths:
+        namespace = key.split('.')[0]
+        entry = report.setdefault(namespace, {'defined': 0, 'used': 0, 'unused': [], 'undefined': [],
+                                              'dynamic': sorted(p for p in prefixes if p.split('.')[0] == namespace)})
+        entry['defined'] += 1
+        if key in used or dynamically_used(key):
+            entry['used'] += 1
+        else:
+            entry['unused'].append(key)
+    for key, locations in sorted(undefined.items()):
+        namespace = key.split('.')[0]
+        entry = report.setdefault(namespace, {'defined': 0, 'used': 0, 'unused': [], 'undefined': [], 'dynamic': []})
+        entry['undefined'].append({'key': key, 'locations': locations})
+    return report
+
+
+def unused_paths(source_data, report):
+    """未使用的键对应的路径元组（用于删除）"""
+    unused = {key for entry in report.values() for key in entry['unused']}
+    return [path for path in flatten(source_data) if key_of(path) in unused]
+
+
+def prune_unused_keys(locale_files, paths):
+    """从所有语言文件中删除给定路径（原子写入），返回 {文件: 删除的键数}"""
+    removed = {}
+    for locale_file in locale_files:
+        with open(locale_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        before = len(flatten(data))
+        for path in paths:
+            delete_value(data, path)
+        removed[str(locale_file)] = before - len(flatten(data))
+        atomic_write_json(locale_file, data)
+    return removed
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+监视模式：语言文件变化时即时输出翻译覆盖率
+常驻进程，在内存中保存每个语言按顶层命名空间拆分的扁平索引和比较结果。
+en.json 或任一目标语言文件保存后，只重新展开、重新比较内容变化的命名空间，
+毫秒级输出新的覆盖率，不需要每次启动进程、完整解析和遍历所有文件。
+
+使用方法:
+    python watch_translations.py
+    python watch_translations.py --locales frontend/src/i18n/locales --json
+    python watch_translations.py --once          # 输出一次覆盖率后退出
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from check_translations import load_json
+from locale_index import diff_flat, flatten, path_to_str
+
+LOCALES_DIR = "frontend/src/i18n/locales"
+DEFAULT_POLL_INTERVAL = 0.3   # 检查文件变化的间隔（秒）
+
+
+class LocaleWatchState:
+    """
+    内存中的语言状态
+    trees[语言][命名空间] = 子树，flat[语言][命名空间] = 扁平索引，
+    results[语言][命名空间] = (缺失的路径, 未翻译的路径)
+    """
+    
+    def __init__(self, locales_dir=LOCALES_DIR, source_lang='en'):
+        self.locales_dir = Path(locales_dir)
+        self.source_lang = source_lang
+        self.trees = {}
+        self.flat = {}
+        self.results = {}
+        self.stamps = {}
+        self.new_missing = {}   # 最近一次更新中新出现的缺失键 {语言: [路径]}
+    
+    def languages(self):
+        return sorted(path.stem for path in self.locales_dir.glob('*.json'))
+    
+    def targets(self):
+        return [lang for lang in self.trees if lang != self.source_lang]
+    
+    def _stamp(self, lang):
+        stat = (self.locales_dir / f'{lang}.json').stat()
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _reload(self, lang):
+        """重新解析文件，返回内容变化的命名空间集合（只重新展开这些命名空间）"""
+        data = load_json(self.locales_dir / f'{lang}.json')
+        old_trees = self.trees.get(lang, {})
+        flat = self.flat.setdefault(lang, {})
+        changed = set(old_trees) - set(data)
+        for namespace in changed:
+            flat.pop(namespace, None)
+        for namespace, subtree in data.items():
+            if namespace not in old_trees or old_trees[namespace] != subtree:
+                flat[namespace] = flatten({namespace: subtree})
+                changed.add(namespace)
+        self.trees[lang] = data
+        return changed
+    
+    def _rediff(self, lang, namespaces):
+        """只重新比较指定命名空间，返回新出现的缺失路径"""
+        source_flat = self.flat.get(self.source_lang, {})
+        target_flat = self.flat.get(lang, {})
+        results = self.results.setdefault(lang, {})
+        new_missing = []
+        for namespace in namespaces:
+            if namespace in source_flat:
+                before = set(results[namespace][0]) if namespace in results else set()
+                results[namespace] = diff_flat(source_flat[namespace], target_flat.get(namespace, {}))
+                new_missing.extend(path for path in results[namespace][0] if path not in before)
+            else:
+                results.pop(namespace, None)
+        return new_missing
+    
+    def load_all(self):
+        """初次加载所有语言"""
+        for lang in [self.source_lang] + [lang for lang in self.languages() if lang != self.source_lang]:
+            self.stamps[lang] = self._stamp(lang)
+            self._reload(lang)
+        namespaces = set(self.flat.get(self.source_lang, {}))
+        for lang in self.targets():
+            self._rediff(lang, namespaces)
+    
+    def refresh(self):
+        """
+        检查文件变化并增量更新
+        返回变化列表 [(语言, 变化的命名空间)]，解析失败（如保存到一半）时保留旧状态
+        """
+        updates = []
+        self.new_missing = {}
+        current = self.languages()
+        for lang in list(self.trees):
+            if lang not in current and lang != self.source_lang:
+                del self.trees[lang], self.flat[lang], self.stamps[lang]
+                self.results.pop(lang, None)
+                updates.append((lang, set()))
+        # 源文件先处理，目标文件的比较使用最新的源索引
+        for lang in sorted(current, key=lambda code: code != self.source_lang):
+            try:
+                stamp = self._stamp(lang)
+            except FileNotFoundError:
+                continue
+            if self.stamps.get(lang) == stamp:
+                continue
+            # 解析失败时也记录时间戳，文件再次保存前不重复报错
+            self.stamps[lang] = stamp
+            try:
+                changed = self._reload(lang)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"✗ {lang}.json 解析失败，保留上次的状态: {e}", file=sys.stderr)
+                continue
+            if lang == self.source_lang:
+                for target in self.targets():
+                    self.new_missing[target] = self._rediff(target, changed)
+            else:
+                self._rediff(lang, changed | (set(self.flat[self.source_lang]) - set(self.results.get(lang, {}))))
+            updates.append((lang, changed))
+        return updates
+    
+    def coverage(self):
+        """每个目标语言的覆盖率 {语言: {'total', 'missing', 'untranslated', 'coverage', 'namespaces'}}"""
+        total_by_namespace = {
+            namespace: sum(1 for value in flat.values() if value is not None and not isinstance(value, (dict, list)))
+            for namespace, flat in self.flat.get(self.source_lang, {}).items()
+        }
+        total = sum(total_by_namespace.values())
+        report = {}
+        for lang in self.targets():
+            namespaces = {}
+            for namespace, (missing, identical) in self.results.get(lang, {}).items():
+                if missing or identical:
+                    namespaces[namespace] = {'missing': len(missing), 'untranslated': len(identical)}
+            missing = sum(item['missing'] for item in namespaces.values())
+            untranslated = sum(item['untranslated'] for item in namespaces.values())
+            report[lang] = {
+                'total': total,
+                'missing': missing,
+                'untranslated': untranslated,
+                'coverage': round((total - missing - untranslated) / total, 4) if total else 1.0,
+                'namespaces': namespaces
+            }
+        return report
+
+
+
+def print_coverage(report, previous=None):
+    """打印覆盖率表，与上次相比有变化的语言标出差值"""
+    for lang, entry in report.items():
+        delta = ''
+        if previous and lang in previous:
+            change = (entry['missing'] + entry['untranslated']) - (previous[lang]['missing'] + previous[lang]['untranslated'])
+            if change:
+                delta = f"  ({change:+d})"
+        print(f"  {lang:<4} 覆盖率 {entry['coverage']:>7.1%}  缺失 {entry['missing']:>5}  "
+              f"未翻译 {entry['untranslated']:>5}{delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='监视语言文件，变化时即时输出翻译覆盖率')
+    parser.add_argument('--locales', default=LOCALES_DIR, help=f'语言文件目录 (默认: {LOCALES_DIR})')
+    parser.add_argument('--source-lang', default='en', help='源语言代码 (默认: en)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f'检查文件变化的间隔秒数 (默认: {DEFAULT_POLL_INTERVAL})')
+    parser.add_argument('--json', action='store_true', help='每次更新输出一行 JSON（供编辑器插件使用）')
+    parser.add_argument('--once', action='store_true', help='输出一次覆盖率后退出')
+    
+    args = parser.parse_args()
+    
+    state = LocaleWatchState(args.locales, args.source_lang)
+    start = time.perf_counter()
+    state.load_all()
+    report = state.coverage()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if args.json:
+        print(json.dumps({'event': 'initial', 'elapsed_ms': round(elapsed_ms, 2), 'coverage': report},
+                         ensure_ascii=False), flush=True)
+    else:
+        print(f"已加载 {len(state.trees)} 个语言文件（{elapsed_ms:.1f} ms）")
+        print_coverage(report)
+    if args.once:
+        return 0
+    
+    if not args.json:
+        print(f"\n监视 {args.locales} 中... (Ctrl+C 退出)", flush=True)
+    try:
+        while True:
+            time.sleep(args.interval)
+            start = time.perf_counter()
+            updates = state.refresh()
+            if not updates:
+                continue
+            previous, report = report, state.coverage()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if args.json:
+                print(json.dumps({
+                    'event': 'update',
+                    'elapsed_ms': round(elapsed_ms, 2),
+                    'changed': {lang: sorted(namespaces) for lang, namespaces in updates},
+                    'new_missing': {lang: [path_to_str(path) for path in paths]
+                                    for lang, paths in state.new_missing.items() if paths},
+                    'coverage': report
+                }, ensure_ascii=False), flush=True)
+                continue
+            now = datetime.now().strftime('%H:%M:%S')
+            for lang, namespaces in updates:
+                label = ', '.join(sorted(namespaces)[:5]) or '无内容变化'
+                print(f"\n[{now}] {lang}.json 变化（{label}）{elapsed_ms:.1f} ms")
+            # 源文件变化：列出各语言新出现的缺失键
+            for target, paths in state.new_missing.items():
+                if paths:
+                    labels = [path_to_str(path) for path in paths[:5]]
+                    print(f"  {target} 新缺失: {', '.join(labels)}{' ...' if len(paths) > 5 else ''}")
+            print_coverage(report, previous)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())